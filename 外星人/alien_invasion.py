@@ -1,57 +1,205 @@
+import time
+
+# 启动计时的起点（--profile-startup），在导入 pygame 之前取得
+_PROCESS_START = time.perf_counter()
+
+import argparse
 import sys
 import pygame
 import os
-import random
 
 from settings import Settings
-from ship import Ship
-from bullet import Bullet, AlienBullet
-from alien import Alien
-from game_stats import GameStats
-from shield import Shield   # 独立护盾类
+from assets import Assets
+from hud import Hud
+from loader import Loader, StartupProfile
+from score_store import ScoreStore, settings_hash
+from profiler import FrameProfiler, ProfilerOverlay
+from sprite_batch import SpriteBatch
+from capture import FrameCapture
+from governor import LoadGovernor
+from particles import ParticleSystem
+from metrics import GameMetrics, MetricsServer, MetricsFileWriter
+from bullet import draw_positions
+from simulation import GameSimulation, Inputs
+from replay import InputRecorder
+from rewind import RewindBuffer, restore, save_state, load_state
 
 
 class AlienInvasion:
-    """Overall class to manage game assets and behavior."""
+    """
+    Overall class to manage game assets and behavior.
+
+    游戏逻辑在 GameSimulation 中；这里负责窗口、键盘事件、绘制、声音和存档。
+    """
+
+    # 后台预加载的图片
+    IMAGES = ('ship.bmp', 'alien.bmp')
+
+    def __init__(self, seed=None, record_path=None, profile_path=None, profile_startup=False,
+                 capture_dir=None, state_path=None, metrics_port=None, metrics_file=None):
+        """
+        Initialize the game, and create game resources.
+
+        分阶段启动：只初始化需要的 pygame 模块，先创建窗口并画出第一帧，
+        图片、字体、成绩记录和音效在后台线程加载，加载期间窗口照常响应并显示进度条。
+
+        :param seed: 随机种子（默认随机），相同种子 + 相同输入得到完全相同的一局
+        :param record_path: 不为 None 时录制每一步的输入，退出时写入该文件
+        :param profile_path: 不为 None 时从一开始就记录分阶段帧耗时，退出时导出到该文件
+        :param profile_startup: 为 True 时在加载完成后打印各启动阶段的耗时
+        :param capture_dir: 不为 None 时从一开始就录制画面到该目录（也可以按 F9 开关）
+        :param state_path: 不为 None 时从这个存档（F6 保存的文件）开始游戏
+        :param metrics_port: 不为 None 时在本机这个端口上提供 Prometheus 格式的运行指标
+        :param metrics_file: 不为 None 时每隔 metrics_file_interval 秒把运行指标写入这个文件
+        """
+        self.startup = StartupProfile(_PROCESS_START)
+        self.startup.mark('imports')
 
-    def __init__(self):
-        """Initialize the game, and create game resources."""
-        pygame.init()
+        # 只初始化用到的模块（pygame.init() 会初始化全部模块）；混音器在后台初始化
+        pygame.display.init()
+        pygame.font.init()
         self.clock = pygame.time.Clock()
         self.settings = Settings()
+        self.startup.mark('pygame display + font init')
 
         self.screen = pygame.display.set_mode(
             (self.settings.screen_width, self.settings.screen_height)
         )
         pygame.display.set_caption("Alien Invasion")
+        self.startup.mark('window')
 
-        # 统计信息
-        self.stats = GameStats(self)
-
-        self.ship = Ship(self)
-        self.bullets = pygame.sprite.Group()       # 玩家子弹
-        self.aliens = pygame.sprite.Group()        # 外星人
-        self.alien_bullets = pygame.sprite.Group() # 外星人子弹
-
-        # 游戏开始时间（用来计算经过的秒数）
-        self.start_time = pygame.time.get_ticks()
-
-        # ---------- 护盾：由 Shield 类管理 ----------
-        self.shield = Shield(
-            max_charges=2,      # 最多 2 次
-            cooldown_ms=30_000, # 每 30 秒恢复一次
-            duration_ms=15_000, # 持续 15 秒
-            initial_charges=1,  # 初始 1 次
+        # 纯背景色的整屏图片：擦除旧区域时一次 blits 从这里拷贝，比逐个 fill 快
+        self.background = pygame.Surface(self.screen.get_size()).convert()
+        self.background.fill(self.settings.bg_color)
+        self.screen.blit(self.background, (0, 0))
+        pygame.display.flip()
+        self.startup.mark('first frame')
+
+        # 图片缓存：后台线程读盘并计算碰撞掩码，加载完后在主线程转换为显示格式
+        self.assets = Assets()
+        self.laser_sound = None
+        self.explosion_sound = None
+        self.loader = Loader([
+            ('images', lambda: self.assets.preload(self.IMAGES)),
+            ('fonts', lambda: Hud(self.settings, self.settings.hud_digit_atlas)),
+            ('scores', lambda: ScoreStore(top_n=self.settings.score_top_n)),
+            ('sounds', self._init_sounds),
+        ], self.startup).start()
+        self._wait_for_loader()
+        self.startup.mark('waiting for loader')
+
+        self.assets.reconvert()
+        # 子弹预渲染成纯色图片，和其他精灵一起批量 blit
+        size = (self.settings.bullet_width, self.settings.bullet_height)
+        self.bullet_image = self.assets.solid(self.settings.bullet_color, size)
+        self.alien_bullet_image = self.assets.solid(self.settings.alien_bullet_color, size)
+
+        # 游戏逻辑核心（不依赖窗口），每帧调用一次 step()
+        self.sim = GameSimulation(self.settings, self.assets, seed)
+        # 当前按键状态，每帧交给 sim.step()
+        self.inputs = Inputs()
+
+        # 输入录制（用于之后用 replay.py 复现）
+        self.record_path = record_path
+        self.recorder = InputRecorder(self.sim) if record_path else None
+
+        # 倒带：每步一个快照（关键帧 + 增量），F5 进入 / 退出倒带，F6 存档，F7 读档
+        self.rewind = RewindBuffer(self.settings.rewind_memory_mb * 1024 * 1024,
+                                   self.settings.rewind_keyframe_interval)
+        self.rewinding = False
+        self.rewind_index = 0
+
+        # 成绩记录：后台线程追加写日志，最高分和排行榜都在内存里
+        self.scores = self.loader.result('scores')
+        self.sim.stats.high_score = self.scores.high_score
+        self.settings_hash = settings_hash(self.settings)
+
+        # 分数 / 最高分 / 生命 / 护盾状态：字体只创建一次，文字图片按值缓存
+        self.hud = self.loader.result('fonts')
+
+        # 负载调节：帧耗时持续超出预算时降低效果和刷怪量；
+        # 录制输入时只调整画面效果（改动刷怪设置会让录制无法回放）
+        s = self.settings
+        self.governor = None
+        if s.governor_enabled:
+            self.governor = LoadGovernor(
+                s, self.sim.limits, s.governor_window_frames, s.governor_degrade_at, s.governor_restore_at,
+                s.governor_restore_windows, gameplay=not record_path,
+            )
+        # 爆炸粒子：外星人被消灭、飞船被击中时生成，每步更新一次，直接写屏幕像素
+        self.particles = None
+        if s.particles_enabled:
+            self.particles = ParticleSystem(s.particle_capacity, self.screen.get_rect(),
+                                            s.particle_size, s.particle_gravity)
+            self.alien_debris = [self.screen.map_rgb(c)
+                                 for c in ((255, 140, 0), (255, 210, 60), (200, 60, 40))]
+            self.ship_debris = [self.screen.map_rgb(c)
+                                for c in ((0, 200, 255), (255, 255, 255), (90, 90, 90))]
+
+        # HUD 降级时沿用的上一次的 (图片, 位置) 列表，以及距离上次刷新的帧数
+        self._hud_items = []
+        self._hud_age = 0
+
+        # 分阶段帧计时：F3 开关（同时显示叠加层），F2 导出；关闭时几乎没有开销
+        self.profile_path = profile_path
+        self.profiler = FrameProfiler(self.settings.profiler_frames)
+        self.profiler_overlay = ProfilerOverlay(
+            self.profiler, self.settings,
+            status=(lambda: [self.governor.status()]) if self.governor else None,
         )
-
-        # 字体用于显示分数 / 最高分 / 生命 / 护盾状态
-        self.font = pygame.font.SysFont(None, 36)
-
-        # 初始化声音
-        self._init_sounds()
-
-        # 初始生成一些随机外星人
-        self._create_initial_aliens()
+        self.show_profiler = False
+        self.sim.profiler = self.profiler
+        if profile_path:
+            self.profiler.enable()
+
+        # 脏矩形绘制：上一帧画过的区域、本帧画过的区域、本帧推送到显示器的像素数
+        self._last_rects = []
+        self._drawn_rects = []
+        self._full_refresh = True
+        self.pixels_pushed = 0
+        # 本帧当前绘制层收集的 (图片, 位置)，每层一次 blits
+        self.batch = SpriteBatch()
+
+        # 画面录制：F9 开关，压缩写盘在后台线程
+        self.capture = None
+        if capture_dir:
+            self._start_capture(capture_dir)
+
+        # 运行指标：主循环和模拟核心只更新内存中的数值，导出在后台线程
+        self.metrics = None
+        self.metrics_exporters = []
+        if metrics_port is not None or metrics_file:
+            self._start_metrics(metrics_port, metrics_file)
+
+        # 从存档开始（读档会清空倒带缓冲区和粒子，所以放在它们创建之后）
+        if state_path:
+            self._load_state(state_path)
+        self.startup.mark('game objects')
+
+        if profile_startup:
+            print(self.startup.report())
+
+    def _wait_for_loader(self):
+        """
+        等待后台加载完成：期间处理窗口事件（可以直接关闭窗口），并画一个进度条。
+        """
+        width, height = 400, 12
+        frame = pygame.Rect(0, 0, width, height)
+        frame.center = self.screen.get_rect().center
+        color = (60, 60, 60)
+
+        while not self.loader.ready.wait(1 / self.settings.fps):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or (
+                        event.type == pygame.KEYDOWN and event.key == pygame.K_q):
+                    sys.exit()
+            pygame.draw.rect(self.screen, color, frame, 1)
+            bar = frame.inflate(-4, -4)
+            bar.width = int(bar.width * self.loader.progress)
+            self.screen.fill(color, bar)
+            pygame.display.update(frame)
+
+        self.loader.raise_error()
 
     # ---------- 声音相关 ----------
 
@@ -64,8 +212,6 @@ class AlienInvasion:
             if not pygame.mixer.get_init():
                 pygame.mixer.init()
         except Exception:
-            self.laser_sound = None
-            self.explosion_sound = None
             print("Warning: pygame.mixer 初始化失败，已禁用音效。")
             return
 
@@ -86,22 +232,110 @@ class AlienInvasion:
     # ---------- 主循环 ----------
 
     def run_game(self):
-        """Start the main loop for the game."""
-        while True:
-            self._check_events()
+        """
+        Start the main loop for the game.
 
-            if self.stats.game_active:
-                self.ship.update()
-                self._update_bullets()
-                self._update_aliens()
-                self._update_alien_bullets()
+        固定步长循环：按真实经过的时间累积，每满一个步长就模拟一步；
+        每帧最多补跑 max_ticks_per_frame 步，剩余的零头用于绘制插值。
+        """
+        tick_seconds = self.settings.tick_seconds
+        accumulator = 0.0
+        last_time = frame_start = time.perf_counter()
+        profiler = self.profiler
 
-                # 每帧更新时间并交给 Shield 管理护盾
-                now = pygame.time.get_ticks()
-                self.shield.update(now)
+        while True:
+            now = time.perf_counter()
+            accumulator += now - last_time
+            last_time = now
+
+            # 整帧按开始时的状态决定是否计时（sim.step 内部的阶段由 sim 自己打点）
+            profiling = profiler.enabled
+            if profiling:
+                profiler.start_frame()
 
-            self._update_screen()
-            self.clock.tick(60)
+            self._check_events()
+            if profiling:
+                profiler.lap('events')
+
+            if self.rewinding:
+                # 倒带中模拟暂停，不积累时间
+                accumulator = 0.0
+                self._scrub()
+
+            ticks = 0
+            slipped = False
+            while accumulator >= tick_seconds:
+                if ticks == self.settings.max_ticks_per_frame:
+                    # 机器跟不上：丢掉积压的时间，游戏变慢但不会越积越多
+                    accumulator = 0.0
+                    slipped = True
+                    break
+                if self.recorder:
+                    self.recorder.record(self.inputs)
+                events = self.sim.step(self.inputs)
+                if self.recorder:
+                    self.recorder.after_step(self.sim)
+                self.inputs.clear_actions()
+                self._handle_sim_events(events)
+                if profiling:
+                    profiler.lap('sim_events')
+                if self.sim.stats.game_active or events:
+                    # GAME OVER 之后状态不再变化，不再保存快照（以免挤掉死亡前的历史）
+                    self.rewind.record(self.sim)
+                if profiling:
+                    profiler.lap('rewind')
+                if self.particles:
+                    self.particles.update(tick_seconds)
+                    if profiling:
+                        profiler.lap('particles')
+                accumulator -= tick_seconds
+                ticks += 1
+
+            self._update_screen(accumulator / tick_seconds)
+            if profiling:
+                profiler.lap('render')
+            if self.capture:
+                self.capture.capture(self.screen, self.sim.ticks)
+                if profiling:
+                    profiler.lap('capture')
+            work = time.perf_counter() - now
+            if self.governor:
+                # 本帧的工作时间（不含下面的等待）
+                self.governor.frame(work, slipped)
+            if self.metrics:
+                self._update_metrics(work, now - frame_start, ticks, slipped)
+            frame_start = now
+            self.clock.tick(self.settings.fps)
+            if profiling:
+                profiler.lap('wait')
+                profiler.end_frame()
+
+    def _handle_sim_events(self, events):
+        """根据模拟核心产生的事件播放音效、生成爆炸粒子、记录成绩。"""
+        for kind, data in events:
+            if kind == 'fire':
+                if getattr(self, "laser_sound", None):
+                    self.laser_sound.play()
+            elif kind == 'aliens_killed':
+                if getattr(self, "explosion_sound", None):
+                    self.explosion_sound.play()
+            elif kind == 'explosion':
+                self._burst(data, self.settings.particles_per_alien, self.alien_debris)
+            elif kind in ('ship_hit', 'game_over'):
+                # 飞船此时还在被击中的位置（重生暂停结束后才回到底部中央）
+                self._burst([self.sim.ship.rect.center], self.settings.particles_per_ship_hit,
+                            self.ship_debris)
+                if kind == 'game_over':
+                    self._record_score()
+
+    def _burst(self, centers, count, colors):
+        """在 centers 处生成爆炸粒子（负载调节降级时按比例减少数量）。"""
+        if not self.particles:
+            return
+        if self.governor:
+            count = int(count * self.governor.quality.particles)
+        s = self.settings
+        self.particles.burst(centers, count, s.particle_speed, s.particle_lifetime, colors)
 
     # ---------- 事件处理 ----------
 
@@ -118,288 +352,336 @@ class AlienInvasion:
     def _check_keydown_events(self, event):
         """Respond to keypresses."""
         if event.key in (pygame.K_RIGHT, pygame.K_d):
-            self.ship.moving_right = True
+            self.inputs.moving_right = True
         elif event.key in (pygame.K_LEFT, pygame.K_a):
-            self.ship.moving_left = True
+            self.inputs.moving_left = True
         elif event.key in (pygame.K_UP, pygame.K_w):
-            self.ship.moving_up = True
+            self.inputs.moving_up = True
         elif event.key in (pygame.K_DOWN, pygame.K_s):
-            self.ship.moving_down = True
+            self.inputs.moving_down = True
         elif event.key == pygame.K_q:
             self._save_and_quit()
         elif event.key == pygame.K_SPACE:
-            self._fire_bullet()
+            self.inputs.fire = True
         elif event.key == pygame.K_t:
             # 按 T 键激活护盾（交给 Shield 判断次数和冷却）
-            if self.stats.game_active:
-                now = pygame.time.get_ticks()
-                self.shield.activate(now)
+            self.inputs.shield = True
+        elif event.key == pygame.K_F3:
+            self._toggle_profiler()
+        elif event.key == pygame.K_F2:
+            self._dump_profile()
+        elif event.key == pygame.K_F5:
+            self._toggle_rewind()
+        elif event.key == pygame.K_F6:
+            self._save_state()
+        elif event.key == pygame.K_F7:
+            self._load_state(self.settings.save_state_path)
+        elif event.key == pygame.K_F9:
+            self._toggle_capture()
 
     def _check_keyup_events(self, event):
         """Respond to key releases."""
         if event.key in (pygame.K_RIGHT, pygame.K_d):
-            self.ship.moving_right = False
+            self.inputs.moving_right = False
         elif event.key in (pygame.K_LEFT, pygame.K_a):
-            self.ship.moving_left = False
+            self.inputs.moving_left = False
         elif event.key in (pygame.K_UP, pygame.K_w):
-            self.ship.moving_up = False
+            self.inputs.moving_up = False
         elif event.key in (pygame.K_DOWN, pygame.K_s):
-            self.ship.moving_down = False
-
-    def _save_and_quit(self):
-        """退出游戏前保存最高分。"""
-        self.stats.save_high_score()
-        sys.exit()
-
-    # ---------- 玩家子弹相关 ----------
-
-    def _fire_bullet(self):
-        """Create a new bullet and add it to the bullets group."""
-        if len(self.bullets) < self.settings.bullets_allowed and self.stats.game_active:
-            new_bullet = Bullet(self)
-            self.bullets.add(new_bullet)
-
-            if getattr(self, "laser_sound", None):
-                self.laser_sound.play()
-
-    def _update_bullets(self):
-        """Update position of bullets and get rid of old bullets."""
-        self.bullets.update()
-
-        for bullet in self.bullets.copy():
-            if bullet.rect.bottom <= 0:
-                self.bullets.remove(bullet)
-
-        self._check_bullet_alien_collisions()
-
-    def _check_bullet_alien_collisions(self):
-        """Respond to bullet-alien collisions."""
-        collisions = pygame.sprite.groupcollide(
-            self.bullets, self.aliens, True, True
-        )
-
-        if collisions:
-            for aliens in collisions.values():
-                self.stats.score += self.settings.alien_points * len(aliens)
-
-            if getattr(self, "explosion_sound", None):
-                self.explosion_sound.play()
-
-            if self.stats.score > self.stats.high_score:
-                self.stats.high_score = self.stats.score
-
-    # ---------- 外星人相关 ----------
-
-    def _create_initial_aliens(self):
-        """初始生成一些随机外星人。"""
-        for _ in range(5):
-            self._create_random_alien()
-
-    def _create_random_alien(self):
-        """Create an alien and place it randomly."""
-        new_alien = Alien(self)
-        self.aliens.add(new_alien)
-
-    def _update_aliens(self):
-        """Update the positions of all aliens，随机生成并检测碰撞。"""
-        self.aliens.update()
-
-        # 随机刷怪
-        if len(self.aliens) < self.settings.max_aliens:
-            if random.random() < self.settings.alien_spawn_chance:
-                self._create_random_alien()
-
-        # 只在“碰到飞船”时才可能扣命；到达底部不再扣命
-        self._check_aliens_bottom_or_hit_ship()
-
-        # 外星人从一开始就会发射子弹
-        elapsed_seconds = (pygame.time.get_ticks() - self.start_time) / 1000
-        self._alien_fire_bullets(elapsed_seconds)
-
-    def _check_aliens_bottom_or_hit_ship(self):
-        """
-        检查外星人是否撞到飞船或到达屏幕底部。
-
-        修改点：
-        - 撞到飞船：先让护盾尝试吃掉伤害，只在护盾失败时扣命。
-        - 到达屏幕底部：只删除外星人，不再调用 _ship_hit() 扣命。
-        """
-        screen_rect = self.screen.get_rect()
-
-        # 与飞船碰撞
-        colliding_aliens = pygame.sprite.spritecollide(self.ship, self.aliens, True)
-        if colliding_aliens:
-            # 先尝试让护盾吃掉伤害（成功则不扣命）
-            if not self.shield.consume_if_active():
-                self._ship_hit()
-
-        # 到达底部：只删除外星人，不扣命
-        for alien in self.aliens.copy():
-            if alien.rect.bottom >= screen_rect.bottom:
-                self.aliens.remove(alien)
-
-    # ---------- 外星人子弹相关 ----------
-
-    def _alien_fire_bullets(self, elapsed_seconds):
-        """外星人随机发射子弹：从一开始就会射击。"""
-        if len(self.alien_bullets) >= self.settings.alien_bullets_allowed:
+            self.inputs.moving_down = False
+
+    def _toggle_profiler(self):
+        """F3：开关分阶段帧计时和叠加层。"""
+        self.show_profiler = not self.show_profiler
+        if self.show_profiler:
+            self.profiler.enable()
+        elif not self.profile_path:
+            self.profiler.disable()
+        self._full_refresh = True
+
+    def _dump_profile(self):
+        """把最近的帧耗时导出到 profile_path（默认 frame_profile.csv）。"""
+        if not self.profiler.frames:
             return
-
-        for alien in self.aliens.sprites():
-            if random.random() < self.settings.alien_fire_chance:
-                bullet = AlienBullet(self, alien)
-                self.alien_bullets.add(bullet)
-
-    def _update_alien_bullets(self):
-        """更新外星人子弹位置并检测与飞船的碰撞。"""
-        self.alien_bullets.update()
-
-        for bullet in self.alien_bullets.copy():
-            if bullet.rect.top >= self.settings.screen_height:
-                self.alien_bullets.remove(bullet)
-
-        colliding_bullets = pygame.sprite.spritecollide(
-            self.ship, self.alien_bullets, True
-        )
-        if colliding_bullets:
-            # 先尝试让护盾吃掉伤害；若护盾不存在，则真正扣命
-            if not self.shield.consume_if_active():
-                self._ship_hit()
-
-    # ---------- 飞船被击中 / GAME OVER ----------
-
-    def _ship_hit(self):
-        """
-        处理飞船被外星人或子弹击中（生命值 -1，生命为 0 则游戏结束并提示 Game Over）。
-        注意：这里已经确保是“护盾没挡住”的真正伤害。
-        """
-        if not self.stats.game_active:
+        path = self.profile_path or 'frame_profile.csv'
+        self.profiler.dump(path, 1000.0 / self.settings.fps)
+        print(f"已导出帧耗时：{path}（最近 {len(self.profiler)} 帧）")
+
+    def _toggle_rewind(self):
+        """F5：暂停并进入倒带（← / → 逐帧后退 / 前进）；再按一次从当前画面继续游戏。"""
+        if self.rewinding:
+            self._resume_from_rewind()
+        elif len(self.rewind):
+            self.rewinding = True
+            self.rewind_index = len(self.rewind) - 1
+            # 粒子不属于游戏状态，倒带时直接清掉
+            if self.particles:
+                self.particles.clear()
+
+    def _scrub(self):
+        """倒带中的一帧：按住 ← 后退一个快照，按住 → 前进一个快照。"""
+        direction = int(self.inputs.moving_right) - int(self.inputs.moving_left)
+        index = min(max(self.rewind_index + direction, 0), len(self.rewind) - 1)
+        if index != self.rewind_index:
+            self.rewind_index = index
+            restore(self.sim, self.rewind.seek(index))
+
+    def _resume_from_rewind(self):
+        """从倒带停下的位置继续：丢掉之后的快照和录制的输入。"""
+        self.rewind.truncate(self.rewind_index)
+        if self.recorder:
+            self.recorder.truncate(self.sim.ticks)
+        # 倒带时按下的开火 / 护盾不带到继续后的第一步
+        self.inputs.clear_actions()
+        self.rewinding = False
+
+    def _save_state(self):
+        """F6：把当前状态存档到 save_state_path。"""
+        path = self.settings.save_state_path
+        try:
+            save_state(path, self.sim)
+        except OSError as e:
+            print(f"Warning: 存档失败：{e}")
             return
+        print(f"已存档：{path}（第 {self.sim.ticks} 步）")
 
-        if self.stats.ships_left > 1:
-            self.stats.ships_left -= 1
-
-            self.aliens.empty()
-            self.bullets.empty()
-            self.alien_bullets.empty()
-
-            self._create_initial_aliens()
-            self.ship.center_ship()
-
-            pygame.time.delay(500)
+    def _load_state(self, path):
+        """F7 / --load-state：从存档继续游戏（录制输入时不能读档，否则录制无法回放）。"""
+        if self.recorder:
+            print("Warning: 正在录制输入，不能读档")
+            return
+        try:
+            load_state(path, self.sim)
+        except (OSError, ValueError) as e:
+            print(f"Warning: 读档失败：{e}")
+            return
+        self.rewind.clear()
+        self.rewinding = False
+        if self.particles:
+            self.particles.clear()
+        self._full_refresh = True
+        print(f"已读档：{path}（第 {self.sim.ticks} 步）")
+
+    def _start_capture(self, directory=None):
+        """开始录制画面；每次录制放在输出目录下按时间命名的子目录里。"""
+        s = self.settings
+        directory = directory or os.path.join(s.capture_dir, time.strftime('%Y%m%d-%H%M%S'))
+        try:
+            self.capture = FrameCapture(self.screen, directory, s.capture_format,
+                                        s.capture_buffers, s.capture_every, s.fps)
+        except (OSError, ValueError) as e:
+            print(f"Warning: 无法开始录制：{e}")
+            return
+        print(f"开始录制：{self.capture.path}")
+
+    def _stop_capture(self):
+        """停止录制，等后台线程写完剩下的帧。"""
+        self.capture.close()
+        print(f"录制结束：{self.capture.summary()}")
+        self.capture = None
+
+    def _toggle_capture(self):
+        """F9：开始 / 停止录制画面。"""
+        if self.capture:
+            self._stop_capture()
         else:
-            self.stats.ships_left = 0
-            self.stats.game_active = False
-            self.stats.save_high_score()
+            self._start_capture()
+
+    def _start_metrics(self, port, path):
+        """创建运行指标并启动导出（HTTP 服务 / 定时写文件）；端口被占用时只打印警告。"""
+        self.metrics = GameMetrics()
+        self.sim.metrics = self.metrics
+        registry = self.metrics.registry
+        if port is not None:
+            try:
+                server = MetricsServer(registry, self.settings.metrics_host, port)
+            except OSError as e:
+                print(f"Warning: 无法启动运行指标服务：{e}")
+            else:
+                self.metrics_exporters.append(server)
+                print(f"运行指标：{server.url}")
+        if path:
+            self.metrics_exporters.append(
+                MetricsFileWriter(registry, path, self.settings.metrics_file_interval))
+            print(f"运行指标：每 {self.settings.metrics_file_interval:g} 秒写入 {path}")
+
+    def _update_metrics(self, work, interval, ticks, slipped):
+        """每帧一次：帧耗时直方图和实体数量等仪表。"""
+        m, sim = self.metrics, self.sim
+        m.frames.inc()
+        m.ticks.inc(ticks)
+        if slipped:
+            m.slipped_frames.inc()
+        m.frame_work.observe(work)
+        m.frame_interval.observe(interval)
+        m.fps.set(self.clock.get_fps())
+        m.aliens.set(len(sim.aliens))
+        m.bullets.set(len(sim.bullets))
+        m.alien_bullets.set(len(sim.alien_bullets))
+        if self.particles:
+            m.particles.set(self.particles.live)
+        m.score.set(sim.stats.score)
+        m.lives.set(sim.stats.ships_left)
+        if self.governor:
+            m.governor_level.set(self.governor.level)
+
+    def _record_score(self):
+        """把这一局的成绩交给 ScoreStore（只放进队列，写盘在后台线程）。"""
+        sim = self.sim
+        self.scores.record(
+            sim.stats.score, sim.ticks / self.settings.tick_rate, sim.seed, self.settings_hash
+        )
+
+    def _save_and_quit(self):
+        """退出游戏前记录未结束的这一局，写完成绩日志（以及输入录制、帧耗时）。"""
+        if self.rewinding:
+            self._resume_from_rewind()
+        if self.sim.stats.game_active and self.sim.stats.score > 0:
+            self._record_score()
+        self.scores.close()
+        if self.recorder:
+            self.recorder.save(self.record_path, self.sim)
+            print(f"已保存录制：{self.record_path}（种子 {self.sim.seed}）")
+        if self.profile_path:
+            self._dump_profile()
+        if self.capture:
+            self._stop_capture()
+        for exporter in self.metrics_exporters:
+            exporter.close()
+        sys.exit()
 
     # ---------- 绘制屏幕 ----------
 
     def _draw_scoreboard(self):
-        """在屏幕上绘制分数、最高分、生命值和护盾状态。"""
-        text_color = (30, 30, 30)
-        bg_color = self.settings.bg_color
-
-        score_str = f"Score: {self.stats.score}"
-        high_score_str = f"High Score: {self.stats.high_score}"
-        lives_str = f"Lives: {self.stats.ships_left}"
-
-        shield_status = "ON" if self.shield.is_active else "OFF"
-        shield_str = f"Shield: {self.shield.charges} ({shield_status})"
-
-        score_img = self.font.render(score_str, True, text_color, bg_color)
-        high_score_img = self.font.render(high_score_str, True, text_color, bg_color)
-        lives_img = self.font.render(lives_str, True, text_color, bg_color)
-        shield_img = self.font.render(shield_str, True, text_color, bg_color)
-
-        score_rect = score_img.get_rect()
-        high_score_rect = high_score_img.get_rect()
-        lives_rect = lives_img.get_rect()
-        shield_rect = shield_img.get_rect()
-
-        score_rect.left = 20
-        score_rect.top = 10
-
-        shield_rect.left = 20
-        shield_rect.top = score_rect.bottom + 5
-
-        high_score_rect.centerx = self.settings.screen_width // 2
-        high_score_rect.top = 10
-
-        lives_rect.right = self.settings.screen_width - 20
-        lives_rect.top = 10
-
-        self.screen.blit(score_img, score_rect)
-        self.screen.blit(high_score_img, high_score_rect)
-        self.screen.blit(lives_img, lives_rect)
-        self.screen.blit(shield_img, shield_rect)
+        """
+        绘制分数、最高分、生命值和护盾状态（文字图片由 Hud 缓存，加入当前绘制层）。
+        负载调节降级时每隔 hud_interval 帧才更新一次显示的数值，其余帧沿用上次的图片。
+        """
+        interval = self.governor.quality.hud_interval if self.governor else 1
+        self._hud_age += 1
+        if self._hud_age >= interval or not self._hud_items:
+            self._hud_items = self.hud.scoreboard_items(self.sim.stats, self.sim.shield)
+            self._hud_age = 0
+        self.batch.extend(self._hud_items)
 
     def _draw_game_over(self):
         """生命值归零时在屏幕中间显示 Game Over 提示。"""
-        if self.stats.game_active:
+        if self.sim.stats.game_active:
             return
 
-        big_font = pygame.font.SysFont(None, 72)
-        game_over_str = "GAME OVER"
-        tip_str = "Press Q to quit"
-
-        game_over_img = big_font.render(
-            game_over_str, True, (255, 0, 0), self.settings.bg_color
-        )
-        tip_img = self.font.render(
-            tip_str, True, (30, 30, 30), self.settings.bg_color
+        self.batch.extend(
+            self.hud.game_over_items(self.scores.leaderboard(self.settings.leaderboard_shown))
         )
 
-        game_over_rect = game_over_img.get_rect()
-        tip_rect = tip_img.get_rect()
-
-        game_over_rect.centerx = self.settings.screen_width // 2
-        game_over_rect.centery = self.settings.screen_height // 2 - 30
-
-        tip_rect.centerx = self.settings.screen_width // 2
-        tip_rect.top = game_over_rect.bottom + 10
-
-        self.screen.blit(game_over_img, game_over_rect)
-        self.screen.blit(tip_img, tip_rect)
-
-    def _draw_shield_circle(self):
+    def _draw_shield_circle(self, ship_rect):
         """
-        如果护盾激活，在飞船外画一个圆把飞船包住。
+        如果护盾激活，在飞船（画在 ship_rect 处）外画一个圆把飞船包住。
         圆只是一种视觉表现，真正的判定仍然用精灵碰撞。
         """
-        if not self.shield.is_active:
+        if not self.sim.shield.is_active:
             return
 
         # 以飞船中心为圆心，半径略大于飞船
-        cx, cy = self.ship.rect.center
-        radius = max(self.ship.rect.width, self.ship.rect.height) // 2 + 10
+        cx, cy = ship_rect.center
+        radius = max(ship_rect.width, ship_rect.height) // 2 + 10
         # 画一个浅蓝色的圆环（只描边）
         color = (0, 200, 255)
-        pygame.draw.circle(self.screen, color, (cx, cy), radius, 3)
-
-    def _update_screen(self):
-        """Update images on the screen, and flip to the new screen."""
-        self.screen.fill(self.settings.bg_color)
+        self._drawn_rects.append(
+            pygame.draw.circle(self.screen, color, (cx, cy), radius, 3)
+        )
 
-        for bullet in self.bullets.sprites():
-            bullet.draw_bullet()
+    def _update_screen(self, alpha=1.0):
+        """
+        Update images on the screen.
 
-        self.aliens.draw(self.screen)
-        self.ship.blitme()
+        alpha（0~1）是距离上一步模拟已经过去的步长比例，物体画在上一步和当前步的插值位置。
 
-        # 护盾可视化：画一个圆包裹飞船
-        self._draw_shield_circle()
+        默认使用脏矩形模式（同 pygame RenderUpdates 的做法）：只擦除上一帧画过的区域，
+        重画所有物体，再用 display.update(rects) 只推送变化的区域；
+        settings.dirty_rendering 为 False 时整屏填充并 flip。
 
-        for bullet in self.alien_bullets.sprites():
-            bullet.draw_bullet()
+        精灵分两层收集到 SpriteBatch，每层一次 blits：
+        玩家子弹 + 外星人 + 飞船，（护盾圆环，）外星人子弹 + HUD。
+        爆炸粒子在这两层之前直接写进屏幕像素，画在所有精灵下面。
+        """
+        dirty = self.settings.dirty_rendering and not self._full_refresh
+        bg_color = self.settings.bg_color
 
+        if dirty:
+            # 擦除上一帧画过的区域（从背景图拷贝，一次 blits）
+            background = self.background
+            self.screen.blits([(background, rect, rect) for rect in self._last_rects],
+                              doreturn=False)
+        else:
+            self.screen.fill(bg_color)
+
+        self._drawn_rects = drawn = []
+        if self.particles:
+            drawn += self.particles.draw(self.screen)
+        sim = self.sim
+        if not sim.stats.game_active or sim.ship.respawning or self.rewinding:
+            # 游戏结束后 / 重生暂停 / 倒带中物体不再移动，直接画在当前位置
+            alpha = 1.0
+        elif self.governor and not self.governor.quality.interpolate:
+            # 负载调节降级：不插值，省去每帧计算插值位置
+            alpha = 1.0
+
+        batch = self.batch
+        batch.add_many(self.bullet_image, draw_positions(sim.bullets, alpha))
+        batch.add_many(sim.aliens.image, sim.aliens.draw_positions(alpha))
+        # 重生暂停时不画飞船，无敌时闪烁
+        ship_visible = sim.ship.visible
+        if ship_visible:
+            batch.add(sim.ship.image, sim.ship.draw_position(alpha))
+        drawn += batch.flush(self.screen)
+
+        if ship_visible:
+            # 护盾可视化：画一个圆包裹飞船（飞船是上一层最后画的）
+            self._draw_shield_circle(drawn[-1])
+
+        batch.add_many(self.alien_bullet_image, sim.alien_bullets.draw_positions(alpha))
         self._draw_scoreboard()
-
-        if not self.stats.game_active and self.stats.ships_left == 0:
+        if not sim.stats.game_active and sim.stats.ships_left == 0:
             self._draw_game_over()
+        if self.rewinding:
+            latest = self.rewind.ticks(len(self.rewind) - 1)
+            batch.extend(self.hud.rewind_items((latest - sim.ticks) / self.settings.tick_rate))
+        drawn += batch.flush(self.screen)
+
+        if self.show_profiler:
+            drawn += self.profiler_overlay.draw(self.screen)
+
+        if dirty:
+            # 上一帧的区域（已擦除）和本帧的区域都需要推送
+            rects = self._last_rects + drawn
+            pygame.display.update(rects)
+            self.pixels_pushed = sum(rect.width * rect.height for rect in rects)
+        else:
+            pygame.display.flip()
+            self.pixels_pushed = self.settings.screen_width * self.settings.screen_height
+            self._full_refresh = False
 
-        pygame.display.flip()
+        self._last_rects = drawn
 
 
 if __name__ == '__main__':
-    ai = AlienInvasion()
+    parser = argparse.ArgumentParser(description="Alien Invasion")
+    parser.add_argument('--seed', type=int, help="随机种子（用于复现同一局）")
+    parser.add_argument('--record', metavar='FILE', help="录制输入，退出时写入 FILE")
+    parser.add_argument('--profile', metavar='FILE',
+                        help="记录分阶段帧耗时，退出时导出到 FILE（.csv 或 .json）")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="打印启动各阶段（到第一帧、到可以开始游戏）的耗时")
+    parser.add_argument('--capture', metavar='DIR', help="从一开始录制画面到 DIR（也可以按 F9 开关）")
+    parser.add_argument('--load-state', metavar='FILE', help="从存档 FILE（F6 保存）开始游戏")
+    parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                        help="在 127.0.0.1:PORT/metrics 提供 Prometheus 格式的运行指标")
+    parser.add_argument('--metrics-file', metavar='FILE',
+                        help="定时把运行指标（Prometheus 文本格式）写入 FILE，代替 HTTP 服务")
+    args = parser.parse_args()
+
+    ai = AlienInvasion(seed=args.seed, record_path=args.record, profile_path=args.profile,
+                       profile_startup=args.profile_startup, capture_dir=args.capture,
+                       state_path=args.load_state, metrics_port=args.metrics_port,
+                       metrics_file=args.metrics_file)
     ai.run_game()
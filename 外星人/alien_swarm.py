@@ -0,0 +1,271 @@
+import numpy as np
+
+from projectiles import ATTACKS
+from spatial_hash import SpatialHash, BRUTE_FORCE_PAIRS, brute_force_pairs, overlapping
+
+
+class AlienSwarm:
+    """
+    用 NumPy 数组保存所有外星人（结构数组：x / y / vx / vy / alive）。
+
+    每帧对所有外星人做一次批量更新，代替逐个精灵调用 Alien.update()；
+    移动规则与原来相同：随机漂移、左右边缘反弹、偶尔反向、偶尔变速。
+    """
+
+    def __init__(self, ai_game, capacity=16):
+        """
+        :param ai_game: 提供 settings / screen_rect / assets / rng 的游戏对象
+        :param capacity: 初始数组容量，不够时自动翻倍
+        """
+        self.settings = ai_game.settings
+        self.screen_rect = ai_game.screen_rect
+
+        # 所有外星人共用同一张图片
+        self.image = ai_game.assets.image('alien.bmp')
+        self.width, self.height = self.image.get_size()
+        # 像素级碰撞用的掩码（由 Assets 缓存）
+        self.mask = ai_game.assets.mask('alien.bmp')
+        self.mask_table = ai_game.assets.mask_table('alien.bmp')
+
+        # 与游戏共用同一个带种子的随机数流，保证可以复现
+        self.rng = ai_game.rng
+
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        # 上一步的位置，用于绘制时插值
+        self.prev_x = np.zeros(capacity)
+        self.prev_y = np.zeros(capacity)
+        self.alive = np.zeros(capacity, dtype=bool)
+        # 与 rect 一致的整数坐标（向零取整，和 int() 相同）
+        self.ix = np.zeros(capacity, dtype=np.int64)
+        self.iy = np.zeros(capacity, dtype=np.int64)
+        # 攻击类型（ATTACKS 中的下标），生成时按 settings.alien_attack_weights 随机决定
+        self.attack = np.zeros(capacity, dtype=np.int8)
+        weights = self.settings.alien_attack_weights
+        weights = np.array([weights.get(name, 0.0) for name in ATTACKS], dtype=np.float64)
+        self._attack_p = weights / weights.sum()
+        # 只有一种攻击类型时不抽随机数，随机数序列与没有攻击类型时相同
+        self._single_attack = (int(np.argmax(weights))
+                               if np.count_nonzero(weights) == 1 else None)
+
+        self._size = 0     # 用过的最大下标 + 1，只处理 [:_size]
+        self._count = 0    # 存活数量
+        self._free = []    # 已死亡、可以复用的下标（槽位池）
+        self.high_water = 0  # 同时存活的最大数量
+
+        # 碰撞粗筛网格：外星人移动或新增后标记为过期，下次查询前重建
+        self.grid = SpatialHash(self.screen_rect.width, self.screen_rect.height,
+                                self.settings.collision_cell_size)
+        self._grid_dirty = True
+
+    def __len__(self):
+        return self._count
+
+    def __bool__(self):
+        return self._count > 0
+
+    # ---------- 生成 / 删除 ----------
+
+    def spawn(self):
+        """在屏幕上方随机位置生成一个外星人，返回其下标。"""
+        if self._free:
+            index = self._free.pop()
+        else:
+            if self._size == len(self.x):
+                self._grow()
+            index = self._size
+            self._size += 1
+
+        rng = self.rng
+        base = self.settings.alien_speed
+
+        # 随机出现在屏幕上方区域的任意位置
+        self.ix[index] = rng.integers(0, self.screen_rect.width - self.width, endpoint=True)
+        self.iy[index] = rng.integers(0, self.height * 2, endpoint=True)
+        self.x[index] = self.prev_x[index] = self.ix[index]
+        self.y[index] = self.prev_y[index] = self.iy[index]
+
+        # 随机速度，产生“不规则移动”效果
+        self.vx[index] = rng.choice((-1, 1)) * rng.uniform(0.3 * base, 1.5 * base)
+        self.vy[index] = rng.uniform(0.2 * base, 1.0 * base)
+        if self._single_attack is None:
+            self.attack[index] = rng.choice(len(ATTACKS), p=self._attack_p)
+        else:
+            self.attack[index] = self._single_attack
+
+        self.alive[index] = True
+        self._count += 1
+        if self._count > self.high_water:
+            self.high_water = self._count
+        self._grid_dirty = True
+        return index
+
+    def kill(self, indices):
+        """删除给定下标的外星人（已死亡的下标会被忽略）。"""
+        indices = np.asarray(indices, dtype=np.intp)
+        indices = indices[self.alive[indices]]
+        if indices.size:
+            self.alive[indices] = False
+            self._count -= indices.size
+            self._free.extend(indices.tolist())
+        return indices.size
+
+    def release(self, count):
+        """删除 count 个外星人（用于分几步逐渐清空），返回实际删除的数量。"""
+        if count <= 0:
+            return 0
+        return self.kill(self.alive_indices()[:count])
+
+    def empty(self):
+        """删除所有外星人。"""
+        self.alive[:] = False
+        self._size = 0
+        self._count = 0
+        self._free.clear()
+        self._grid_dirty = True
+
+    def _grow(self):
+        """数组容量翻倍。"""
+        capacity = len(self.x) * 2
+        for name in ('x', 'y', 'vx', 'vy', 'prev_x', 'prev_y', 'alive', 'ix', 'iy', 'attack'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    # ---------- 批量更新 ----------
+
+    def update(self, dt):
+        """不规则移动：一次性把所有外星人的位置和速度推进 dt 秒。"""
+        n = self._size
+        if not n:
+            return
+        x, y, vx, vy = self.x[:n], self.y[:n], self.vx[:n], self.vy[:n]
+        rng = self.rng
+        settings = self.settings
+
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+
+        # 位置更新
+        x += vx * dt
+        y += vy * dt
+
+        # 与左右边缘碰撞就反弹；另有小概率随机反向（两者同时发生则相互抵消）
+        bounce = (x <= 0) | (x + self.width >= self.screen_rect.width)
+        flip = rng.random(n) < settings.tick_chance(settings.alien_flip_rate)
+        vx[bounce ^ flip] *= -1
+
+        # 小概率随机变速
+        jitter = np.flatnonzero(rng.random(n) < settings.tick_chance(settings.alien_jitter_rate))
+        if jitter.size:
+            vy[jitter] *= rng.choice((0.5, 1.0, 1.5), size=jitter.size)
+
+        np.copyto(self.ix[:n], x, casting='unsafe')
+        np.copyto(self.iy[:n], y, casting='unsafe')
+        self._grid_dirty = True
+
+    # ---------- 碰撞查询 ----------
+
+    def _ensure_grid(self):
+        """位置或数量变化后重建网格（每帧最多一次）。"""
+        if self._grid_dirty:
+            n = self._size
+            self.grid.build(self.ix[:n], self.iy[:n], self.width, self.height,
+                            self.alive[:n])
+            self._grid_dirty = False
+        return self.grid
+
+    def collide_rect(self, rect):
+        """返回与 rect 重叠（与 Rect.colliderect 规则相同）的存活外星人下标。"""
+        if self._grid_dirty:
+            # 只有一个查询矩形：整体扫描一遍比重建网格更快
+            n = self._size
+            hit = self.alive[:n] & overlapping(rect, self.ix[:n], self.iy[:n],
+                                               self.width, self.height)
+            return np.flatnonzero(hit)
+        return self.grid.query_rect(rect)
+
+    def collide_rects(self, rects):
+        """
+        多个矩形（(n, 4) 数组）同时查询，返回 (矩形下标, 外星人下标) 重叠对。
+        """
+        n = self._size
+        if len(rects) * n <= BRUTE_FORCE_PAIRS:
+            return brute_force_pairs(rects, self.ix[:n], self.iy[:n],
+                                     self.width, self.height, self.alive[:n])
+        return self._ensure_grid().query_pairs(rects)
+
+    def below(self, bottom):
+        """返回下边缘已到达 bottom 的存活外星人下标。"""
+        n = self._size
+        return np.flatnonzero(self.alive[:n] & (self.iy[:n] + self.height >= bottom))
+
+    def state_bytes(self):
+        """存活外星人的位置、速度和攻击类型（按下标顺序）的字节串，用于计算状态哈希。"""
+        indices = self.alive_indices()
+        return (indices.tobytes() + self.x[indices].tobytes() + self.y[indices].tobytes()
+                + self.vx[indices].tobytes() + self.vy[indices].tobytes()
+                + self.attack[indices].tobytes())
+
+    # 快照用的数组（按这个顺序拼接），见 rewind.py
+    STATE_ARRAYS = ('x', 'y', 'vx', 'vy', 'prev_x', 'prev_y', 'ix', 'iy', 'alive', 'attack')
+
+    def get_state(self):
+        """
+        完整状态：(已用槽位数, 存活数, 最大同时存活数, 空闲槽位数组, [各数组的 [:已用槽位数] 切片])。
+        空闲槽位的顺序决定之后复用哪个槽位，所以也要保存。
+        """
+        n = self._size
+        return (n, self._count, self.high_water, np.array(self._free, dtype=np.int64),
+                [getattr(self, name)[:n] for name in self.STATE_ARRAYS])
+
+    def set_state(self, size, count, high_water, free, arrays):
+        """从 get_state() 的结果还原（数组会被复制）。"""
+        while len(self.x) < size:
+            self._grow()
+        for name, values in zip(self.STATE_ARRAYS, arrays):
+            getattr(self, name)[:size] = values
+        self.alive[size:] = False
+        self._size = size
+        self._count = count
+        self.high_water = high_water
+        self._free = free.tolist()
+        self._grid_dirty = True
+
+    def alive_indices(self):
+        """所有存活外星人的下标。"""
+        return np.flatnonzero(self.alive[:self._size])
+
+    def midbottoms(self, indices):
+        """一组外星人 rect 底部中心的坐标，(n, 2) 数组（外星人子弹从这里发射）。"""
+        return np.column_stack((self.ix[indices] + self.width // 2,
+                                self.iy[indices] + self.height))
+
+    def stats(self):
+        """槽位池统计：存活数、可复用空槽数、最大同时存活数、数组容量。"""
+        return {
+            'live': self._count,
+            'free': len(self._free) + len(self.x) - self._size,
+            'high_water': self.high_water,
+            'capacity': len(self.x),
+        }
+
+    def draw_positions(self, alpha=1.0):
+        """
+        所有存活外星人的绘制位置列表 [[x, y], ...]。
+
+        alpha 在 0~1 之间时，取上一步和当前步位置之间的插值处。
+        """
+        indices = self.alive_indices()
+        if not indices.size:
+            return []
+        if alpha == 1.0:
+            xs, ys = self.ix[indices], self.iy[indices]
+        else:
+            px, py = self.prev_x[indices], self.prev_y[indices]
+            xs = (px + (self.x[indices] - px) * alpha).astype(np.int64)
+            ys = (py + (self.y[indices] - py) * alpha).astype(np.int64)
+        return np.column_stack((xs, ys)).tolist()
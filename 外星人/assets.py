@@ -0,0 +1,124 @@
+import os
+
+import pygame
+
+from narrowphase import mask_table
+
+
+class Assets:
+    """统一加载并缓存图片资源：每张图片只读一次磁盘，所有精灵共享同一个 Surface。"""
+
+    def __init__(self, base_dir=None):
+        """
+        :param base_dir: 图片目录，默认是本文件旁边的 images/（不依赖当前工作目录）
+        """
+        if base_dir is None:
+            base_dir = os.path.join(os.path.dirname(__file__), 'images')
+        self.base_dir = base_dir
+
+        self._images = {}   # 文件名 -> 已转换的 Surface
+        self._solids = {}   # (颜色, 尺寸) -> 纯色 Surface
+        self._masks = {}    # 文件名 -> (Mask, 前缀和表)
+
+        # 统计信息
+        self.hits = 0
+        self.misses = 0
+
+    def image(self, name):
+        """返回 images/ 下名为 name 的图片；第一次调用时加载并转换为显示格式。"""
+        surface = self._images.get(name)
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self._convert(pygame.image.load(os.path.join(self.base_dir, name)))
+        self._images[name] = surface
+        return surface
+
+    def mask(self, name):
+        """
+        图片 name 的碰撞掩码（不透明像素为 1），每张图片只计算一次、所有实例共用。
+
+        带 alpha 的图片按 alpha 计算；这些 bmp 没有 alpha，四角是背景色，
+        所以与左上角像素（或 colorkey）同色的像素视为透明。
+        """
+        return self._mask_entry(name)[0]
+
+    def mask_table(self, name):
+        """图片 name 的掩码前缀和表（见 narrowphase.mask_table），用于子弹的像素判定。"""
+        return self._mask_entry(name)[1]
+
+    def _mask_entry(self, name):
+        entry = self._masks.get(name)
+        if entry is None:
+            surface = self.image(name)
+            if surface.get_flags() & pygame.SRCALPHA:
+                mask = pygame.mask.from_surface(surface)
+            else:
+                key = surface.get_colorkey() or surface.get_at((0, 0))
+                mask = pygame.mask.from_threshold(surface, key, (1, 1, 1, 255))
+                mask.invert()
+            entry = (mask, mask_table(mask))
+            self._masks[name] = entry
+        return entry
+
+    def solid(self, color, size):
+        """
+        返回 size 大小、填满 color 的纯色图片（例如子弹），同样只生成一次。
+        用图片画子弹可以和其他精灵一起批量 blit，而不是每颗子弹调用一次 draw.rect。
+        """
+        key = (tuple(color), tuple(size))
+        surface = self._solids.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = pygame.Surface(size)
+        surface.fill(color)
+        surface = self._convert(surface)
+        self._solids[key] = surface
+        return surface
+
+    def preload(self, names):
+        """
+        从磁盘读取图片并计算掩码，但先不转换显示格式（可以在后台线程里调用）；
+        之后在主线程调用 reconvert() 完成转换。
+        """
+        for name in names:
+            if name not in self._images:
+                self.misses += 1
+                self._images[name] = pygame.image.load(os.path.join(self.base_dir, name))
+            self._mask_entry(name)
+
+    def reconvert(self):
+        """窗口创建之后调用：把之前在无窗口时加载的图片转换为显示格式。"""
+        for cache in (self._images, self._solids):
+            for key, surface in cache.items():
+                cache[key] = self._convert(surface)
+
+    @staticmethod
+    def _convert(surface):
+        """转换为当前显示格式，这样 blit 时不用再逐像素转换。"""
+        # 还没有窗口（例如无显示的模拟）时无法 convert，保留原格式
+        if pygame.display.get_surface() is None:
+            return surface
+        if surface.get_flags() & pygame.SRCALPHA:
+            return surface.convert_alpha()
+        return surface.convert()
+
+    @property
+    def memory_bytes(self):
+        """缓存中所有图片占用的像素内存（字节）。"""
+        surfaces = list(self._images.values()) + list(self._solids.values())
+        return sum(s.get_pitch() * s.get_height() for s in surfaces)
+
+    def stats(self):
+        """返回缓存命中次数与内存占用，便于调试和基准测试。"""
+        return {
+            'images': len(self._images) + len(self._solids),
+            'hits': self.hits,
+            'misses': self.misses,
+            'memory_bytes': self.memory_bytes,
+        }
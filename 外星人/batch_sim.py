@@ -0,0 +1,194 @@
+"""
+多进程批量模拟：对一组 Settings 参数组合，各跑若干局带种子的无窗口机器人对局。
+
+用法示例：
+    python batch_sim.py --games 200 \\
+        --grid max_aliens=15,30 alien_spawn_rate=1.2,2.4 shield_max_charges=2,3 \\
+        --output sweep.npz
+
+每局由 (参数组合, 种子) 唯一确定，结果按这个顺序汇总，与进程数和完成顺序无关。
+输出为列式的 .npz 文件：game_* 为每局一行，config_* 为每个参数组合一行。
+"""
+import argparse
+import ast
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+from assets import Assets
+from settings import Settings
+from simulation import GameSimulation, Inputs
+
+
+# 每个工作进程只加载一次图片
+_assets = None
+
+
+def parse_grid(items):
+    """把 ['max_aliens=15,30', ...] 解析为 {'max_aliens': [15, 30], ...}。"""
+    grid = {}
+    for item in items:
+        name, _, values = item.partition('=')
+        if not hasattr(Settings(), name):
+            raise ValueError(f"Settings 中没有属性：{name}")
+        grid[name] = [_parse_value(value) for value in values.split(',')]
+    return grid
+
+
+def _parse_value(text):
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def expand_grid(grid):
+    """参数网格的笛卡尔积，返回覆盖值字典的列表（顺序固定）。"""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+
+def scripted_bot(sim, inputs):
+    """
+    简单的脚本机器人：左右追着最近的外星人，每 10 步开火一次，
+    外星人子弹逼近飞船时开护盾。只读取模拟状态，不引入额外随机性。
+    """
+    ship = sim.ship.rect
+    aliens = sim.aliens
+    target = ship.centerx
+    indices = aliens.alive_indices()
+    if indices.size:
+        centers = aliens.ix[indices] + aliens.width // 2
+        target = int(centers[np.argmin(np.abs(centers - ship.centerx))])
+
+    inputs.moving_left = target < ship.centerx - 5
+    inputs.moving_right = target > ship.centerx + 5
+    inputs.fire = sim.ticks % 10 == 0
+
+    danger = ship.inflate(40, 120)
+    inputs.shield = bool(sim.alien_bullets.collide_rect(danger).size)
+
+
+def run_game(task):
+    """
+    在工作进程中跑一局：task 为 (参数组合下标, 覆盖值, 种子, 最长游戏内秒数)。
+    返回 (参数组合下标, 种子, 存活秒数, 得分, 损失飞船数, 平均每步微秒)。
+    """
+    global _assets
+    config_id, overrides, seed, max_seconds = task
+    if _assets is None:
+        _assets = Assets()
+
+    settings = Settings()
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    # 按覆盖之后的 tick_rate 换算步数（参数网格里可能包含 tick_rate）
+    max_ticks = int(max_seconds * settings.tick_rate)
+
+    sim = GameSimulation(settings, _assets, seed)
+    inputs = Inputs()
+    start = time.perf_counter()
+    while sim.stats.game_active and sim.ticks < max_ticks:
+        scripted_bot(sim, inputs)
+        sim.step(inputs)
+    elapsed = time.perf_counter() - start
+
+    return (
+        config_id,
+        seed,
+        sim.ticks / settings.tick_rate,
+        sim.stats.score,
+        settings.ship_limit - sim.stats.ships_left,
+        1e6 * elapsed / max(sim.ticks, 1),
+    )
+
+
+def run_batch(configs, games, max_seconds, workers=None, base_seed=0, progress=None):
+    """
+    用进程池跑完所有 (参数组合, 种子) 对局，返回按 (参数组合, 种子) 排序的结果列表。
+
+    :param max_seconds: 每局最长的游戏内时间（秒）
+    :param progress: 每完成一局调用一次 progress(完成数, 总数, 结果)
+    """
+    tasks = [
+        (config_id, overrides, base_seed + game, max_seconds)
+        for config_id, overrides in enumerate(configs)
+        for game in range(games)
+    ]
+    results = []
+    with multiprocessing.Pool(workers) as pool:
+        for result in pool.imap_unordered(run_game, tasks, chunksize=4):
+            results.append(result)
+            if progress:
+                progress(len(results), len(tasks), result)
+
+    results.sort(key=lambda row: (row[0], row[1]))
+    return results
+
+
+def to_columns(configs, results):
+    """把每局结果和每个参数组合的汇总整理成列（名称 -> NumPy 数组）。"""
+    rows = np.array(results, dtype=float).reshape(-1, 6)
+    columns = {
+        'game_config': rows[:, 0].astype(np.int32),
+        'game_seed': rows[:, 1].astype(np.int64),
+        'game_survival_s': rows[:, 2],
+        'game_score': rows[:, 3].astype(np.int64),
+        'game_ships_lost': rows[:, 4].astype(np.int32),
+        'game_step_us': rows[:, 5],
+    }
+
+    game_config = columns['game_config']
+    for name, col in (('survival_s', 2), ('score', 3), ('ships_lost', 4), ('step_us', 5)):
+        columns[f'config_mean_{name}'] = np.array([
+            rows[game_config == cid, col].mean() for cid in range(len(configs))
+        ])
+    columns['config_std_score'] = np.array([
+        rows[game_config == cid, 3].std() for cid in range(len(configs))
+    ])
+    # 参数组合本身以 JSON 形式随结果保存
+    columns['config_overrides'] = np.array([json.dumps(c, sort_keys=True) for c in configs])
+    return columns
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Alien Invasion 参数批量模拟")
+    parser.add_argument('--grid', nargs='*', default=[],
+                        help="Settings 覆盖值，如 max_aliens=15,30 alien_fire_rate=0.6,1.2")
+    parser.add_argument('--games', type=int, default=100, help="每个参数组合的对局数")
+    parser.add_argument('--max-seconds', type=float, default=300.0,
+                        help="每局最长的游戏内时间（秒）")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="进程数")
+    parser.add_argument('--seed', type=int, default=0, help="第一局的种子")
+    parser.add_argument('--output', default='batch_results.npz', help="列式结果文件")
+    args = parser.parse_args(argv)
+
+    configs = expand_grid(parse_grid(args.grid))
+    start = time.perf_counter()
+
+    def progress(done, total, result):
+        config_id, seed, survival, score, _, _ = result
+        print(f"[{done}/{total}] config {config_id} seed {seed}: "
+              f"survived {survival:.1f}s, score {score}", flush=True)
+
+    results = run_batch(configs, args.games, args.max_seconds, args.workers, args.seed, progress)
+    columns = to_columns(configs, results)
+    np.savez(args.output, **columns)
+
+    print(f"\n{len(results)} games in {time.perf_counter() - start:.1f}s -> {args.output}")
+    for cid, overrides in enumerate(configs):
+        print(f"config {cid} {overrides}: "
+              f"score {columns['config_mean_score'][cid]:.1f}, "
+              f"survival {columns['config_mean_survival_s'][cid]:.1f}s, "
+              f"ships lost {columns['config_mean_ships_lost'][cid]:.2f}, "
+              f"{columns['config_mean_step_us'][cid]:.1f} us/step")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
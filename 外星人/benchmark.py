@@ -0,0 +1,256 @@
+"""
+每帧热点函数的基准测试（无窗口，使用 SDL dummy 驱动）。
+
+用法示例：
+    python benchmark.py                                  # 默认 10 / 100 / 1000 / 10000 个实体
+    python benchmark.py --output bench.json              # 结果写入 JSON
+    python benchmark.py --save-baseline baseline.json    # 保存为基线
+    python benchmark.py --baseline baseline.json         # 与基线比较，退化时返回非 0
+"""
+import os
+
+# 必须在导入 pygame 之前设置，保证在没有显示器的机器上也能运行
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import pygame
+
+from alien_invasion import AlienInvasion
+from simulation import GameSimulation, Inputs
+
+
+# 需要测量的每帧函数（GameSimulation 上的方法）；时间为包含子调用的总时间
+SIM_HOT_PATHS = (
+    '_update_bullets',
+    '_check_bullet_alien_collisions',
+    '_update_aliens',
+    '_check_aliens_bottom_or_hit_ship',
+    '_alien_fire_bullets',
+    '_update_alien_bullets',
+)
+# AlienInvasion 上的绘制函数
+RENDER_HOT_PATHS = ('_update_screen',)
+
+DEFAULT_COUNTS = (10, 100, 1000, 10000)
+
+
+def _instrument(obj, names, totals):
+    """用计时包装替换 obj 上的方法，累计耗时写入 totals[name]。"""
+    perf_counter = time.perf_counter
+    for name in names:
+        func = getattr(obj, name)
+
+        def timed(*args, _func=func, _name=name, **kwargs):
+            start = perf_counter()
+            try:
+                return _func(*args, **kwargs)
+            finally:
+                totals[_name] += perf_counter() - start
+
+        setattr(obj, name, timed)
+
+
+def _populate(sim, count):
+    """把外星人、玩家子弹、外星人子弹补足到 count 个（不计入测量时间）。"""
+    rect = sim.screen_rect
+    while len(sim.aliens) < count:
+        sim._create_random_alien()
+
+    aliens = sim.aliens.alive_indices().tolist()
+    missing = count - len(sim.alien_bullets)
+    if missing > 0 and aliens:
+        shooters = [random.choice(aliens) for _ in range(missing)]
+        sim.emitter.emit(sim.alien_bullets, 'straight', sim.aliens.midbottoms(shooters),
+                         sim.ship.rect.center, 0.0, count)
+
+    while len(sim.bullets) < count:
+        bullet = sim.bullets.acquire(sim)
+        bullet.rect.centerx = random.randint(0, rect.width)
+        bullet.y = float(random.randint(rect.height // 4, rect.height))
+        bullet.rect.y = bullet.y
+
+
+def _new_scenario(game, count, seed):
+    """为一个场景准备新的模拟：上限放开到 count，固定随机种子。"""
+    random.seed(seed)
+    settings = game.settings
+    settings.max_aliens = count
+    settings.bullets_allowed = count
+    settings.alien_bullets_allowed = count
+    game.sim = GameSimulation(settings, game.assets, seed=seed)
+    return game.sim
+
+
+def _script_inputs(frame):
+    """脚本化输入：左右往返移动，每 5 帧开火一次。"""
+    left = (frame // 60) % 2 == 0
+    return Inputs(moving_left=left, moving_right=not left, fire=frame % 5 == 0)
+
+
+def _run_frame(game, sim, count, frame):
+    """运行一帧；返回这一帧（step + 绘制）的耗时（秒）。"""
+    _populate(sim, count)
+    # 护盾常开，避免飞船被击中后清空场景，保持实体数量稳定
+    sim.shield.active = True
+
+    start = time.perf_counter()
+    sim.step(_script_inputs(frame))
+    game._update_screen()
+    return time.perf_counter() - start
+
+
+def run_scenario(game, count, frames, max_seconds, seed=0):
+    """运行一个场景，返回该实体数量下的测量结果。"""
+    # 第一遍：计时（不开 tracemalloc，避免干扰）
+    sim = _new_scenario(game, count, seed)
+    totals = dict.fromkeys(SIM_HOT_PATHS + RENDER_HOT_PATHS, 0.0)
+    _instrument(sim, SIM_HOT_PATHS, totals)
+    _instrument(game, RENDER_HOT_PATHS, totals)
+
+    frame_times = []
+    deadline = time.perf_counter() + max_seconds
+    for frame in range(frames):
+        frame_times.append(_run_frame(game, sim, count, frame))
+        # 大场景很慢：超过时间预算后提前结束（至少跑 3 帧）
+        if frame >= 2 and time.perf_counter() > deadline:
+            break
+    del game._update_screen
+    measured = len(frame_times)
+    collisions = sim.collisions.as_dict()
+
+    # 第二遍：用 tracemalloc 统计每帧分配的内存和峰值
+    sim = _new_scenario(game, count, seed)
+    alloc_frames = min(measured, 20)
+    tracemalloc.start()
+    alloc_total = 0
+    for frame in range(alloc_frames):
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        _run_frame(game, sim, count, frame)
+        alloc_total += tracemalloc.get_traced_memory()[1] - current
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    frame_times.sort()
+    return {
+        'count': count,
+        'frames': measured,
+        'frame_ms': 1000 * sum(frame_times) / measured,
+        'frame_p95_ms': 1000 * frame_times[min(measured - 1, int(measured * 0.95))],
+        'functions_ms': {name: 1000 * total / measured for name, total in totals.items()},
+        'alloc_kb_per_frame': alloc_total / alloc_frames / 1024,
+        'peak_kb': peak / 1024,
+        'collisions': collisions,
+    }
+
+
+def run_benchmarks(counts=DEFAULT_COUNTS, frames=120, max_seconds=10.0, seed=0):
+    """运行所有场景，返回可以直接写成 JSON 的结果。"""
+    game = AlienInvasion()
+    results = {}
+    for count in counts:
+        result = run_scenario(game, count, frames, max_seconds, seed)
+        results[str(count)] = result
+        print(f"{count:>6} entities: {result['frame_ms']:9.3f} ms/frame, "
+              f"{result['alloc_kb_per_frame']:9.1f} KB alloc/frame, "
+              f"peak {result['peak_kb']:9.1f} KB ({result['frames']} frames)")
+    pygame.quit()
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'machine': platform.machine(),
+            'frames': frames,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, tolerance=0.25, floor_ms=0.05):
+    """
+    与基线比较，返回退化项列表。
+
+    某项耗时超过基线 (1 + tolerance) 倍，且绝对差值大于 floor_ms 时视为退化；
+    峰值内存同理（按 KB 比较）。
+    """
+    regressions = []
+    for key, base in baseline['results'].items():
+        cur = current['results'].get(key)
+        if cur is None:
+            continue
+
+        pairs = [('frame_ms', base['frame_ms'], cur['frame_ms'])]
+        for name, base_ms in base['functions_ms'].items():
+            if name in cur['functions_ms']:
+                pairs.append((name, base_ms, cur['functions_ms'][name]))
+        for name, base_ms, cur_ms in pairs:
+            if cur_ms > base_ms * (1 + tolerance) and cur_ms - base_ms > floor_ms:
+                regressions.append(f"{key} entities {name}: {base_ms:.3f} -> {cur_ms:.3f} ms")
+
+        if cur['peak_kb'] > base['peak_kb'] * (1 + tolerance):
+            regressions.append(
+                f"{key} entities peak memory: {base['peak_kb']:.1f} -> {cur['peak_kb']:.1f} KB"
+            )
+    return regressions
+
+
+def _print_table(report):
+    """按函数打印每帧耗时（毫秒），便于观察随实体数量的增长曲线。"""
+    results = report['results']
+    keys = list(results)
+    names = SIM_HOT_PATHS + RENDER_HOT_PATHS
+    print()
+    print(f"{'ms/frame':<34}" + ''.join(f"{k:>12}" for k in keys))
+    for name in names:
+        row = ''.join(f"{results[k]['functions_ms'].get(name, 0.0):12.3f}" for k in keys)
+        print(f"{name:<34}{row}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Alien Invasion 每帧热点基准测试")
+    parser.add_argument('--counts', type=int, nargs='+', default=list(DEFAULT_COUNTS),
+                        help="每个场景的外星人 / 子弹数量")
+    parser.add_argument('--frames', type=int, default=120, help="每个场景最多测量的帧数")
+    parser.add_argument('--max-seconds', type=float, default=10.0,
+                        help="每个场景的计时预算（秒），超出后提前结束")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="把结果写入该 JSON 文件")
+    parser.add_argument('--baseline', help="与该基线 JSON 比较，退化时返回 1")
+    parser.add_argument('--save-baseline', help="把本次结果保存为基线 JSON")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="允许的相对退化比例（默认 25%%）")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.counts, args.frames, args.max_seconds, args.seed)
+    _print_table(report)
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print("\nPERFORMANCE REGRESSIONS:")
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
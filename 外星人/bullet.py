@@ -1,62 +1,61 @@
 import pygame
-from pygame.sprite import Sprite
 
 
-class Bullet(Sprite):
+def _round(value):
+    """与给 Rect 坐标赋浮点数时相同的取整：四舍五入，.5 远离 0。"""
+    return int(value + 0.5) if value >= 0 else int(value - 0.5)
+
+
+def draw_positions(bullets, alpha=1.0):
+    """
+    一组子弹插值后的左上角坐标列表，供 SpriteBatch 用预渲染的子弹图片批量绘制
+    （alpha 为 1 时就是当前 rect 的位置）。
+    """
+    if alpha == 1.0:
+        return [bullet.rect.topleft for bullet in bullets]
+    return [
+        (bullet.rect.x, _round(bullet.prev_y + (bullet.y - bullet.prev_y) * alpha))
+        for bullet in bullets
+    ]
+
+
+class Bullet:
     """A class to manage bullets fired from the ship."""
 
+    # 用 __slots__ 代替每个实例的 __dict__；对象由 EntityPool 回收复用
+    __slots__ = ('settings', 'rect', 'y', 'prev_y', 'active')
+
     def __init__(self, ai_game):
         """Create a bullet object at the ship's current position."""
-        super().__init__()
-        self.screen = ai_game.screen
         self.settings = ai_game.settings
-        self.color = self.settings.bullet_color
 
         # Create a bullet rect at (0, 0) and then set correct position.
         self.rect = pygame.Rect(0, 0,
                                 self.settings.bullet_width,
                                 self.settings.bullet_height)
+        self.reset(ai_game)
+
+    def reset(self, ai_game):
+        """把子弹放到飞船当前位置（新建或从对象池复用时调用）。"""
         self.rect.midtop = ai_game.ship.rect.midtop
 
         # Store the bullet's position as a float.
         self.y = float(self.rect.y)
+        self.prev_y = self.y
+        self.active = True
 
-    def update(self):
-        """Move the bullet up the screen."""
+    def update(self, dt):
+        """Move the bullet up the screen by dt seconds."""
+        self.prev_y = self.y
         # Update the exact position of the bullet.
-        self.y -= self.settings.bullet_speed
+        self.y -= self.settings.bullet_speed * dt
         # Update the rect position.
         self.rect.y = self.y
 
-    def draw_bullet(self):
-        """Draw the bullet to the screen."""
-        pygame.draw.rect(self.screen, self.color, self.rect)
-
-
-class AlienBullet(Sprite):
-    """外星人发射的子弹（向下飞）。"""
-
-    def __init__(self, ai_game, alien):
-        """在当前外星人位置创建一颗子弹。"""
-        super().__init__()
-        self.screen = ai_game.screen
-        self.settings = ai_game.settings
-        self.color = self.settings.alien_bullet_color
-
-        self.rect = pygame.Rect(0, 0,
-                                self.settings.bullet_width,
-                                self.settings.bullet_height)
-        # 子弹从外星人底部中心发射
-        self.rect.midtop = alien.rect.midbottom
-
-        # 使用 float 存储纵坐标
-        self.y = float(self.rect.y)
-
-    def update(self):
-        """子弹向下移动。"""
-        self.y += self.settings.alien_bullet_speed
-        self.rect.y = self.y
+        # 飞出屏幕顶部后失效，由对象池回收
+        if self.rect.bottom <= 0:
+            self.active = False
 
-    def draw_bullet(self):
-        """绘制外星人子弹。"""
-        pygame.draw.rect(self.screen, self.color, self.rect)
+    def kill(self):
+        """标记为失效，下一次 collect() 时回收。"""
+        self.active = False
@@ -0,0 +1,307 @@
+"""
+游戏画面录制：主循环只把画面拷进预先分配的环形缓冲区，压缩和写盘在后台线程完成。
+
+每帧通过 Surface.get_buffer() 取得屏幕像素内存，一次 memcpy 拷进空闲的缓冲区
+（1200x800 约 0.4 ms，不分配新内存）；没有空闲缓冲区（写线程跟不上）时丢弃这一帧并计数，
+不会让游戏等待。
+
+输出格式：
+- 'ffmpeg'：本机有 ffmpeg 时，把原始像素通过管道交给它编码成 capture.mp4；
+- 'raw'：单个 capture.raw 文件，每帧 zlib 压缩（格式见 RawCaptureWriter），
+  可以用 python capture.py FILE --png DIR 转成 PNG 序列；
+- 'png'：每帧一个 PNG 文件（文件较多较大，写盘跟不上时会丢帧）。
+'auto' 表示有 ffmpeg 时用 'ffmpeg'，否则用 'raw'。
+"""
+import argparse
+import os
+import queue
+import shutil
+import struct
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from collections import deque
+
+import numpy as np
+import pygame
+
+
+MAGIC = b'AICAPT01'
+# 文件头：魔数之后是 宽、高、每行字节数、帧率（u4）和像素格式（8 字节 ASCII）
+HEADER = struct.Struct('<IIII8s')
+# 每帧：帧号、模拟步数、压缩后的长度
+FRAME_HEADER = struct.Struct('<IQI')
+
+FORMATS = ('auto', 'ffmpeg', 'raw', 'png')
+
+
+def pixel_format(surface):
+    """
+    32 位 Surface 的内存字节顺序，写成 pygame.image.frombuffer 能识别的格式名
+    （例如小端机器上的 0x00RRGGBB 像素为 'BGRA'）。不支持的格式返回 None。
+    """
+    if surface.get_bytesize() != 4:
+        return None
+    names = {}
+    for channel, mask in zip('RGBA', surface.get_masks()):
+        if mask:
+            shift = (mask & -mask).bit_length() - 1
+            byte = shift // 8 if sys.byteorder == 'little' else 3 - shift // 8
+            names[byte] = channel
+    order = ''.join(names.get(i, 'X') for i in range(4))
+    # frombuffer 认识的 32 位格式；没有 alpha 通道时那个字节是 'X'，与名字中的 A 匹配
+    # （只用来定位 R / G / B，读回时见 _image()）
+    for name in ('RGBA', 'BGRA', 'ARGB', 'RGBX'):
+        if all(a == b or b == 'X' for a, b in zip(name, order)):
+            return name
+    return None
+
+
+class FrameCapture:
+    """
+    画面录制器：capture() 在主线程调用，写盘在名为 'capture-writer' 的后台线程。
+
+    缓冲区的流转：空闲队列 → capture() 拷入像素 → 待写队列 → 写线程写完 → 回到空闲队列。
+    """
+
+    def __init__(self, surface, directory, fmt='auto', buffers=8, every=1, fps=60):
+        """
+        :param surface: 要录制的 Surface（屏幕），录制期间尺寸不能改变
+        :param directory: 输出目录（不存在时创建）
+        :param fmt: FORMATS 之一
+        :param buffers: 环形缓冲区的帧数
+        :param every: 每隔几帧录一帧
+        :param fps: 写入视频的帧率（按 every 换算之前的显示帧率）
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"未知的录制格式：{fmt}")
+        if fmt == 'auto':
+            fmt = 'ffmpeg' if shutil.which('ffmpeg') else 'raw'
+        self.pixel_format = pixel_format(surface)
+        if self.pixel_format is None:
+            raise ValueError("只支持录制 32 位的 Surface")
+
+        self.size = surface.get_size()
+        self.pitch = surface.get_pitch()
+        self.format = fmt
+        self.every = max(1, every)
+        os.makedirs(directory, exist_ok=True)
+
+        # 预先分配的环形缓冲区，每行是一帧原始像素（含行尾填充）
+        self.buffers = np.empty((buffers, self.pitch * self.size[1]), dtype=np.uint8)
+        self._free = deque(range(buffers))
+        self._pending = queue.SimpleQueue()    # (缓冲区编号, 帧号, 模拟步数)；None 表示结束
+
+        self.frames_seen = 0       # capture() 被调用的次数
+        self.captured = 0          # 拷入缓冲区的帧数
+        self.dropped = 0           # 没有空闲缓冲区而丢弃的帧数
+        self.written = 0           # 已写盘的帧数
+        self.last_error = None
+
+        writer_class = {'ffmpeg': FfmpegWriter, 'raw': RawCaptureWriter, 'png': PngWriter}[fmt]
+        self.writer = writer_class(directory, self.size, self.pitch, self.pixel_format,
+                                   fps / self.every)
+        self.path = self.writer.path
+        self._thread = threading.Thread(target=self._write_loop, name='capture-writer',
+                                        daemon=True)
+        self._thread.start()
+
+    def capture(self, surface, tick=0):
+        """
+        录下 surface 当前的画面（主线程，每帧调用一次）。返回是否录下了这一帧。
+
+        :param tick: 当前的模拟步数，写进帧信息，方便和录制的输入对照
+        """
+        self.frames_seen += 1
+        if (self.frames_seen - 1) % self.every:
+            return False
+        try:
+            slot = self._free.popleft()
+        except IndexError:
+            self.dropped += 1
+            return False
+
+        # get_buffer() 在返回的对象存在期间锁住 Surface，拷完立即释放
+        pixels = surface.get_buffer()
+        np.copyto(self.buffers[slot], np.frombuffer(pixels, dtype=np.uint8))
+        del pixels
+
+        self.captured += 1
+        self._pending.put((slot, self.captured, tick))
+        return True
+
+    def _write_loop(self):
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            slot, frame, tick = item
+            try:
+                if self.last_error is None:
+                    self.writer.write(self.buffers[slot], frame, tick)
+                    self.written += 1
+            except (OSError, ValueError, pygame.error) as e:
+                # 磁盘满 / 编码器退出等：停止写入，之后的帧直接丢弃
+                self.last_error = e
+                print(f"Warning: 录制写入失败，已停止写入：{e}")
+            finally:
+                self._free.append(slot)
+
+    def close(self, timeout=10.0):
+        """写完队列中剩余的帧并关闭输出文件。"""
+        self._pending.put(None)
+        self._thread.join(timeout)
+        try:
+            self.writer.close()
+        except (OSError, ValueError) as e:
+            print(f"Warning: 关闭录制文件失败：{e}")
+
+    def summary(self):
+        return (f"{self.path}：录制 {self.captured} 帧，写入 {self.written} 帧，"
+                f"丢弃 {self.dropped} 帧（格式 {self.format}）")
+
+
+class RawCaptureWriter:
+    """
+    单文件原始录制：MAGIC + HEADER，之后每帧 FRAME_HEADER + zlib 压缩的像素。
+    zlib 压缩时释放 GIL，不会拖慢主线程；纯色背景的画面压缩后通常只有几十 KB。
+    """
+
+    def __init__(self, directory, size, pitch, fmt, fps):
+        self.path = os.path.join(directory, 'capture.raw')
+        self._file = open(self.path, 'wb')
+        self._file.write(MAGIC)
+        self._file.write(HEADER.pack(size[0], size[1], pitch, round(fps), fmt.encode('ascii')))
+
+    def write(self, pixels, frame, tick):
+        data = zlib.compress(pixels, 1)
+        self._file.write(FRAME_HEADER.pack(frame, tick, len(data)))
+        self._file.write(data)
+
+    def close(self):
+        self._file.close()
+
+
+class PngWriter:
+    """
+    每帧一个 PNG 文件：frame_000001.png, ...
+
+    不用 pygame.image.save：它在编码的几十毫秒里一直持有 GIL，会卡住主循环。
+    这里用 NumPy 重排通道、zlib 压缩（释放 GIL）自己拼出 PNG。
+    """
+
+    def __init__(self, directory, size, pitch, fmt, fps):
+        self.path = directory
+        width, height = size
+        self.width = width
+        self.pitch = pitch
+        # 每行像素前加一个 PNG 过滤类型字节（0 = 不过滤），行缓冲区只分配一次
+        self._rows = np.zeros((height, 1 + width * 3), dtype=np.uint8)
+        self._channels = [fmt.index(c) for c in 'RGB']
+        ihdr = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)   # 8 位 RGB，无 alpha
+        self._header = b'\x89PNG\r\n\x1a\n' + _png_chunk(b'IHDR', ihdr)
+
+    def write(self, pixels, frame, tick):
+        height = self._rows.shape[0]
+        source = np.frombuffer(pixels, dtype=np.uint8).reshape(height, self.pitch)
+        source = source[:, :self.width * 4].reshape(height, self.width, 4)
+        rgb = self._rows[:, 1:].reshape(height, self.width, 3)
+        for i, channel in enumerate(self._channels):
+            rgb[:, :, i] = source[:, :, channel]
+        data = zlib.compress(self._rows, 1)
+        with open(os.path.join(self.path, f'frame_{frame:06d}.png'), 'wb') as f:
+            f.write(self._header)
+            f.write(_png_chunk(b'IDAT', data))
+            f.write(_png_chunk(b'IEND', b''))
+
+    def close(self):
+        pass
+
+
+def _png_chunk(kind, data):
+    return (struct.pack('>I', len(data)) + kind + data
+            + struct.pack('>I', zlib.crc32(kind + data)))
+
+
+class FfmpegWriter:
+    """把原始像素写进 ffmpeg 的标准输入，由它编码为 H.264（写管道时释放 GIL）。"""
+
+    def __init__(self, directory, size, pitch, fmt, fps):
+        self.path = os.path.join(directory, 'capture.mp4')
+        width, height = size
+        # 行尾有填充时按每行字节数作为宽度输入，再裁掉多出的部分
+        padded_width = pitch // 4
+        self._process = subprocess.Popen(
+            ['ffmpeg', '-loglevel', 'error', '-y',
+             '-f', 'rawvideo', '-pix_fmt', fmt.lower().replace('x', '0'),
+             '-s', f'{padded_width}x{height}', '-r', f'{fps:g}', '-i', '-',
+             '-vf', f'crop={width}:{height}:0:0',
+             '-c:v', 'libx264', '-preset', 'ultrafast', '-pix_fmt', 'yuv420p', self.path],
+            stdin=subprocess.PIPE,
+        )
+
+    def write(self, pixels, frame, tick):
+        self._process.stdin.write(pixels)
+
+    def close(self):
+        self._process.stdin.close()
+        self._process.wait()
+
+
+def read_raw(path):
+    """
+    读取 capture.raw，逐帧返回 (帧号, 模拟步数, Surface)。
+    Surface 直接建在解压后的数据上，需要保留时请 copy()。
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"不是录制文件：{path}")
+        width, height, pitch, _, fmt = HEADER.unpack(f.read(HEADER.size))
+        fmt = fmt.rstrip(b'\0').decode('ascii')
+        while True:
+            head = f.read(FRAME_HEADER.size)
+            if len(head) < FRAME_HEADER.size:
+                return
+            frame, tick, length = FRAME_HEADER.unpack(head)
+            data = f.read(length)
+            if len(data) < length:
+                # 录制中途退出留下的半帧
+                return
+            pixels = zlib.decompress(data)
+            yield frame, tick, _image(pixels, (width, height), pitch, fmt)
+
+
+def _image(pixels, size, pitch, fmt):
+    """
+    把一帧原始像素（每行 pitch 字节）建成不透明的 RGB Surface。
+
+    屏幕没有 alpha 通道，第 4 个字节只是填充（通常为 0）；按 'BGRA' 等格式直接读入会被当成
+    alpha，保存的 PNG 就是全透明的。所以只取出 R / G / B 三个字节（同时去掉行尾的填充）。
+    """
+    width, height = size
+    rows = np.frombuffer(pixels, dtype=np.uint8).reshape(height, pitch)
+    quads = rows[:, :width * 4].reshape(height, width, 4)
+    rgb = quads[:, :, [fmt.index(c) for c in 'RGB']]
+    return pygame.image.frombuffer(rgb.tobytes(), size, 'RGB')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="把 capture.raw 转成 PNG 序列")
+    parser.add_argument('file', help="capture.raw 文件")
+    parser.add_argument('--png', metavar='DIR', required=True, help="输出目录")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.png, exist_ok=True)
+    start = time.perf_counter()
+    count = 0
+    for frame, tick, image in read_raw(args.file):
+        pygame.image.save(image, os.path.join(args.png, f'frame_{frame:06d}_tick_{tick}.png'))
+        count += 1
+    print(f"已导出 {count} 帧到 {args.png}（{time.perf_counter() - start:.1f}s）")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
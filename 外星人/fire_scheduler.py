@@ -0,0 +1,74 @@
+import heapq
+
+
+class FireScheduler:
+    """
+    外星人开火调度：每个外星人抽一个“下次开火时间”，放进最小堆。
+
+    开火间隔服从指数分布（平均每秒 rate 次），与逐帧按概率掷骰子的分布相同，
+    但每步只处理时间已到的外星人，代价是 O(k log n)（k 为本步开火数），
+    而不是每步给每个外星人都抽一次随机数。
+
+    外星人死亡时不用从堆里删除：堆中的条目带有槽位的代数（generation），
+    槽位被复用或外星人已死亡的旧条目在弹出时直接丢弃。
+    """
+
+    def __init__(self, rng, tick_rate):
+        """
+        :param rng: 带种子的随机数生成器（与模拟共用）
+        :param tick_rate: 每秒模拟步数；时间以步为单位
+        """
+        self.rng = rng
+        self.tick_rate = tick_rate
+        self._heap = []          # (开火时间, 槽位, 代数)
+        self._generation = []    # 每个槽位当前的代数
+
+    def __len__(self):
+        """堆中的条目数（包括尚未丢弃的旧条目）。"""
+        return len(self._heap)
+
+    def _next_time(self, now, rate):
+        if rate <= 0:
+            return float('inf')
+        return now + self.rng.exponential(self.tick_rate / rate)
+
+    def schedule(self, slot, now, rate):
+        """为刚生成在 slot 的外星人安排第一次开火（同一槽位的旧条目随之作废）。"""
+        generation = self._generation
+        if slot >= len(generation):
+            generation.extend([0] * (slot + 1 - len(generation)))
+        generation[slot] += 1
+        heapq.heappush(self._heap, (self._next_time(now, rate), slot, generation[slot]))
+
+    def pop_due(self, now, alive, limit, rate):
+        """
+        取出开火时间不晚于 now 的存活外星人，最多返回 limit 个槽位（按开火时间顺序）。
+
+        超出 limit 的外星人本次不开火，与它们一起重新抽取下次开火时间
+        （指数分布无记忆，相当于上限已满时跳过这次掷骰子）。
+
+        :param alive: 存活标记数组，用来丢弃已死亡外星人的条目
+        """
+        heap = self._heap
+        generation = self._generation
+        fired = []
+        while heap and heap[0][0] <= now:
+            _, slot, gen = heap[0]
+            if gen != generation[slot] or not alive[slot]:
+                heapq.heappop(heap)
+                continue
+            if len(fired) < limit:
+                fired.append(slot)
+            heapq.heapreplace(heap, (self._next_time(now, rate), slot, gen))
+        return fired
+
+    def get_state(self):
+        """(堆中条目列表, 各槽位代数列表) 的副本；堆按原样保存，还原后弹出顺序不变。"""
+        return list(self._heap), list(self._generation)
+
+    def set_state(self, heap, generation):
+        self._heap = list(heap)
+        self._generation = list(generation)
+
+    def clear(self):
+        self._heap.clear()
@@ -1,7 +1,3 @@
-import os
-import json
-
-
 class GameStats:
     """跟踪游戏统计信息（避免循环导入：不引用 AlienInvasion）。"""
 
@@ -15,8 +11,8 @@ class GameStats:
         # 在每局开始时重置的统计信息
         self.reset_stats()
 
-        # 最高分：从文件中加载
-        self.high_score = self._load_high_score()
+        # 最高分：由外层从成绩记录（ScoreStore）中取得后设置，无窗口模拟时从 0 开始
+        self.high_score = 0
 
     def reset_stats(self):
         """在每局开始时重置可变统计信息。"""
@@ -24,24 +20,3 @@ class GameStats:
         self.ships_left = getattr(self.settings, "ship_limit", 3)
         self.score = 0
         self.level = 1
-
-    # ---------- 最高分持久化 ----------
-
-    def _load_high_score(self):
-        """从 high_score.json 加载最高分（不存在或损坏时返回 0）。"""
-        path = os.path.join(os.path.dirname(__file__), "high_score.json")
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return int(data.get("high_score", 0))
-        except Exception:
-            return 0
-
-    def save_high_score(self):
-        """将当前最高分写入 high_score.json（失败时静默处理）。"""
-        path = os.path.join(os.path.dirname(__file__), "high_score.json")
-        try:
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump({"high_score": self.high_score}, f)
-        except Exception:
-            pass
@@ -0,0 +1,115 @@
+"""
+负载调节：帧耗时持续超出预算时逐级降低画面效果和刷怪量，负载下降后再逐级恢复。
+
+每帧记录一次“工作时间”（不含 clock.tick 的等待）。每 window 帧评估一次这段时间的
+p90：超过预算的 degrade_at 倍（或这段时间里模拟跟不上、丢过积压的步数）就降一级；
+连续 restore_windows 段都低于预算的 restore_at 倍才升一级。两个阈值之间留有间隔，
+负载在边界附近波动时不会来回切换。
+"""
+from collections import namedtuple
+
+
+# interpolate：是否在两步之间插值绘制；hud_interval：HUD 数值每隔几帧刷新一次；
+# particles：爆炸粒子数量的比例；
+# 后三项是外星人上限、刷怪频率、外星人子弹上限相对于原设置的比例
+QualityLevel = namedtuple(
+    'QualityLevel', 'name interpolate hud_interval particles aliens spawn_rate alien_bullets'
+)
+
+LEVELS = (
+    QualityLevel('full', True, 1, 1.0, 1.0, 1.0, 1.0),
+    QualityLevel('effects', False, 6, 0.5, 1.0, 1.0, 1.0),
+    QualityLevel('spawns', False, 6, 0.25, 0.75, 0.5, 1.0),
+    QualityLevel('bullets', False, 6, 0.25, 0.5, 0.5, 0.5),
+)
+
+# 会被调整的上限（GameSimulation.limits 的属性）
+_GAMEPLAY = ('max_aliens', 'alien_spawn_rate', 'alien_bullets_allowed')
+
+
+class LoadGovernor:
+    """按滚动帧耗时在 LEVELS 之间切换质量等级，并调整模拟的玩法上限。"""
+
+    def __init__(self, settings, limits, window=30, degrade_at=0.9, restore_at=0.6,
+                 restore_windows=4, gameplay=True):
+        """
+        :param settings: 游戏设置（只读，提供帧率）
+        :param limits: 模拟的当前上限（GameSimulation.limits）；降级时修改其中的刷怪和子弹上限，
+            Settings 本身不变
+        :param window: 每评估一次包含的帧数
+        :param degrade_at: p90 工作时间超过预算的这个比例时降一级
+        :param restore_at: 连续 restore_windows 段 p90 低于预算的这个比例时升一级
+        :param gameplay: 为 False 时只调整画面效果（录制输入时使用，保证录制能回放）
+        """
+        self.settings = settings
+        self.limits = limits
+        self.window = window
+        self.degrade_at = degrade_at
+        self.restore_at = restore_at
+        self.restore_windows = restore_windows
+        self.max_level = len(LEVELS) - 1 if gameplay else 1
+
+        self.base = {name: getattr(limits, name) for name in _GAMEPLAY}
+        self.level = 0
+        self.history = []      # (评估序号, 新等级名, 当时的 p90 毫秒)
+        self.last_p90_ms = 0.0
+
+        self._times = []
+        self._slipped = False
+        self._calm = 0         # 连续低负载的评估段数
+        self._evaluations = 0
+
+    @property
+    def quality(self):
+        return LEVELS[self.level]
+
+    def frame(self, seconds, slipped=False):
+        """
+        记录一帧的工作时间（秒）。slipped 表示这一帧模拟跟不上、丢掉了积压的步数。
+        等级发生变化时返回 True。
+        """
+        self._times.append(seconds)
+        self._slipped = self._slipped or slipped
+        if len(self._times) < self.window:
+            return False
+
+        times = sorted(self._times)
+        p90 = times[int(len(times) * 0.9)]
+        slipped = self._slipped
+        self._times.clear()
+        self._slipped = False
+        self._evaluations += 1
+        self.last_p90_ms = p90 * 1000
+
+        budget = 1.0 / self.settings.fps
+        if (p90 > budget * self.degrade_at or slipped) and self.level < self.max_level:
+            self._calm = 0
+            self._set_level(self.level + 1)
+            return True
+        if p90 < budget * self.restore_at:
+            self._calm += 1
+            if self._calm >= self.restore_windows and self.level > 0:
+                self._calm = 0
+                self._set_level(self.level - 1)
+                return True
+        else:
+            self._calm = 0
+        return False
+
+    def _set_level(self, level):
+        self.level = level
+        quality = LEVELS[level]
+        limits, base = self.limits, self.base
+        limits.max_aliens = max(1, round(base['max_aliens'] * quality.aliens))
+        limits.alien_spawn_rate = base['alien_spawn_rate'] * quality.spawn_rate
+        limits.alien_bullets_allowed = max(1, round(base['alien_bullets_allowed']
+                                                    * quality.alien_bullets))
+        self.history.append((self._evaluations, quality.name, round(self.last_p90_ms, 2)))
+        print(f"负载调节：等级 {level}（{quality.name}），最近 {self.window} 帧 "
+              f"p90 {self.last_p90_ms:.1f} ms，外星人上限 {limits.max_aliens}，"
+              f"外星人子弹上限 {limits.alien_bullets_allowed}")
+
+    def status(self):
+        """叠加层显示的一行状态。"""
+        return (f"governor: level {self.level} ({self.quality.name}),"
+                f" p90 {self.last_p90_ms:.1f} ms, changes {len(self.history)}")
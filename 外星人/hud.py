@@ -0,0 +1,170 @@
+import pygame
+
+
+class DigitAtlas:
+    """
+    数字字形图集：0-9 和固定文字片段各只光栅化一次，
+    之后的数字文本直接用这些小图拼出来，不再调用字体渲染。
+    """
+
+    def __init__(self, font, color, bg_color):
+        self.font = font
+        self.color = color
+        self.bg_color = bg_color
+        self.height = font.get_linesize()
+        self._pieces = {}   # 文字片段 -> Surface
+
+        for digit in '0123456789':
+            self._piece(digit)
+
+    def _piece(self, text):
+        """取出（必要时渲染并缓存）一个文字片段的图片。"""
+        surface = self._pieces.get(text)
+        if surface is None:
+            surface = self.font.render(text, True, self.color, self.bg_color)
+            self._pieces[text] = surface
+        return surface
+
+    def render(self, text):
+        """把 text 拆成“数字 / 非数字”片段，用缓存的小图拼成一张图片。"""
+        pieces = []
+        run = ''
+        for char in text:
+            if char.isdigit():
+                if run:
+                    pieces.append(self._piece(run))
+                    run = ''
+                pieces.append(self._piece(char))
+            else:
+                run += char
+        if run:
+            pieces.append(self._piece(run))
+
+        width = sum(piece.get_width() for piece in pieces)
+        height = max(piece.get_height() for piece in pieces)
+        surface = pygame.Surface((width, height))
+        surface.fill(self.bg_color)
+        x = 0
+        for piece in pieces:
+            surface.blit(piece, (x, 0))
+            x += piece.get_width()
+        return surface
+
+
+class Hud:
+    """
+    分数 / 最高分 / 生命 / 护盾状态和 Game Over 提示。
+
+    字体只在启动时创建一次；每个文字图片按显示的值缓存，值不变就直接复用。
+    """
+
+    text_color = (30, 30, 30)
+
+    def __init__(self, settings, use_digit_atlas=False):
+        """
+        :param settings: 游戏设置（屏幕尺寸、背景色）
+        :param use_digit_atlas: 为 True 时数字用 DigitAtlas 拼出，而不是调用字体渲染
+        """
+        self.settings = settings
+        self.font = pygame.font.SysFont(None, 36)
+        self.big_font = pygame.font.SysFont(None, 72)
+
+        self.atlas = None
+        if use_digit_atlas:
+            self.atlas = DigitAtlas(self.font, self.text_color, settings.bg_color)
+
+        # 字段名 -> (文字, 图片)
+        self._fields = {}
+        # Game Over 画面的排行榜：(各名次得分, 图片列表)
+        self._leaderboard = ((), [])
+        self.renders = 0   # 实际重新生成文字图片的次数
+
+        # Game Over 提示的内容固定，启动时渲染一次
+        self.game_over_img = self.big_font.render(
+            "GAME OVER", True, (255, 0, 0), settings.bg_color
+        )
+        self.tip_img = self.font.render(
+            "Press Q to quit", True, self.text_color, settings.bg_color
+        )
+
+    def _field(self, name, text):
+        """返回字段 name 显示 text 的图片；文字没变时复用上次的图片。"""
+        cached = self._fields.get(name)
+        if cached is not None and cached[0] == text:
+            return cached[1]
+
+        if self.atlas is not None:
+            image = self.atlas.render(text)
+        else:
+            image = self.font.render(text, True, self.text_color, self.settings.bg_color)
+        self._fields[name] = (text, image)
+        self.renders += 1
+        return image
+
+    def scoreboard_items(self, stats, shield):
+        """分数、最高分、生命值和护盾状态的 (图片, 位置) 列表，可以交给 SpriteBatch。"""
+        shield_status = "ON" if shield.is_active else "OFF"
+
+        score_img = self._field('score', f"Score: {stats.score}")
+        high_score_img = self._field('high_score', f"High Score: {stats.high_score}")
+        lives_img = self._field('lives', f"Lives: {stats.ships_left}")
+        shield_img = self._field('shield', f"Shield: {shield.charges} ({shield_status})")
+
+        score_rect = score_img.get_rect(left=20, top=10)
+        shield_rect = shield_img.get_rect(left=20, top=score_rect.bottom + 5)
+        high_score_rect = high_score_img.get_rect(
+            centerx=self.settings.screen_width // 2, top=10
+        )
+        lives_rect = lives_img.get_rect(right=self.settings.screen_width - 20, top=10)
+
+        return [
+            (score_img, score_rect),
+            (high_score_img, high_score_rect),
+            (lives_img, lives_rect),
+            (shield_img, shield_rect),
+        ]
+
+    def rewind_items(self, seconds_back):
+        """倒带时屏幕底部的提示：当前画面比最新状态早多少秒。"""
+        image = self._field('rewind', f"REWIND -{seconds_back:.1f}s   <- / -> scrub, F5 resume")
+        rect = image.get_rect(centerx=self.settings.screen_width // 2,
+                              bottom=self.settings.screen_height - 10)
+        return [(image, rect)]
+
+    def _leaderboard_images(self, entries):
+        """排行榜每行一张图片；名次和得分都没变时复用。"""
+        key = tuple(entry.score for entry in entries)
+        if self._leaderboard[0] != key:
+            images = [self.font.render("Top Scores", True, self.text_color,
+                                       self.settings.bg_color)]
+            for rank, score in enumerate(key, 1):
+                images.append(self.font.render(f"{rank}. {score}", True, self.text_color,
+                                               self.settings.bg_color))
+            self._leaderboard = (key, images)
+            self.renders += 1
+        return self._leaderboard[1]
+
+    def game_over_items(self, leaderboard=()):
+        """
+        Game Over 提示（以及排行榜）的 (图片, 位置) 列表。
+
+        :param leaderboard: ScoreEntry 列表，按名次排列
+        """
+        game_over_rect = self.game_over_img.get_rect(
+            centerx=self.settings.screen_width // 2,
+            centery=self.settings.screen_height // 2 - 30,
+        )
+        tip_rect = self.tip_img.get_rect(
+            centerx=self.settings.screen_width // 2, top=game_over_rect.bottom + 10
+        )
+        items = [
+            (self.game_over_img, game_over_rect),
+            (self.tip_img, tip_rect),
+        ]
+        if leaderboard:
+            top = tip_rect.bottom + 20
+            for image in self._leaderboard_images(leaderboard):
+                rect = image.get_rect(centerx=self.settings.screen_width // 2, top=top)
+                items.append((image, rect))
+                top = rect.bottom + 2
+        return items
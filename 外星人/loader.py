@@ -0,0 +1,90 @@
+"""
+分阶段启动：窗口先出来，图片 / 字体 / 音效 / 成绩记录在后台线程加载。
+
+StartupProfile 记录从进程启动到第一帧、再到可以开始游戏的各阶段耗时，
+用 --profile-startup 打印。
+"""
+import threading
+import time
+
+
+class StartupProfile:
+    """启动各阶段的耗时记录（主线程阶段按先后相减，后台阶段记录起止时间）。"""
+
+    def __init__(self, start):
+        """
+        :param start: 计时起点（time.perf_counter()，通常在 import 之前取得）
+        """
+        self.start = start
+        self._last = start
+        self.stages = []   # (阶段名, 线程, 开始, 结束)，时间相对于 start（秒）
+
+    def mark(self, name):
+        """主线程：记录从上一次 mark 到现在的阶段。"""
+        now = time.perf_counter()
+        self.stages.append((name, 'main', self._last - self.start, now - self.start))
+        self._last = now
+
+    def add(self, name, thread, begin, end):
+        """记录一个其他线程上的阶段（begin / end 为 perf_counter 时间）。"""
+        self.stages.append((name, thread, begin - self.start, end - self.start))
+
+    def report(self):
+        """按开始时间排列的文字报告。"""
+        lines = [f"{'stage':<28}{'thread':<8}{'start ms':>10}{'took ms':>10}"]
+        for name, thread, begin, end in sorted(self.stages, key=lambda s: s[2]):
+            lines.append(f"{name:<28}{thread:<8}{begin * 1000:10.1f}{(end - begin) * 1000:10.1f}")
+        return '\n'.join(lines)
+
+
+class Loader:
+    """
+    在后台线程里按顺序执行若干加载阶段，主线程可以随时查看进度。
+
+    每个阶段是 (名称, 无参函数)；函数的返回值可以用 result(名称) 取得。
+    某个阶段抛出异常时停止加载，异常在主线程调用 result() / raise_error() 时重新抛出。
+    """
+
+    def __init__(self, stages, profile=None):
+        """
+        :param stages: [(名称, 函数), ...]
+        :param profile: StartupProfile，记录每个阶段的起止时间
+        """
+        self.stages = list(stages)
+        self.profile = profile
+        self.done = 0                  # 已完成的阶段数
+        self.ready = threading.Event()
+        self.error = None
+        self._results = {}
+        self._thread = threading.Thread(target=self._run, name='loader', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    @property
+    def progress(self):
+        """已完成阶段的比例（0~1）。"""
+        return self.done / len(self.stages) if self.stages else 1.0
+
+    def _run(self):
+        try:
+            for name, func in self.stages:
+                begin = time.perf_counter()
+                self._results[name] = func()
+                if self.profile is not None:
+                    self.profile.add(name, 'loader', begin, time.perf_counter())
+                self.done += 1
+        except Exception as e:
+            self.error = e
+        finally:
+            self.ready.set()
+
+    def raise_error(self):
+        if self.error is not None:
+            raise self.error
+
+    def result(self, name):
+        """阶段 name 的返回值（加载完成后调用）。"""
+        self.raise_error()
+        return self._results[name]
@@ -0,0 +1,271 @@
+"""
+运行指标：计数器、仪表和直方图，以 Prometheus 文本格式导出。
+
+更新只在主线程进行（单写者）：inc() / set() / observe() 只是几次属性加法，
+不加锁，每次约 0.1 微秒。导出在后台线程进行：
+- MetricsServer：在本机端口上提供 HTTP /metrics（Prometheus 抓取）；
+- MetricsFileWriter：每隔一段时间把同样的文本写入文件（写临时文件后 os.replace）。
+
+导出时只读取这些数值、不拿任何锁，抓取再慢也不会让游戏等待；
+代价是一次导出中的各项可能相差正在进行的那一帧（直方图的 _count 按同一次读到的
+各个桶求和，桶与总数之间总是一致的）。
+
+用法：
+    python alien_invasion.py --metrics-port 9108     # curl http://127.0.0.1:9108/metrics
+    python alien_invasion.py --metrics-file metrics.prom
+"""
+import os
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# 帧耗时直方图的桶上限（秒）：60 FPS 的预算是 16.7 ms
+FRAME_BUCKETS = (0.002, 0.004, 0.008, 0.012, 0.0167, 0.025, 0.033, 0.05, 0.1, 0.25)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _format(value):
+    """数值按 Prometheus 文本格式输出（整数不带小数点，无穷大写作 +Inf）。"""
+    if isinstance(value, float):
+        if value != value:
+            return 'NaN'
+        if value in (float('inf'), float('-inf')):
+            return '+Inf' if value > 0 else '-Inf'
+        return repr(value)
+    return str(int(value))
+
+
+class Counter:
+    """只增不减的计数。"""
+
+    __slots__ = ('name', 'help', 'value')
+    kind = 'counter'
+
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def samples(self):
+        return [(self.name, self.value)]
+
+
+class Gauge:
+    """可增可减的当前值（实体数量、帧率等）。"""
+
+    __slots__ = ('name', 'help', 'value')
+    kind = 'gauge'
+
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def samples(self):
+        return [(self.name, self.value)]
+
+
+class Histogram:
+    """固定桶的直方图：每个桶一个计数（非累积），导出时再累加成 Prometheus 的 le 桶。"""
+
+    __slots__ = ('name', 'help', 'bounds', 'counts', 'sum')
+    kind = 'histogram'
+
+    def __init__(self, name, help, buckets=FRAME_BUCKETS):
+        """
+        :param buckets: 递增的桶上限；最后自动加上 +Inf
+        """
+        self.name = name
+        self.help = help
+        self.bounds = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        # le 桶包含上限本身：value 等于某个上限时落在这个桶里
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def samples(self):
+        counts = list(self.counts)   # 一次性复制（写线程此时可能正在更新）
+        rows = []
+        total = 0
+        for bound, count in zip(self.bounds + (float('inf'),), counts):
+            total += count
+            rows.append((f'{self.name}_bucket{{le="{_format(float(bound))}"}}', total))
+        rows.append((f'{self.name}_sum', self.sum))
+        rows.append((f'{self.name}_count', total))
+        return rows
+
+
+class MetricsRegistry:
+    """按注册顺序保存所有指标；名字统一加上 prefix。"""
+
+    def __init__(self, prefix=''):
+        self.prefix = prefix
+        self._metrics = []
+        self._names = set()
+
+    def _register(self, metric):
+        if metric.name in self._names:
+            raise ValueError(f"指标重复注册：{metric.name}")
+        self._names.add(metric.name)
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help):
+        return self._register(Counter(self.prefix + name, help))
+
+    def gauge(self, name, help):
+        return self._register(Gauge(self.prefix + name, help))
+
+    def histogram(self, name, help, buckets=FRAME_BUCKETS):
+        return self._register(Histogram(self.prefix + name, help, buckets))
+
+    def render(self):
+        """Prometheus 文本格式（0.0.4）。"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(f'{name} {_format(value)}' for name, value in metric.samples())
+        lines.append('')
+        return '\n'.join(lines)
+
+    def write(self, path):
+        """把 render() 的结果写入 path（写临时文件后原子替换，读的一方不会看到半个文件）。"""
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+
+# ---------- 导出 ----------
+
+class _Handler(BaseHTTPRequestHandler):
+    registry = None
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # 不在终端里打印每一次抓取
+        pass
+
+
+class MetricsServer:
+    """后台线程中的 HTTP 服务，GET /metrics 返回 registry 的文本。"""
+
+    def __init__(self, registry, host='127.0.0.1', port=9108):
+        """
+        :param host: 监听地址，默认只接受本机连接
+        :param port: 端口；为 0 时由系统分配（实际端口见 self.port）
+        """
+        handler = type('MetricsHandler', (_Handler,), {'registry': registry})
+        # 绑定失败（端口被占用等）时直接抛出 OSError，由调用方决定是否继续
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self.host, self.port = self._server.server_address[:2]
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name='metrics-server', daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self):
+        return f'http://{self.host}:{self.port}/metrics'
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class MetricsFileWriter:
+    """后台线程每隔 interval 秒把 registry 写入文件，close() 时再写最后一次。"""
+
+    def __init__(self, registry, path, interval=10.0):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name='metrics-writer', daemon=True)
+        self._thread.start()
+
+    def _write(self):
+        try:
+            self.registry.write(self.path)
+        except OSError as e:
+            if self.last_error is None:
+                print(f"Warning: 写入运行指标失败：{e}")
+            self.last_error = e
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self._write()
+
+    def close(self, timeout=5.0):
+        self._stop.set()
+        self._thread.join(timeout)
+        self._write()
+
+
+# ---------- 游戏的指标 ----------
+
+class GameMetrics:
+    """
+    游戏用到的全部指标。GameSimulation 在事件发生处更新计数器（sim.metrics 为 None 时不更新），
+    AlienInvasion 每帧更新一次仪表和帧耗时直方图。
+    """
+
+    def __init__(self, registry=None):
+        self.registry = registry or MetricsRegistry('alien_invasion_')
+        r = self.registry
+
+        # 帧循环
+        self.frames = r.counter('frames_total', "Rendered frames.")
+        self.ticks = r.counter('sim_ticks_total', "Simulation steps.")
+        self.slipped_frames = r.counter(
+            'slipped_frames_total', "Frames that dropped backlogged simulation steps.")
+        self.frame_work = r.histogram(
+            'frame_work_seconds', "Main loop work per frame, excluding the frame-rate wait.")
+        self.frame_interval = r.histogram(
+            'frame_interval_seconds', "Wall time between the starts of consecutive frames.")
+        self.fps = r.gauge('fps', "Frame rate averaged by pygame.time.Clock.")
+
+        # 实体数量
+        self.aliens = r.gauge('aliens', "Live aliens.")
+        self.bullets = r.gauge('bullets', "Live player bullets.")
+        self.alien_bullets = r.gauge('alien_bullets', "Live alien bullets.")
+        self.particles = r.gauge('particles', "Live explosion particles.")
+
+        # 玩法事件
+        self.aliens_spawned = r.counter('aliens_spawned_total', "Aliens spawned.")
+        self.aliens_killed = r.counter('aliens_killed_total',
+                                       "Aliens destroyed by bullets or by hitting the ship.")
+        self.shots_fired = r.counter('shots_fired_total', "Player bullets fired.")
+        self.alien_shots = r.counter('alien_shots_total', "Alien bullets fired.")
+        self.shield_activations = r.counter('shield_activations_total', "Shield activations.")
+        self.shield_blocks = r.counter('shield_blocks_total', "Hits absorbed by the shield.")
+        self.ship_hits = r.counter('ship_hits_total', "Hits that cost a life.")
+        self.games_over = r.counter('games_over_total', "Games that ended with no lives left.")
+
+        # 当前这一局
+        self.score = r.gauge('score', "Current score.")
+        self.lives = r.gauge('lives', "Ships left.")
+        self.governor_level = r.gauge('governor_level', "Load governor quality level (0 = full).")
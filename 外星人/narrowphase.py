@@ -0,0 +1,65 @@
+"""
+像素级碰撞的精确判定（narrowphase）。
+
+先用矩形重叠（spatial_hash / overlapping）筛出候选，只对候选做像素判定：
+- 实心矩形（子弹）对图片：用掩码的二维前缀和（summed-area table），
+  一次向量化计算出每个矩形覆盖的不透明像素数；
+- 图片对图片（飞船对外星人）：pygame.mask.Mask.overlap。
+掩码和前缀和表都由 Assets 按图片缓存，所有实例共用。
+"""
+import numpy as np
+
+
+def mask_table(mask):
+    """
+    掩码的二维前缀和表，形状 (高 + 1, 宽 + 1)：
+    table[y, x] 为掩码中 [0, y) × [0, x) 范围内的不透明像素数。
+    """
+    width, height = mask.get_size()
+    bits = np.array(
+        [[mask.get_at((x, y)) for x in range(width)] for y in range(height)],
+        dtype=np.int32,
+    ).reshape(height, width)
+    table = np.zeros((height + 1, width + 1), dtype=np.int32)
+    table[1:, 1:] = bits.cumsum(axis=0).cumsum(axis=1)
+    return table
+
+
+def rects_overlap_mask(table, rects, x, y):
+    """
+    一组实心矩形与放在 (x, y) 处的掩码是否有不透明像素重叠，返回布尔数组。
+
+    :param table: mask_table() 的结果
+    :param rects: (n, 4) 数组：x, y, w, h
+    :param x, y: 掩码左上角的位置（标量或与 rects 等长的数组）
+    """
+    height, width = table.shape[0] - 1, table.shape[1] - 1
+    x0 = np.clip(rects[:, 0] - x, 0, width)
+    x1 = np.clip(rects[:, 0] + rects[:, 2] - x, 0, width)
+    y0 = np.clip(rects[:, 1] - y, 0, height)
+    y1 = np.clip(rects[:, 1] + rects[:, 3] - y, 0, height)
+    covered = table[y1, x1] - table[y0, x1] - table[y1, x0] + table[y0, x0]
+    return covered > 0
+
+
+class CollisionCounters:
+    """碰撞检测计数：矩形粗筛命中的候选数、像素判定次数和最终确认的碰撞数。"""
+
+    __slots__ = ('broadphase', 'narrowphase', 'hits')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.broadphase = 0     # 矩形重叠的候选对
+        self.narrowphase = 0    # 做过像素判定的候选对
+        self.hits = 0           # 像素判定后确认的碰撞
+
+    def add(self, candidates, tested, hits):
+        self.broadphase += candidates
+        self.narrowphase += tested
+        self.hits += hits
+
+    def as_dict(self):
+        return {'broadphase': self.broadphase, 'narrowphase': self.narrowphase,
+                'hits': self.hits}
@@ -0,0 +1,185 @@
+"""
+爆炸 / 碎片粒子：所有粒子的位置、速度、剩余寿命和颜色存放在预先分配的 NumPy 数组里。
+
+- 生成：按环形缓冲区顺序写入，容量满了就覆盖最早生成的粒子（最旧的先被挤掉）；
+- 更新：每个模拟步对所有粒子做一次向量化计算（移动、重力、寿命、飞出屏幕）；
+- 绘制：通过 surfarray.pixels2d 直接写屏幕像素（每个粒子一个 size × size 的小方块），
+  不经过 blit；脏矩形按粗网格格子汇总，同一行相邻的格子合并成一个矩形。
+
+粒子只是视觉效果，不属于游戏状态：使用自己的随机数流，不影响回放和倒带。
+"""
+import numpy as np
+import pygame
+
+
+class ParticleSystem:
+    """容量固定的粒子池。"""
+
+    def __init__(self, capacity, screen_rect, size=2, gravity=120.0, tile=40, seed=None):
+        """
+        :param capacity: 最多同时存在的粒子数（数组一次性分配）
+        :param screen_rect: 屏幕范围，飞出范围的粒子立即失效
+        :param size: 每个粒子画成 size × size 像素
+        :param gravity: 向下的加速度（像素/秒²）
+        :param tile: 汇总脏矩形用的格子边长（像素）
+        """
+        self.capacity = capacity
+        self.width, self.height = screen_rect.size
+        self.size = size
+        self.gravity = gravity
+        self.tile = tile
+        self.rng = np.random.default_rng(seed)
+
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)    # 剩余寿命（秒），<= 0 表示失效
+        self.color = np.zeros(capacity, dtype=np.uint32)    # 已按屏幕格式映射的像素值
+
+        self._head = 0     # 下一个写入的位置
+        self._used = 0     # 用到的最大下标 + 1（只更新 [:_used]）
+        self.live = 0      # 上一次 update 之后的存活数
+        self.emitted = 0
+        self.evicted = 0   # 因为容量已满被提前覆盖的粒子数
+
+        cols = -(-self.width // tile)
+        rows = -(-self.height // tile)
+        self._tiles = np.zeros((rows, cols), dtype=bool)
+
+    def clear(self):
+        self.life[:self._used] = 0.0
+        self._head = self._used = self.live = 0
+
+    def burst(self, centers, count, speed, lifetime, colors):
+        """
+        在每个中心点生成 count 个向四周飞散的粒子。
+
+        :param centers: (k, 2) 数组或 [(x, y), ...]
+        :param speed: (最小, 最大) 初速度（像素/秒）
+        :param lifetime: (最小, 最大) 寿命（秒）
+        :param colors: 已映射的像素值列表（Surface.map_rgb 的结果），随机取用
+        """
+        centers = np.asarray(centers, dtype=np.float32).reshape(-1, 2)
+        centers = np.clip(centers, 0, (self.width - self.size, self.height - self.size))
+        n = len(centers) * count
+        if not n:
+            return
+        rng = self.rng
+        angle = rng.uniform(0.0, 2 * np.pi, n).astype(np.float32)
+        velocity = rng.uniform(speed[0], speed[1], n).astype(np.float32)
+        values = dict(
+            x=np.repeat(centers[:, 0], count),
+            y=np.repeat(centers[:, 1], count),
+            vx=np.cos(angle) * velocity,
+            vy=np.sin(angle) * velocity,
+            life=rng.uniform(lifetime[0], lifetime[1], n).astype(np.float32),
+            color=np.asarray(colors, dtype=np.uint32)[rng.integers(0, len(colors), n)],
+        )
+        self._write(values, n)
+
+    def _write(self, values, n):
+        """把 n 个新粒子按环形顺序写入，覆盖最早的粒子。"""
+        capacity = self.capacity
+        if n > capacity:
+            # 一次生成的比容量还多：只保留最后 capacity 个
+            values = {name: array[n - capacity:] for name, array in values.items()}
+            self.evicted += n - capacity
+            n = capacity
+        start = self._head
+        end = start + n
+        first = min(end, capacity) - start   # 写到数组末尾的部分
+        overwritten = int(np.count_nonzero(self.life[start:start + first] > 0))
+        if end > capacity:
+            overwritten += int(np.count_nonzero(self.life[:end - capacity] > 0))
+        self.evicted += overwritten
+
+        for name, array in values.items():
+            target = getattr(self, name)
+            target[start:start + first] = array[:first]
+            if end > capacity:
+                target[:end - capacity] = array[first:]
+        self._head = end % capacity
+        self._used = capacity if end >= capacity else max(self._used, end)
+        self.emitted += n
+        self.live = min(self.live + n - overwritten, capacity)
+
+    def update(self, dt):
+        """所有粒子前进 dt 秒（一次向量化计算）。"""
+        n = self._used
+        if not n:
+            return
+        x, y, vx, vy, life = self.x[:n], self.y[:n], self.vx[:n], self.vy[:n], self.life[:n]
+        x += vx * dt
+        vy += self.gravity * dt
+        y += vy * dt
+        life -= dt
+        # 飞出屏幕的粒子直接失效
+        size = self.size
+        life[(x < 0) | (x >= self.width - size) | (y < 0) | (y >= self.height - size)] = 0.0
+
+        self.live = int(np.count_nonzero(life > 0))
+        if not self.live:
+            # 全部失效：下次从头写入，空闲时 update 不再扫描数组
+            self._head = self._used = 0
+
+    def draw(self, surface):
+        """把存活的粒子写到 surface 上，返回覆盖这些粒子的矩形列表（用于脏矩形）。"""
+        n = self._used
+        if not self.live:
+            return []
+        alive = np.flatnonzero(self.life[:n] > 0)
+        # 越界的粒子在 update 中已失效，新粒子在 burst 中夹紧到屏幕内，这里不必再检查
+        xs = self.x[alive].astype(np.intp)
+        ys = self.y[alive].astype(np.intp)
+        colors = self.color[alive]
+
+        if surface.get_bytesize() == 4:
+            self._write_pixels(surface, xs, ys, colors)
+        else:
+            # 16 / 24 位的 Surface：逐个 fill（慢，但不依赖像素的内存布局）
+            size = self.size
+            fill = surface.fill
+            for x, y, color in zip(xs.tolist(), ys.tolist(), colors.tolist()):
+                fill(color, (x, y, size, size))
+
+        return self._tile_rects(xs, ys)
+
+    def _write_pixels(self, surface, xs, ys, colors):
+        """32 位 Surface 的快速路径：通过 pixels2d 直接写像素内存。"""
+        # pixels2d 在返回的数组存在期间锁住 surface，写完立即释放。
+        # 转置后是按行存放的 (高, 宽) 数组；按一维下标写比二维花式索引快。
+        # 每行的元素数和每个像素的字节数都取自数组本身的步长，不假设 pitch 是 4 的几倍
+        pixels = pygame.surfarray.pixels2d(surface).T
+        row_bytes, pixel_bytes = pixels.strides
+        row = row_bytes // pixel_bytes
+        flat = np.lib.stride_tricks.as_strided(pixels, (pixels.shape[0] * row,), (pixel_bytes,))
+        index = ys * row + xs
+        for dy in range(self.size):
+            for dx in range(self.size):
+                flat[index + (dy * row + dx)] = colors
+        del flat, pixels
+
+    def _tile_rects(self, xs, ys):
+        """
+        有粒子（左上角）的格子组成的矩形；同一行相邻的格子合并为一个。
+        矩形向右下多留 size 像素，盖住跨到下一个格子的粒子。
+        """
+        tile, pad = self.tile, self.size
+        tiles = self._tiles
+        tiles[:] = False
+        tiles.ravel()[(ys // tile) * tiles.shape[1] + xs // tile] = True
+        # 每行中连续为 True 的区段：起点是 True 且左边为 False，终点是 True 且右边为 False
+        padded = np.zeros((tiles.shape[0], tiles.shape[1] + 2), dtype=np.int8)
+        padded[:, 1:-1] = tiles
+        edges = np.diff(padded, axis=1)
+        start_rows, start_cols = np.nonzero(edges == 1)
+        _, end_cols = np.nonzero(edges == -1)
+        return [
+            pygame.Rect(c0 * tile, r * tile, (c1 - c0) * tile + pad, tile + pad)
+            for r, c0, c1 in zip(start_rows.tolist(), start_cols.tolist(), end_cols.tolist())
+        ]
+
+    def stats(self):
+        return {'live': self.live, 'capacity': self.capacity,
+                'emitted': self.emitted, 'evicted': self.evicted}
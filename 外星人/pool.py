@@ -0,0 +1,92 @@
+class EntityPool:
+    """
+    实体对象池：死亡的实体放回空闲列表，下次生成时复用，不再每次新建对象。
+
+    存活实体保存在一个列表里；实体通过把 active 置为 False 表示死亡，
+    collect() 原地压缩列表并回收这些实体，不需要复制整个组。
+    实体类需要实现 reset(*args)（复用时重新初始化）和 active 属性。
+    """
+
+    def __init__(self, factory):
+        """
+        :param factory: 新建实体的可调用对象，参数与 reset() 相同
+        """
+        self._factory = factory
+        self._live = []
+        self._free = []
+
+        # 统计信息
+        self.created = 0       # 实际新建过的对象数
+        self.high_water = 0    # 同时存活的最大数量
+
+    def __len__(self):
+        return len(self._live)
+
+    def __bool__(self):
+        return bool(self._live)
+
+    def __iter__(self):
+        return iter(self._live)
+
+    def sprites(self):
+        """存活实体列表（内部列表本身，遍历时不要生成或回收实体）。"""
+        return self._live
+
+    def acquire(self, *args):
+        """取出一个实体（优先复用空闲对象）并用 args 初始化。"""
+        if self._free:
+            entity = self._free.pop()
+            entity.reset(*args)
+        else:
+            entity = self._factory(*args)
+            self.created += 1
+
+        self._live.append(entity)
+        if len(self._live) > self.high_water:
+            self.high_water = len(self._live)
+        return entity
+
+    def update(self, *args):
+        """用 args 更新所有存活实体，然后回收本帧死亡的实体。"""
+        for entity in self._live:
+            entity.update(*args)
+        self.collect()
+
+    def collect(self):
+        """原地删除 active 为 False 的实体并放回空闲列表。"""
+        live = self._live
+        free = self._free
+        kept = 0
+        for entity in live:
+            if entity.active:
+                live[kept] = entity
+                kept += 1
+            else:
+                free.append(entity)
+        del live[kept:]
+
+    def release(self, count):
+        """回收最后 count 个存活实体（用于分几步逐渐清空）。"""
+        if count <= 0:
+            return
+        released = self._live[-count:]
+        for entity in released:
+            entity.active = False
+        self._free.extend(released)
+        del self._live[-count:]
+
+    def empty(self):
+        """回收所有存活实体。"""
+        for entity in self._live:
+            entity.active = False
+        self._free.extend(self._live)
+        self._live.clear()
+
+    def stats(self):
+        """存活数、空闲数、最大同时存活数和实际新建数。"""
+        return {
+            'live': len(self._live),
+            'free': len(self._free),
+            'high_water': self.high_water,
+            'created': self.created,
+        }
@@ -0,0 +1,198 @@
+"""
+逐帧分阶段计时：每帧各阶段耗时写入预先分配的环形缓冲区，
+可以显示 p50 / p95 / p99 叠加层，也可以导出为 CSV / JSON。
+
+关闭时主循环只多做几次布尔判断，可以一直留在正式版本里。
+"""
+import csv
+import json
+import time
+
+import numpy as np
+import pygame
+
+
+# 一帧中依次经过的阶段（sim.step 内部的阶段由 GameSimulation 打点）
+PHASES = (
+    'events',         # _check_events
+    'inputs',         # 输入录制 + _apply_inputs
+    'ship',           # ship.update
+    'bullets',        # _update_bullets（含碰撞）
+    'aliens',         # _update_aliens（含刷怪、撞飞船）
+    'alien_bullets',  # _update_alien_bullets（含开火）
+    'shield',         # shield.update
+    'sim_events',     # 音效 / 存档等模拟事件处理
+    'rewind',         # 倒带快照
+    'particles',      # 粒子更新
+    'render',         # _update_screen
+    'capture',        # 画面录制（拷贝到录制缓冲区）
+    'wait',           # clock.tick 等待
+)
+
+PERCENTILES = (50, 95, 99)
+
+
+class FrameProfiler:
+    """
+    分阶段帧计时器。
+
+    每帧调用 start_frame()，每个阶段结束时调用 lap(阶段名)，把距离上一次打点的
+    时间累加到该阶段，最后 end_frame() 把这一行存入环形缓冲区。
+    时间来自 time.perf_counter_ns（单调、高精度），以纳秒整数保存。
+    """
+
+    def __init__(self, capacity=600, phases=PHASES, enabled=False):
+        """
+        :param capacity: 保留最近多少帧
+        :param phases: 阶段名列表（决定缓冲区的列）
+        :param enabled: 是否立即开始记录
+        """
+        self.phases = tuple(phases)
+        self.columns = {name: i for i, name in enumerate(self.phases)}
+        self.capacity = capacity
+        self.enabled = enabled
+
+        # 环形缓冲区：每行一帧，每列一个阶段（纳秒）
+        self.buffer = np.zeros((capacity, len(self.phases)), dtype=np.int64)
+        self.frames = 0      # 已记录的总帧数（下一帧写入 frames % capacity）
+        self._row = self.buffer[0]
+        self._last = 0
+
+    def __len__(self):
+        """缓冲区中有效的帧数。"""
+        return min(self.frames, self.capacity)
+
+    def enable(self):
+        """开始记录；可以在一帧中途调用，这一帧剩下的部分照常计入。"""
+        if not self.enabled:
+            self.enabled = True
+            self.start_frame()
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        self.buffer[:] = 0
+        self.frames = 0
+        self._row = self.buffer[0]
+
+    def start_frame(self):
+        """开始一帧：清空当前行并记下起点时间。"""
+        self._row = self.buffer[self.frames % self.capacity]
+        self._row[:] = 0
+        self._last = time.perf_counter_ns()
+
+    def lap(self, phase):
+        """把距离上一次打点经过的时间累加到 phase。"""
+        now = time.perf_counter_ns()
+        self._row[self.columns[phase]] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        """结束一帧，这一行成为缓冲区中最新的一帧。"""
+        self.frames += 1
+
+    def history(self):
+        """按时间先后排列的有效帧，形状 (帧数, 阶段数)，单位毫秒。"""
+        count = len(self)
+        if self.frames <= self.capacity:
+            rows = self.buffer[:count]
+        else:
+            start = self.frames % self.capacity
+            rows = np.concatenate((self.buffer[start:], self.buffer[:start]))
+        return rows / 1e6
+
+    def summary(self, budget_ms=None):
+        """
+        各阶段（以及整帧 total）的 p50 / p95 / p99 / 平均 / 最大值（毫秒）。
+
+        :param budget_ms: 给出时另外统计整帧超出预算的帧数 over_budget
+        """
+        frames = self.history()
+        result = {'frames': len(frames)}
+        if not len(frames):
+            return result
+
+        columns = dict(zip(self.phases, frames.T))
+        columns['total'] = frames.sum(axis=1)
+        for name, values in columns.items():
+            p50, p95, p99 = np.percentile(values, PERCENTILES)
+            result[name] = {
+                'p50': float(p50), 'p95': float(p95), 'p99': float(p99),
+                'mean': float(values.mean()), 'max': float(values.max()),
+            }
+        if budget_ms is not None:
+            result['over_budget'] = int(np.count_nonzero(columns['total'] > budget_ms))
+        return result
+
+    def dump(self, path, budget_ms=None):
+        """导出到 path：.json 包含汇总和逐帧数据，其他扩展名写 CSV（每行一帧）。"""
+        frames = self.history()
+        first = self.frames - len(frames)
+        if path.endswith('.json'):
+            data = {
+                'phases': self.phases,
+                'unit': 'ms',
+                'summary': self.summary(budget_ms),
+                'first_frame': first,
+                'frames': frames.round(4).tolist(),
+            }
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=1)
+        else:
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(('frame',) + self.phases + ('total',))
+                for i, row in enumerate(frames):
+                    writer.writerow([first + i] + [f'{v:.4f}' for v in row]
+                                    + [f'{row.sum():.4f}'])
+
+
+class ProfilerOverlay:
+    """在屏幕左下角显示各阶段的 p50 / p95 / p99；文字每隔几帧才重新生成一次。"""
+
+    text_color = (20, 20, 120)
+
+    def __init__(self, profiler, settings, refresh_frames=30, status=None):
+        """
+        :param status: 可选的无参函数，返回附加在表格下方的若干行文字（例如负载调节的状态）
+        """
+        self.profiler = profiler
+        self.settings = settings
+        self.refresh_frames = refresh_frames
+        self.status = status
+        self.font = None    # 第一次显示时才创建，不拖慢启动
+        self._images = []
+        self._updated_at = -refresh_frames
+
+    def _render(self):
+        if self.font is None:
+            self.font = pygame.font.SysFont('monospace', 14)
+        budget = 1000.0 / self.settings.fps
+        summary = self.profiler.summary(budget)
+        lines = [f"{'phase':<14}{'p50':>7}{'p95':>7}{'p99':>7}   ms"]
+        if summary['frames']:
+            for name in self.profiler.phases + ('total',):
+                s = summary[name]
+                lines.append(f"{name:<14}{s['p50']:7.2f}{s['p95']:7.2f}{s['p99']:7.2f}")
+            lines.append(f"over {budget:.1f} ms: {summary['over_budget']}"
+                         f" / {summary['frames']} frames")
+        if self.status is not None:
+            lines.extend(self.status())
+        self._images = [
+            self.font.render(line, True, self.text_color, self.settings.bg_color)
+            for line in lines
+        ]
+
+    def draw(self, screen):
+        """画出叠加层，返回画过的区域列表。"""
+        if self.profiler.frames - self._updated_at >= self.refresh_frames:
+            self._render()
+            self._updated_at = self.profiler.frames
+
+        rects = []
+        line_height = self.font.get_linesize()
+        top = self.settings.screen_height - 10 - line_height * len(self._images)
+        for i, image in enumerate(self._images):
+            rects.append(screen.blit(image, (10, top + i * line_height)))
+        return rects
@@ -0,0 +1,258 @@
+"""
+外星人子弹：数组存储（ProjectileStore）+ 开火图案（PatternEmitter）。
+
+每颗子弹有自己的速度，位置和速度都存放在 NumPy 数组里：
+移动、飞出屏幕的剔除、与飞船的碰撞检测都是整批数组运算，
+每帧的开销随子弹数量平缓增长，而不是每颗子弹一次 Python 调用。
+
+开火图案（外星人的攻击类型，生成时按 settings.alien_attack_weights 随机决定）：
+- 'straight'：一颗，竖直向下（原来的子弹）；
+- 'spread'：扇形散射，alien_spread_count 颗，总张角 alien_spread_angle 度；
+- 'aimed'：一颗，瞄准飞船当前的位置；
+- 'spiral'：一圈 alien_spiral_count 颗，整圈的起始角度随时间旋转（alien_spiral_spin 度/秒）。
+"""
+import numpy as np
+
+from spatial_hash import overlapping
+
+
+ATTACKS = ('straight', 'spread', 'aimed', 'spiral')
+
+
+def round_half_away(values):
+    """与给 Rect 坐标赋浮点数时相同的取整（四舍五入，.5 远离 0），返回 int64 数组。"""
+    return np.where(values >= 0, np.floor(values + 0.5), np.ceil(values - 0.5)).astype(np.int64)
+
+
+class ProjectileStore:
+    """
+    所有外星人子弹的数组存储：x / y（左上角，浮点）、vx / vy、上一步的位置，
+    以及与 rect 一致的整数坐标 ix / iy。存活的子弹总是紧凑地排在 [:len] 中，
+    删除时保持其余子弹的先后顺序（顺序参与状态哈希）。
+    """
+
+    ARRAYS = ('x', 'y', 'vx', 'vy', 'prev_x', 'prev_y', 'ix', 'iy')
+
+    def __init__(self, settings, screen_rect, capacity=64):
+        """
+        :param settings: 提供子弹尺寸
+        :param screen_rect: 屏幕范围，完全飞出范围的子弹被剔除
+        :param capacity: 初始数组容量，不够时自动翻倍
+        """
+        self.width = settings.bullet_width
+        self.height = settings.bullet_height
+        self.screen_width, self.screen_height = screen_rect.size
+
+        for name in self.ARRAYS:
+            dtype = np.int64 if name in ('ix', 'iy') else np.float64
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self._count = 0
+
+        # 统计信息
+        self.high_water = 0
+        self.emitted = 0
+
+    def __len__(self):
+        return self._count
+
+    def __bool__(self):
+        return self._count > 0
+
+    def _grow(self, needed):
+        capacity = len(self.x)
+        while capacity < needed:
+            capacity *= 2
+        for name in self.ARRAYS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self._count] = old[:self._count]
+            setattr(self, name, new)
+
+    # ---------- 生成 / 删除 ----------
+
+    def emit(self, x, y, vx, vy, limit):
+        """
+        追加一批子弹（左上角 x, y 和速度 vx, vy 都是等长数组），总数不超过 limit，
+        超出的部分丢弃。返回实际生成的数量。
+        """
+        n = min(len(x), max(limit - self._count, 0))
+        if not n:
+            return 0
+        start, end = self._count, self._count + n
+        if end > len(self.x):
+            self._grow(end)
+        self.x[start:end] = x[:n]
+        self.y[start:end] = y[:n]
+        self.prev_x[start:end] = x[:n]
+        self.prev_y[start:end] = y[:n]
+        self.vx[start:end] = vx[:n]
+        self.vy[start:end] = vy[:n]
+        self.ix[start:end] = round_half_away(self.x[start:end])
+        self.iy[start:end] = round_half_away(self.y[start:end])
+
+        self._count = end
+        self.emitted += n
+        if end > self.high_water:
+            self.high_water = end
+        return n
+
+    def _keep(self, keep):
+        """只保留布尔数组 keep 为 True 的子弹（保持顺序）。"""
+        n = self._count
+        kept = int(np.count_nonzero(keep))
+        if kept == n:
+            return
+        for name in self.ARRAYS:
+            array = getattr(self, name)
+            array[:kept] = array[:n][keep]
+        self._count = kept
+
+    def remove(self, indices):
+        """删除给定下标的子弹。"""
+        if len(indices):
+            keep = np.ones(self._count, dtype=bool)
+            keep[indices] = False
+            self._keep(keep)
+
+    def release(self, count):
+        """删除最后 count 颗子弹（用于分几步逐渐清空）。"""
+        if count > 0:
+            self._count = max(self._count - count, 0)
+
+    def empty(self):
+        self._count = 0
+
+    # ---------- 批量更新 ----------
+
+    def update(self, dt):
+        """所有子弹前进 dt 秒，并剔除完全飞出屏幕的子弹。"""
+        n = self._count
+        if not n:
+            return
+        x, y = self.x[:n], self.y[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+        x += self.vx[:n] * dt
+        y += self.vy[:n] * dt
+        ix = self.ix[:n]
+        iy = self.iy[:n]
+        ix[:] = round_half_away(x)
+        iy[:] = round_half_away(y)
+
+        inside = ((iy < self.screen_height) & (iy + self.height > 0)
+                  & (ix < self.screen_width) & (ix + self.width > 0))
+        if not inside.all():
+            self._keep(inside)
+
+    # ---------- 查询 ----------
+
+    def collide_rect(self, rect):
+        """与 rect 重叠（与 Rect.colliderect 规则相同）的子弹下标。"""
+        n = self._count
+        return np.flatnonzero(overlapping(rect, self.ix[:n], self.iy[:n],
+                                          self.width, self.height))
+
+    def rects(self, indices):
+        """给定子弹的 (n, 4) 矩形数组：x, y, w, h。"""
+        rects = np.empty((len(indices), 4), dtype=np.int64)
+        rects[:, 0] = self.ix[indices]
+        rects[:, 1] = self.iy[indices]
+        rects[:, 2] = self.width
+        rects[:, 3] = self.height
+        return rects
+
+    def draw_positions(self, alpha=1.0):
+        """绘制位置列表 [[x, y], ...]，alpha 在 0~1 之间时取上一步和当前步之间的插值处。"""
+        n = self._count
+        if not n:
+            return []
+        if alpha == 1.0:
+            xs, ys = self.ix[:n], self.iy[:n]
+        else:
+            px, py = self.prev_x[:n], self.prev_y[:n]
+            xs = round_half_away(px + (self.x[:n] - px) * alpha)
+            ys = round_half_away(py + (self.y[:n] - py) * alpha)
+        return np.column_stack((xs, ys)).tolist()
+
+    def state_bytes(self):
+        """子弹数量和每颗子弹的 (rect.x, y)，用于计算状态哈希（与对象池时的格式相同）。"""
+        n = self._count
+        rows = np.empty(n, dtype=[('x', '<i4'), ('y', '<f8')])
+        rows['x'] = self.ix[:n]
+        rows['y'] = self.y[:n]
+        return np.int64(n).tobytes() + rows.tobytes()
+
+    def get_state(self):
+        """存活子弹的各数组切片（倒带快照用）。"""
+        return [getattr(self, name)[:self._count] for name in self.ARRAYS]
+
+    def set_state(self, count, arrays):
+        if count > len(self.x):
+            self._grow(count)
+        for name, values in zip(self.ARRAYS, arrays):
+            getattr(self, name)[:count] = values
+        self._count = count
+
+    def stats(self):
+        """存活数、数组容量、最大同时存活数和累计生成数。"""
+        return {
+            'live': self._count,
+            'capacity': len(self.x),
+            'high_water': self.high_water,
+            'emitted': self.emitted,
+        }
+
+
+class PatternEmitter:
+    """按攻击类型批量生成子弹：一次调用处理同一类型的所有开火点。"""
+
+    def __init__(self, settings):
+        self.settings = settings
+
+    def emit(self, store, attack, origins, target, seconds, limit):
+        """
+        从每个开火点（外星人底部中心）按图案 attack 发射子弹。
+
+        :param store: ProjectileStore
+        :param origins: (k, 2) 数组，子弹从这些点发射（子弹顶边中点对齐这个点）
+        :param target: 飞船中心 (x, y)，'aimed' 图案瞄准这里
+        :param seconds: 游戏内时间（秒），决定 'spiral' 的旋转角度
+        :param limit: 子弹总数上限
+        :return: 实际生成的子弹数
+        """
+        s = self.settings
+        speed = s.alien_bullet_speed
+        origins = np.asarray(origins, dtype=np.float64).reshape(-1, 2)
+        k = len(origins)
+
+        if attack == 'straight':
+            # 竖直向下：速度分量直接取 (0, speed)，不经过三角函数
+            vx = np.zeros(k)
+            vy = np.full(k, speed)
+            points = origins
+        else:
+            if attack == 'spread':
+                half = np.radians(s.alien_spread_angle) / 2
+                fan = np.linspace(-half, half, s.alien_spread_count)
+                angles = np.pi / 2 + np.tile(fan, (k, 1))
+            elif attack == 'aimed':
+                dx = target[0] - origins[:, 0]
+                dy = target[1] - origins[:, 1]
+                angles = np.arctan2(dy, dx)[:, None]
+            elif attack == 'spiral':
+                count = s.alien_spiral_count
+                ring = np.arange(count) * (2 * np.pi / count)
+                start = np.radians(s.alien_spiral_spin * seconds)
+                angles = np.tile(start + ring, (k, 1))
+            else:
+                raise ValueError(f"未知的攻击类型：{attack}")
+            per_origin = angles.shape[1]
+            angles = angles.ravel()
+            vx = np.cos(angles) * speed
+            vy = np.sin(angles) * speed
+            points = np.repeat(origins, per_origin, axis=0)
+
+        # 与 rect.midtop = 开火点 相同：左上角 x 为中心减去宽度的一半（向下取整）
+        x = points[:, 0] - store.width // 2
+        y = points[:, 1].copy()
+        return store.emit(x, y, vx, vy, limit)
@@ -0,0 +1,164 @@
+"""
+输入录制与无窗口快速回放。
+
+录制文件包含随机种子、全部设置、每一步的输入（每步 1 字节，zlib 压缩）
+以及定期的状态哈希；回放时用同样的种子和输入重新模拟，逐个核对哈希。
+
+用法：
+    python alien_invasion.py --record game.rec   # 录制一局
+    python replay.py game.rec                    # 无窗口全速回放并核对
+"""
+import json
+import struct
+import sys
+import time
+import zlib
+
+from settings import Settings
+from simulation import GameSimulation, Inputs
+
+
+MAGIC = b'AIREC1'
+
+# 每一步输入打包成 1 字节的位掩码
+_FLAGS = ('moving_right', 'moving_left', 'moving_up', 'moving_down', 'fire', 'shield')
+
+
+def pack_inputs(inputs):
+    """把 Inputs 打包成一个字节（位掩码）。"""
+    mask = 0
+    for bit, name in enumerate(_FLAGS):
+        if getattr(inputs, name):
+            mask |= 1 << bit
+    return mask
+
+
+def unpack_inputs(mask, inputs=None):
+    """把位掩码还原到 inputs（默认新建一个 Inputs）。"""
+    if inputs is None:
+        inputs = Inputs()
+    for bit, name in enumerate(_FLAGS):
+        setattr(inputs, name, bool(mask & (1 << bit)))
+    return inputs
+
+
+class InputRecorder:
+    """记录一局游戏每一步的输入和定期的状态哈希。"""
+
+    def __init__(self, sim, checkpoint_interval=60):
+        """
+        :param sim: 要录制的 GameSimulation（记录它的种子和设置）
+        :param checkpoint_interval: 每隔多少步记录一次状态哈希
+        """
+        self.seed = sim.seed
+        self.settings = dict(vars(sim.settings))
+        self.checkpoint_interval = checkpoint_interval
+        self.masks = bytearray()
+        self.checkpoints = []   # [(步数, 哈希)]
+
+    def record(self, inputs):
+        """在 sim.step(inputs) 之前调用，记录这一步的输入。"""
+        self.masks.append(pack_inputs(inputs))
+
+    def after_step(self, sim):
+        """在 sim.step() 之后调用，按间隔记录状态哈希。"""
+        if sim.ticks % self.checkpoint_interval == 0:
+            self.checkpoints.append((sim.ticks, sim.state_hash()))
+
+    def truncate(self, ticks):
+        """倒带后从第 ticks 步继续：丢掉之后的输入和状态哈希。"""
+        del self.masks[ticks:]
+        self.checkpoints = [(tick, digest) for tick, digest in self.checkpoints if tick <= ticks]
+
+    def save(self, path, sim):
+        """写入录制文件（末尾附上最终得分和状态哈希）。"""
+        header = {
+            'seed': self.seed,
+            'settings': self.settings,
+            'ticks': len(self.masks),
+            'checkpoints': self.checkpoints,
+            'final_score': sim.stats.score,
+            'final_hash': sim.state_hash(),
+        }
+        header_bytes = json.dumps(header).encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<I', len(header_bytes)))
+            f.write(header_bytes)
+            f.write(zlib.compress(bytes(self.masks), 9))
+
+
+def load_recording(path):
+    """读取录制文件，返回 (header, 输入字节串)。"""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"不是录制文件：{path}")
+        (size,) = struct.unpack('<I', f.read(4))
+        header = json.loads(f.read(size).decode('utf-8'))
+        masks = zlib.decompress(f.read())
+    return header, masks
+
+
+def settings_from_dict(values):
+    """按录制时的设置还原 Settings（JSON 中的列表还原为元组）。"""
+    settings = Settings()
+    for name, value in values.items():
+        setattr(settings, name, tuple(value) if isinstance(value, list) else value)
+    return settings
+
+
+def replay(path):
+    """
+    无窗口全速回放录制文件，返回结果字典：
+    ok（最终得分、哈希和所有检查点是否一致）、mismatches、ticks、ticks_per_second 等。
+    """
+    header, masks = load_recording(path)
+    sim = GameSimulation(settings_from_dict(header['settings']), seed=header['seed'])
+    checkpoints = {tick: digest for tick, digest in header['checkpoints']}
+
+    mismatches = []
+    inputs = Inputs()
+    start = time.perf_counter()
+    for mask in masks:
+        sim.step(unpack_inputs(mask, inputs))
+        if sim.ticks in checkpoints:
+            if sim.state_hash() != checkpoints[sim.ticks]:
+                mismatches.append(sim.ticks)
+    elapsed = time.perf_counter() - start
+
+    final_hash = sim.state_hash()
+    ok = (not mismatches and final_hash == header['final_hash']
+          and sim.stats.score == header['final_score'])
+    return {
+        'ok': ok,
+        'mismatches': mismatches,
+        'ticks': sim.ticks,
+        'score': sim.stats.score,
+        'expected_score': header['final_score'],
+        'hash': final_hash,
+        'expected_hash': header['final_hash'],
+        'ticks_per_second': sim.ticks / elapsed if elapsed else float('inf'),
+    }
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("用法：python replay.py <录制文件>")
+        return 2
+
+    result = replay(argv[0])
+    print(f"{result['ticks']} ticks replayed at {result['ticks_per_second']:.0f} ticks/s")
+    print(f"score {result['score']} (recorded {result['expected_score']})")
+    if result['ok']:
+        print("OK: replay matches recording")
+        return 0
+    if result['mismatches']:
+        print(f"MISMATCH: first diverging checkpoint at tick {result['mismatches'][0]}")
+    else:
+        print(f"MISMATCH: final hash {result['hash']} != {result['expected_hash']}")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
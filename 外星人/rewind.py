@@ -0,0 +1,278 @@
+"""
+倒带：把整局游戏状态打包成紧凑的字节快照，存进固定大小的环形缓冲区。
+
+快照格式（snapshot() / restore()）：一段定长的 struct 标量（步数、飞船、统计、护盾、
+碰撞计数、随机数发生器状态和各数组长度），后面接各个 NumPy 数组的原始字节
+（外星人槽位数组、空闲槽位、开火调度堆、玩家子弹、外星人子弹数组）。打包只有一次 struct.pack
+和几次 tobytes，不经过 pickle。
+
+RewindBuffer 每隔 keyframe_interval 个快照存一个关键帧（zlib 压缩的完整快照），
+其余存与上一个快照按字节异或后的增量（大部分字节不变，压缩后只有几百字节）。
+所有数据写在一块预先分配、大小固定的内存里，写满后覆盖最旧的快照。
+"""
+import struct
+import zlib
+from collections import deque
+
+import numpy as np
+
+from score_store import settings_hash
+
+# 标量部分：
+#   步数；飞船 x, y, prev_x, prev_y, rect.x, rect.y, 四个移动标志, 状态, 状态剩余步数；
+#   得分, 剩余生命, 等级, 游戏进行中；护盾次数, 激活, 启动时间, 上次回复时间（None 记为 -1）；
+#   碰撞计数 ×3；随机数发生器（PCG64 的 state / inc 各 128 位, has_uint32, uinteger）；
+#   外星人已用槽位数, 存活数, 最大同时存活数, 空闲槽位数；开火堆条目数, 代数表长度；
+#   玩家子弹数, 外星人子弹数
+SCALARS = struct.Struct('<q ddddii ????Bq qqq? q?qq qqq 16s16sBI IIII II II')
+
+HEAP_DTYPE = np.dtype([('time', '<f8'), ('slot', '<i8'), ('generation', '<i8')])
+BULLET_DTYPE = np.dtype([('x', '<i4'), ('y', '<i4'), ('fy', '<f8'), ('prev_y', '<f8')])
+
+STATE_MAGIC = b'AISTATE2'
+# 存档文件头：种子、设置哈希、快照长度
+STATE_HEADER = struct.Struct('<QQI')
+
+
+def _bullet_rows(pool):
+    return np.array([(b.rect.x, b.rect.y, b.y, b.prev_y) for b in pool], dtype=BULLET_DTYPE)
+
+
+def snapshot(sim):
+    """把 sim 的完整游戏状态打包成字节串（不含最高分，最高分来自成绩记录）。"""
+    ship, stats, shield, counters = sim.ship, sim.stats, sim.shield, sim.collisions
+    rng = sim.rng.bit_generator.state
+    size, count, high_water, free, arrays = sim.aliens.get_state()
+    heap, generation = sim.fire_scheduler.get_state()
+    bullets = _bullet_rows(sim.bullets)
+
+    head = SCALARS.pack(
+        sim.ticks,
+        ship.x, ship.y, ship.prev_x, ship.prev_y, ship.rect.x, ship.rect.y,
+        ship.moving_right, ship.moving_left, ship.moving_up, ship.moving_down,
+        ship.STATES.index(ship.state), ship.state_ticks,
+        stats.score, stats.ships_left, stats.level, stats.game_active,
+        shield.charges, shield.active,
+        -1 if shield.start_time is None else shield.start_time,
+        -1 if shield.last_refresh_time is None else shield.last_refresh_time,
+        counters.broadphase, counters.narrowphase, counters.hits,
+        rng['state']['state'].to_bytes(16, 'little'), rng['state']['inc'].to_bytes(16, 'little'),
+        rng['has_uint32'], rng['uinteger'],
+        size, count, high_water, len(free), len(heap), len(generation),
+        len(bullets), len(sim.alien_bullets),
+    )
+    return b''.join([
+        head, *[array.tobytes() for array in arrays], free.tobytes(),
+        np.array(heap, dtype=HEAP_DTYPE).tobytes(),
+        np.array(generation, dtype=np.int64).tobytes(),
+        bullets.tobytes(), *[array.tobytes() for array in sim.alien_bullets.get_state()],
+    ])
+
+
+def restore(sim, data):
+    """把 snapshot() 打包的状态还原到 sim（设置和图片需与打包时相同）。"""
+    values = SCALARS.unpack_from(data)
+    (ticks, x, y, prev_x, prev_y, rect_x, rect_y, right, left, up, down, state, state_ticks,
+     score, ships_left, level, game_active, charges, active, start, refresh,
+     broadphase, narrowphase, hits, rng_state, rng_inc, has_uint32, uinteger,
+     size, count, high_water, free_count, heap_count, generation_count,
+     bullet_count, alien_bullet_count) = values
+    offset = SCALARS.size
+
+    def take(dtype, n):
+        nonlocal offset
+        array = np.frombuffer(data, dtype=dtype, count=n, offset=offset)
+        offset += array.nbytes
+        return array
+
+    aliens = sim.aliens
+    arrays = [take(getattr(aliens, name).dtype, size) for name in aliens.STATE_ARRAYS]
+    aliens.set_state(size, count, high_water, take(np.int64, free_count), arrays)
+    sim.fire_scheduler.set_state(take(HEAP_DTYPE, heap_count).tolist(),
+                                 take(np.int64, generation_count).tolist())
+    _restore_bullets(sim.bullets, take(BULLET_DTYPE, bullet_count), sim)
+    store = sim.alien_bullets
+    store.set_state(alien_bullet_count, [take(getattr(store, name).dtype, alien_bullet_count)
+                                         for name in store.ARRAYS])
+
+    sim.ticks = ticks
+    ship = sim.ship
+    ship.x, ship.y, ship.prev_x, ship.prev_y = x, y, prev_x, prev_y
+    ship.rect.x, ship.rect.y = rect_x, rect_y
+    ship.moving_right, ship.moving_left, ship.moving_up, ship.moving_down = right, left, up, down
+    ship.state, ship.state_ticks = ship.STATES[state], state_ticks
+
+    stats = sim.stats
+    stats.score, stats.ships_left, stats.level, stats.game_active = (
+        score, ships_left, level, game_active)
+
+    shield = sim.shield
+    shield.charges, shield.active = charges, active
+    shield.start_time = None if start < 0 else start
+    shield.last_refresh_time = None if refresh < 0 else refresh
+
+    counters = sim.collisions
+    counters.broadphase, counters.narrowphase, counters.hits = broadphase, narrowphase, hits
+
+    sim.rng.bit_generator.state = {
+        'bit_generator': 'PCG64',
+        'state': {'state': int.from_bytes(rng_state, 'little'),
+                  'inc': int.from_bytes(rng_inc, 'little')},
+        'has_uint32': has_uint32, 'uinteger': uinteger,
+    }
+    sim.events = []
+
+
+def _restore_bullets(pool, rows, sim):
+    """清空对象池，再按快照中的顺序取出子弹并写回位置。"""
+    pool.empty()
+    for x, y, fy, prev_y in rows.tolist():
+        bullet = pool.acquire(sim)
+        bullet.rect.x, bullet.rect.y = x, y
+        bullet.y, bullet.prev_y = fy, prev_y
+
+
+# ---------- 存档文件 ----------
+
+def save_state(path, sim):
+    """把 sim 当前的状态写入存档文件。"""
+    data = zlib.compress(snapshot(sim), 6)
+    with open(path, 'wb') as f:
+        f.write(STATE_MAGIC)
+        f.write(STATE_HEADER.pack(sim.seed, settings_hash(sim.settings), len(data)))
+        f.write(data)
+
+
+def load_state(path, sim):
+    """
+    从存档文件还原 sim 的状态（种子也改为存档中的种子）。
+    文件格式不对时抛出 ValueError；设置不同时只打印警告。
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(STATE_MAGIC)) != STATE_MAGIC:
+            raise ValueError(f"不是存档文件：{path}")
+        seed, digest, length = STATE_HEADER.unpack(f.read(STATE_HEADER.size))
+        data = f.read(length)
+    try:
+        data = zlib.decompress(data)
+    except zlib.error as e:
+        raise ValueError(f"存档文件已损坏：{path}") from e
+    if digest != settings_hash(sim.settings):
+        print(f"Warning: 存档 {path} 是在不同的设置下保存的")
+    restore(sim, data)
+    sim.seed = seed
+
+
+# ---------- 环形缓冲区 ----------
+
+class RewindBuffer:
+    """
+    最近若干步的状态快照（关键帧 + 增量），存放在一块固定大小的内存中。
+
+    record() 每步调用一次；倒带时用 seek(i) 取出第 i 个快照（0 为最旧的），
+    从倒带的位置继续游戏前调用 truncate(i) 丢掉它之后的快照。
+    """
+
+    def __init__(self, capacity_bytes, keyframe_interval=60):
+        """
+        :param capacity_bytes: 快照占用的内存上限（字节），一次性分配
+        :param keyframe_interval: 每隔多少个快照存一个关键帧
+        """
+        self.arena = np.zeros(capacity_bytes, dtype=np.uint8)
+        self.keyframe_interval = keyframe_interval
+        # 每个快照一项：(步数, 在 arena 中的偏移, 压缩后长度, 是否关键帧)
+        self._entries = deque()
+        self._head = 0             # 下一次写入的位置
+        self._last = None          # 上一个快照的原始字节（计算增量用）
+        self._since_keyframe = 0
+        self.dropped = 0           # 因为单个快照比整块内存还大而没有保存的次数
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+        self._head = 0
+        self._last = None
+
+    @property
+    def bytes_used(self):
+        return sum(entry[2] for entry in self._entries)
+
+    def ticks(self, index):
+        """第 index 个快照的步数。"""
+        return self._entries[index][0]
+
+    def record(self, sim):
+        """保存 sim 当前状态的快照。"""
+        raw = snapshot(sim)
+        keyframe = self._last is None or self._since_keyframe >= self.keyframe_interval
+        if keyframe:
+            data = zlib.compress(raw, 1)
+        else:
+            data = zlib.compress(_xor(raw, self._last), 1)
+        if not self._store(sim.ticks, data, keyframe):
+            self.dropped += 1
+            self._last = None      # 下一个快照必须是关键帧
+            return
+        self._last = raw
+        self._since_keyframe = 1 if keyframe else self._since_keyframe + 1
+
+    def _store(self, ticks, data, keyframe):
+        size = len(data)
+        capacity = len(self.arena)
+        if size > capacity:
+            return False
+        entries = self._entries
+
+        if self._head + size > capacity:
+            # 回到开头写：先丢掉上一圈留在 arena 末尾的快照（它们比开头的更旧）
+            while entries and entries[0][1] >= self._head:
+                entries.popleft()
+            self._head = 0
+        # 丢掉将被覆盖的最旧的快照；之后开头的增量没有了关键帧，也一并丢掉
+        end = self._head + size
+        while entries and self._head <= entries[0][1] < end:
+            entries.popleft()
+        while entries and not entries[0][3]:
+            entries.popleft()
+
+        self.arena[self._head:end] = np.frombuffer(data, dtype=np.uint8)
+        entries.append((ticks, self._head, size, keyframe))
+        self._head = end
+        return True
+
+    def seek(self, index):
+        """第 index 个快照的原始字节（从它之前最近的关键帧开始逐个应用增量）。"""
+        entries = self._entries
+        start = index
+        while not entries[start][3]:
+            start -= 1
+        raw = None
+        for i in range(start, index + 1):
+            _, offset, size, keyframe = entries[i]
+            data = zlib.decompress(self.arena[offset:offset + size])
+            raw = data if keyframe else _xor(data, raw)
+        return raw
+
+    def truncate(self, index):
+        """只保留前 index + 1 个快照，之后的 record() 接在第 index 个后面。"""
+        entries = self._entries
+        raw = self.seek(index)
+        while len(entries) > index + 1:
+            entries.pop()
+        _, offset, size, _ = entries[index]
+        self._head = offset + size
+        self._last = raw
+        last_keyframe = index
+        while not entries[last_keyframe][3]:
+            last_keyframe -= 1
+        self._since_keyframe = index - last_keyframe + 1
+
+
+def _xor(data, base):
+    """data 与 base 逐字节异或（长度以 data 为准，base 不够长的部分当作 0）。"""
+    out = np.frombuffer(data, dtype=np.uint8).copy()
+    n = min(len(out), len(base))
+    out[:n] ^= np.frombuffer(base, dtype=np.uint8, count=n)
+    return out.tobytes()
@@ -0,0 +1,208 @@
+"""
+成绩记录：每局结束追加一条定长记录到日志文件，内存里维护前 N 名排行榜。
+
+写盘全部在后台线程完成，主循环只把记录放进队列，不会因为磁盘 I/O 卡帧。
+日志文件格式：8 字节文件头 + 若干条 40 字节的小端记录
+（时间戳 f8、得分 i8、时长秒数 f8、种子 i8、设置哈希 u8），
+启动时用 NumPy 一次读入，几十万条记录也只需几毫秒。
+"""
+import bisect
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+
+MAGIC = b'AISCORE1'
+
+RECORD_DTYPE = np.dtype([
+    ('time', '<f8'),
+    ('score', '<i8'),
+    ('duration', '<f8'),
+    ('seed', '<i8'),
+    ('settings_hash', '<u8'),
+])
+
+ScoreEntry = namedtuple('ScoreEntry', 'time score duration seed settings_hash')
+
+_DEFAULT_DIR = os.path.dirname(__file__)
+
+
+def settings_hash(settings):
+    """设置内容的 64 位哈希，用来区分不同参数下的成绩。"""
+    text = json.dumps(vars(settings), sort_keys=True, default=str)
+    digest = hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def _rank_key(entry):
+    # 得分高的在前；同分时先达成的在前
+    return (-entry.score, entry.time)
+
+
+class ScoreStore:
+    """
+    追加写入的成绩日志 + 内存中的前 N 名排行榜。
+
+    record() 立即更新排行榜并把记录交给写线程；写线程负责追加、
+    修复损坏的文件尾，以及日志过大时的压缩（写临时文件后 os.replace，原子替换）。
+    """
+
+    def __init__(self, path=None, top_n=10, max_entries=1_000_000, legacy_path=None):
+        """
+        :param path: 日志文件路径，默认放在游戏目录下的 scores.log
+        :param top_n: 排行榜保留的名次
+        :param max_entries: 日志超过这么多条时压缩为最近的一半（排行榜上的记录总会保留）
+        :param legacy_path: 旧版 high_score.json，日志里没有更高的分数时沿用其中的最高分
+        """
+        self.path = path or os.path.join(_DEFAULT_DIR, 'scores.log')
+        self.top_n = top_n
+        self.max_entries = max_entries
+        if legacy_path is None:
+            legacy_path = os.path.join(_DEFAULT_DIR, 'high_score.json')
+
+        self.top = []          # 按名次排列的 ScoreEntry
+        self.last_error = None
+
+        self._legacy_high_score = self._load_legacy(legacy_path)
+        needs_repair = self._load()
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._writer, name='score-writer', daemon=True)
+        self._thread.start()
+        if needs_repair:
+            self._queue.put(('compact', None))
+
+    # ---------- 读取 ----------
+
+    @staticmethod
+    def _load_legacy(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return int(json.load(f).get('high_score', 0))
+        except (OSError, ValueError, AttributeError):
+            return 0
+
+    def _read_records(self):
+        """
+        读取日志中所有完整的记录，返回 (记录数组, 是否需要修复)。
+        文件不存在时返回空数组；文件头不对或末尾有半条记录时需要修复。
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return np.zeros(0, dtype=RECORD_DTYPE), False
+
+        if not data.startswith(MAGIC):
+            if data:
+                print(f"Warning: 成绩日志格式不正确，将重建：{self.path}")
+            return np.zeros(0, dtype=RECORD_DTYPE), True
+
+        body = len(data) - len(MAGIC)
+        count = body // RECORD_DTYPE.itemsize
+        records = np.frombuffer(data, dtype=RECORD_DTYPE, count=count, offset=len(MAGIC))
+        return records, body != count * RECORD_DTYPE.itemsize
+
+    def _load(self):
+        """启动时载入日志并建立排行榜，返回日志是否需要修复。"""
+        records, needs_repair = self._read_records()
+        self.top = [ScoreEntry(*row) for row in self._top_rows(records, self.top_n).tolist()]
+        return needs_repair
+
+    @staticmethod
+    def _top_rows(records, n):
+        """前 n 名的记录（先 argpartition 取出候选，再对这 n 条排序）。"""
+        if len(records) > n:
+            records = records[np.argpartition(-records['score'], n - 1)[:n]]
+        return records[np.lexsort((records['time'], -records['score']))]
+
+    # ---------- 排行榜 ----------
+
+    @property
+    def high_score(self):
+        best = self.top[0].score if self.top else 0
+        return max(best, self._legacy_high_score)
+
+    def leaderboard(self, n=None):
+        """前 n 名（默认 top_n）。"""
+        return self.top[:n or self.top_n]
+
+    def record(self, score, duration, seed, settings_hash):
+        """
+        记录一局成绩：立即更新排行榜，写盘交给后台线程。返回这一局的名次（从 1 开始），
+        没进排行榜时返回 None。
+        """
+        entry = ScoreEntry(time.time(), int(score), float(duration), int(seed), int(settings_hash))
+        rank = bisect.bisect_right(self.top, _rank_key(entry), key=_rank_key)
+        if rank < self.top_n:
+            self.top.insert(rank, entry)
+            del self.top[self.top_n:]
+        self._queue.put(('append', entry))
+        return rank + 1 if rank < self.top_n else None
+
+    # ---------- 后台写入 ----------
+
+    def _writer(self):
+        while True:
+            task, entry = self._queue.get()
+            try:
+                if task == 'stop':
+                    return
+                if task == 'append':
+                    self._append(entry)
+                elif task == 'compact':
+                    self._compact()
+            except OSError as e:
+                self.last_error = e
+                print(f"Warning: 成绩日志写入失败：{e}")
+            finally:
+                self._queue.task_done()
+
+    def _append(self, entry):
+        record = np.array([tuple(entry)], dtype=RECORD_DTYPE).tobytes()
+        new_file = not os.path.exists(self.path)
+        with open(self.path, 'ab') as f:
+            if new_file:
+                f.write(MAGIC)
+            f.write(record)
+            f.flush()
+            os.fsync(f.fileno())
+
+        if os.path.getsize(self.path) > len(MAGIC) + self.max_entries * RECORD_DTYPE.itemsize:
+            self._compact()
+
+    def _compact(self):
+        """
+        重写日志：丢掉损坏的文件尾；超过 max_entries 时只保留最近的一半和排行榜上的记录。
+        先写临时文件并 fsync，再用 os.replace 原子替换，中途崩溃也不会留下半个文件。
+        """
+        records, _ = self._read_records()
+        if len(records) > self.max_entries:
+            keep = np.zeros(len(records), dtype=bool)
+            keep[-(self.max_entries // 2):] = True
+            keep[np.argpartition(-records['score'], self.top_n - 1)[:self.top_n]] = True
+            records = records[keep]
+
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(records.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def flush(self):
+        """等待已提交的记录全部写完。"""
+        self._queue.join()
+
+    def close(self):
+        """写完剩余记录并结束写线程（退出游戏时调用）。"""
+        if self._thread.is_alive():
+            self._queue.put(('stop', None))
+            self._thread.join()
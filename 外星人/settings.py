@@ -1,4 +1,7 @@
 # settings.py
+import math
+
+
 class Settings:
     """A class to store all settings for Alien Invasion."""
 
@@ -8,14 +11,64 @@ class Settings:
         self.screen_width = 1200
         self.screen_height = 800
         self.bg_color = (230, 230, 230)
+        # 每秒绘制的最大帧数（与模拟频率无关，可按显示器刷新率设置）
+        self.fps = 60
+        # 固定步长模拟：每秒模拟的步数，以及每帧最多补跑的步数（机器太慢时限制模拟开销）
+        self.tick_rate = 60
+        self.max_ticks_per_frame = 5
+        # 脏矩形绘制：只推送变化的区域；设为 False 则每帧整屏重绘并 flip
+        self.dirty_rendering = True
+        # HUD 中的数字用预渲染的字形拼出，不再每次调用字体渲染
+        self.hud_digit_atlas = False
+        # 分阶段帧计时保留的帧数（环形缓冲区大小）
+        self.profiler_frames = 600
+        # 排行榜保留的名次，Game Over 画面显示其中的前几名
+        self.score_top_n = 10
+        self.leaderboard_shown = 5
+        # 画面录制（F9 或 --capture）：输出目录、格式（见 capture.FORMATS）、
+        # 环形缓冲区的帧数（写盘跟不上时丢帧），以及每隔几帧录一帧
+        self.capture_dir = 'captures'
+        self.capture_format = 'auto'
+        self.capture_buffers = 8
+        self.capture_every = 1
+        # 倒带（F5）：快照占用的内存上限（MB）、每隔多少个快照存一个关键帧，
+        # 以及 F6 / F7 存档和读档的文件
+        self.rewind_memory_mb = 2
+        self.rewind_keyframe_interval = 60
+        self.save_state_path = 'savestate.bin'
+        # 负载调节：帧耗时持续超出预算时逐级降低效果和刷怪量（见 governor.py）；
+        # 每隔多少帧评估一次、降级 / 恢复的阈值（占帧预算的比例），以及恢复前需要连续平稳的次数
+        self.governor_enabled = True
+        self.governor_window_frames = 30
+        self.governor_degrade_at = 0.9
+        self.governor_restore_at = 0.6
+        self.governor_restore_windows = 4
+        # 爆炸粒子（见 particles.py）：同时存在的上限、每个粒子的边长，
+        # 每个被消灭的外星人 / 每次飞船被击中产生的粒子数，初速度和寿命的范围，以及重力
+        self.particles_enabled = True
+        self.particle_capacity = 50000
+        self.particle_size = 2
+        self.particles_per_alien = 30
+        self.particles_per_ship_hit = 300
+        self.particle_speed = (40.0, 220.0)
+        self.particle_lifetime = (0.3, 1.0)
+        self.particle_gravity = 120.0
+        # 运行指标（--metrics-port / --metrics-file，见 metrics.py）：HTTP 服务的监听地址
+        # （默认只接受本机连接），以及写文件的间隔（秒）
+        self.metrics_host = '127.0.0.1'
+        self.metrics_file_interval = 10.0
 
-        # Ship settings.
-        self.ship_speed = 1.5
+        # Ship settings.（所有速度的单位都是 像素/秒）
+        self.ship_speed = 90.0
         # 飞船初始生命值（要求 2）
         self.ship_limit = 3
+        # 被击中后的重生暂停、重生后的无敌时间，以及无敌时闪烁的半周期（秒）
+        self.ship_respawn_seconds = 0.5
+        self.ship_invulnerable_seconds = 2.0
+        self.ship_blink_interval = 0.1
 
         # Bullet settings（玩家子弹）
-        self.bullet_speed = 2.5
+        self.bullet_speed = 150.0
         self.bullet_width = 3
         self.bullet_height = 15
         self.bullet_color = (60, 60, 60)
@@ -23,7 +76,10 @@ class Settings:
 
         # Alien settings.
         # 这里的 alien_speed 主要作为随机速度的基准
-        self.alien_speed = 1.0
+        self.alien_speed = 60.0
+        # 每个外星人每秒随机反向 / 随机变速的发生率
+        self.alien_flip_rate = 0.6
+        self.alien_jitter_rate = 0.6
 
         # NEW: score settings
         self.alien_points = 50
@@ -32,13 +88,45 @@ class Settings:
 
         # 屏幕上最多同时存在的外星人数量
         self.max_aliens = 15
-        # 每一帧生成新外星人的概率（建议不要太大）
-        self.alien_spawn_chance = 0.02  # 2%
+        # 每秒生成新外星人的平均次数（泊松发生率，与帧率无关）
+        self.alien_spawn_rate = 1.2
 
         # 外星人子弹设置
-        self.alien_bullet_speed = 1.5
+        self.alien_bullet_speed = 90.0
         self.alien_bullet_color = (255, 0, 0)
         # 屏幕上最多同时存在的外星人子弹数量
+        # （启用散射 / 螺旋时一次发射多颗，可相应放宽，如 40）
         self.alien_bullets_allowed = 10
-        # 单个外星人在一帧中开火的概率（超过 20 秒后才启用）
-        self.alien_fire_chance = 0.01  # 1%
+        # 单个外星人每秒开火的平均次数
+        self.alien_fire_rate = 0.6
+        # 外星人攻击类型的比例（生成时随机决定，见 projectiles.py）：
+        # 'straight' 竖直向下 / 'spread' 扇形散射 / 'aimed' 瞄准飞船 / 'spiral' 旋转的一圈。
+        # 默认只有竖直向下（与原来的难度相同）；其他图案需要在这里加上比例才会出现，例如
+        # {'straight': 0.6, 'spread': 0.2, 'aimed': 0.15, 'spiral': 0.05}
+        self.alien_attack_weights = {'straight': 1.0}
+        # 散射：每次的子弹数和总张角（度）
+        self.alien_spread_count = 5
+        self.alien_spread_angle = 50.0
+        # 螺旋：每圈的子弹数和整圈的旋转速度（度/秒）
+        self.alien_spiral_count = 12
+        self.alien_spiral_spin = 90.0
+
+        # 护盾设置：最多储存次数、每次恢复的冷却时间、持续时间、初始次数
+        self.shield_max_charges = 2
+        self.shield_cooldown_ms = 30_000
+        self.shield_duration_ms = 15_000
+        self.shield_initial_charges = 1
+
+        # 碰撞检测的网格格子边长（像素），应不小于外星人图片尺寸
+        self.collision_cell_size = 64
+        # 矩形重叠之后再按图片掩码做像素级判定（图片四角的透明区域不算击中）
+        self.pixel_perfect_collisions = True
+
+    @property
+    def tick_seconds(self):
+        """一个模拟步长的时长（秒）。"""
+        return 1.0 / self.tick_rate
+
+    def tick_chance(self, rate):
+        """把“每秒发生率”换算成一个模拟步长内至少发生一次的概率。"""
+        return 1.0 - math.exp(-rate / self.tick_rate)
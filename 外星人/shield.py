@@ -36,11 +36,13 @@ class Shield:
                 self.last_refresh_time = now_ms
 
     def activate(self, now_ms: int):
-        """尝试激活护盾：需要有剩余次数且当前未激活。"""
+        """尝试激活护盾：需要有剩余次数且当前未激活。激活成功返回 True。"""
         if (not self.active) and self.charges > 0:
             self.active = True
             self.charges -= 1
             self.start_time = now_ms
+            return True
+        return False
 
     def consume_if_active(self) -> bool:
         """
@@ -1,18 +1,24 @@
-import pygame
+class Ship:
+    """
+    A class to manage the ship.
 
+    被击中后的状态按模拟步数推进：'respawning' 暂停等待重生（不显示、不能移动），
+    之后 'invulnerable' 无敌一段时间（闪烁、不会被击中），再回到 'active'。
+    """
 
-class Ship:
-    """A class to manage the ship."""
+    STATES = ('active', 'respawning', 'invulnerable')
 
     def __init__(self, ai_game):
         """Initialize the ship and set its starting position."""
-        self.screen = ai_game.screen
         self.settings = ai_game.settings
-        self.screen_rect = ai_game.screen.get_rect()
+        self.screen_rect = ai_game.screen_rect
 
-        # Load the ship image and get its rect.
-        self.image = pygame.image.load('images/ship.bmp')
+        # Load the ship image (shared, cached) and get its rect.
+        self.image = ai_game.assets.image('ship.bmp')
         self.rect = self.image.get_rect()
+        # 像素级碰撞用的掩码（由 Assets 缓存）
+        self.mask = ai_game.assets.mask('ship.bmp')
+        self.mask_table = ai_game.assets.mask_table('ship.bmp')
 
         # Start each new ship at the bottom center of the screen.
         self.rect.midbottom = self.screen_rect.midbottom
@@ -20,6 +26,9 @@ class Ship:
         # 使用 float 存储飞船的精确位置（x 和 y）
         self.x = float(self.rect.x)
         self.y = float(self.rect.y)
+        # 上一步的位置，用于绘制时插值
+        self.prev_x = self.x
+        self.prev_y = self.y
 
         # Movement flags; start with a ship that's not moving.
         self.moving_right = False
@@ -27,19 +36,72 @@ class Ship:
         self.moving_up = False
         self.moving_down = False
 
-    def update(self):
-        """Update the ship's position based on movement flags."""
+        # 当前状态和这个状态剩余的步数
+        self.state = 'active'
+        self.state_ticks = 0
+
+    @property
+    def respawning(self):
+        return self.state == 'respawning'
+
+    @property
+    def vulnerable(self):
+        """只有正常状态下才会被外星人和子弹击中。"""
+        return self.state == 'active'
+
+    @property
+    def visible(self):
+        """重生暂停时不显示；无敌时按 ship_blink_interval 闪烁。"""
+        if self.state == 'active':
+            return True
+        if self.state == 'respawning':
+            return False
+        interval = max(1, round(self.settings.ship_blink_interval * self.settings.tick_rate))
+        return (self.state_ticks // interval) % 2 == 0
+
+    def _seconds_to_ticks(self, seconds):
+        return max(1, round(seconds * self.settings.tick_rate))
+
+    def start_respawn(self):
+        """被击中：进入重生暂停。"""
+        self.state = 'respawning'
+        self.state_ticks = self._seconds_to_ticks(self.settings.ship_respawn_seconds)
+
+    def tick_state(self):
+        """
+        状态计时前进一步。暂停结束时飞船回到底部中央、进入无敌时间，并返回 True。
+        """
+        if self.state == 'active':
+            return False
+        self.state_ticks -= 1
+        if self.state_ticks > 0:
+            return False
+
+        if self.state == 'respawning':
+            self.center_ship()
+            self.state = 'invulnerable'
+            self.state_ticks = self._seconds_to_ticks(self.settings.ship_invulnerable_seconds)
+            return True
+        self.state = 'active'
+        return False
+
+    def update(self, dt):
+        """Update the ship's position based on movement flags over dt seconds."""
+        self.prev_x = self.x
+        self.prev_y = self.y
+        step = self.settings.ship_speed * dt
+
         # 水平移动
         if self.moving_right and self.rect.right < self.screen_rect.right:
-            self.x += self.settings.ship_speed
+            self.x += step
         if self.moving_left and self.rect.left > 0:
-            self.x -= self.settings.ship_speed
+            self.x -= step
 
         # 垂直移动（W/S）
         if self.moving_up and self.rect.top > 0:
-            self.y -= self.settings.ship_speed
+            self.y -= step
         if self.moving_down and self.rect.bottom < self.screen_rect.bottom:
-            self.y += self.settings.ship_speed
+            self.y += step
 
         # 更新 rect
         self.rect.x = int(self.x)
@@ -50,7 +112,17 @@ class Ship:
         self.rect.midbottom = self.screen_rect.midbottom
         self.x = float(self.rect.x)
         self.y = float(self.rect.y)
+        self.prev_x = self.x
+        self.prev_y = self.y
+
+    def draw_position(self, alpha=1.0):
+        """绘制位置（左上角），在最近两步之间按 alpha 插值。"""
+        if alpha == 1.0:
+            return self.rect.topleft
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        return (int(x), int(y))
 
-    def blitme(self):
-        """Draw the ship at its current location."""
-        self.screen.blit(self.image, self.rect)
+    def blitme(self, screen, alpha=1.0):
+        """Draw the ship, interpolated between the last two ticks; return the area drawn."""
+        return screen.blit(self.image, self.draw_position(alpha))
@@ -0,0 +1,463 @@
+import hashlib
+import random
+import struct
+
+import numpy as np
+import pygame
+
+from settings import Settings
+from assets import Assets
+from ship import Ship
+from bullet import Bullet
+from alien_swarm import AlienSwarm
+from game_stats import GameStats
+from spatial_hash import rects_to_array
+from pool import EntityPool
+from projectiles import ATTACKS, ProjectileStore, PatternEmitter
+from fire_scheduler import FireScheduler
+from narrowphase import CollisionCounters, rects_overlap_mask
+from shield import Shield   # 独立护盾类
+
+
+class Inputs:
+    """一帧的玩家输入：持续按住的方向键 + 本帧触发的一次性动作。"""
+
+    __slots__ = ('moving_right', 'moving_left', 'moving_up', 'moving_down',
+                 'fire', 'shield')
+
+    def __init__(self, moving_right=False, moving_left=False,
+                 moving_up=False, moving_down=False, fire=False, shield=False):
+        self.moving_right = moving_right
+        self.moving_left = moving_left
+        self.moving_up = moving_up
+        self.moving_down = moving_down
+        # 一次性动作：发射子弹 / 启动护盾
+        self.fire = fire
+        self.shield = shield
+
+    def clear_actions(self):
+        """清除一次性动作（每次 step 之后调用），方向键状态保留。"""
+        self.fire = False
+        self.shield = False
+
+
+class Limits:
+    """
+    运行中可以调整的玩法上限，创建模拟时从 Settings 复制。
+
+    负载调节降级时只修改这里，Settings 保持玩家配置的原值
+    （存档和成绩记录中的设置哈希也就不会因为降级而改变）。
+    """
+
+    __slots__ = ('max_aliens', 'alien_spawn_rate', 'alien_bullets_allowed')
+
+    def __init__(self, settings):
+        self.max_aliens = settings.max_aliens
+        self.alien_spawn_rate = settings.alien_spawn_rate
+        self.alien_bullets_allowed = settings.alien_bullets_allowed
+
+
+class GameSimulation:
+    """
+    不依赖窗口的游戏逻辑核心：每调用一次 step() 前进一个固定步长（1 / tick_rate 秒）。
+
+    不创建窗口、不调用 clock.tick()、不读取 pygame.time.get_ticks()、不退出进程，
+    因此可以在没有显示器的机器上以远超实时的速度运行。
+    绘制、声音、存档由外层（AlienInvasion）根据 step() 返回的事件处理。
+    """
+
+    def __init__(self, settings=None, assets=None, seed=None):
+        """
+        :param settings: 游戏设置，默认新建 Settings()
+        :param assets: 图片缓存，可与窗口层共享；默认新建 Assets()
+        :param seed: 随机种子；为 None 时随机选一个（记录在 self.seed，可用于复现）
+        """
+        self.settings = settings or Settings()
+        self.assets = assets or Assets()
+
+        # 本局所有随机决定（外星人位置 / 速度 / 转向、刷怪、开火）都来自这一个随机数流
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.screen_rect = pygame.Rect(
+            0, 0, self.settings.screen_width, self.settings.screen_height
+        )
+        # 外星人数量 / 刷怪频率 / 外星人子弹的当前上限（负载调节会修改）
+        self.limits = Limits(self.settings)
+
+        # 统计信息
+        self.stats = GameStats(self)
+
+        self.ship = Ship(self)
+        self.bullets = EntityPool(Bullet)            # 玩家子弹（对象池）
+        self.aliens = AlienSwarm(self)               # 外星人（NumPy 数组）
+        self.alien_bullets = ProjectileStore(self.settings, self.screen_rect)  # 外星人子弹（NumPy 数组）
+        self.emitter = PatternEmitter(self.settings)  # 按攻击类型生成子弹
+        # 碰撞计数：矩形粗筛候选 / 像素判定 / 确认碰撞
+        self.collisions = CollisionCounters()
+        # 外星人的下次开火时间（最小堆），每步只处理到时间的外星人
+        self.fire_scheduler = FireScheduler(self.rng, self.settings.tick_rate)
+
+        # 已经模拟的帧数；游戏内时间完全由帧数推算
+        self.ticks = 0
+
+        # ---------- 护盾：由 Shield 类管理 ----------
+        self.shield = Shield(
+            max_charges=self.settings.shield_max_charges,         # 默认最多 2 次
+            cooldown_ms=self.settings.shield_cooldown_ms,         # 默认每 30 秒恢复一次
+            duration_ms=self.settings.shield_duration_ms,         # 默认持续 15 秒
+            initial_charges=self.settings.shield_initial_charges, # 默认初始 1 次
+        )
+
+        # 本帧发生的事件 (类型, 数据)，供外层播放音效、存档等
+        self.events = []
+
+        # 分阶段计时（FrameProfiler），为 None 或未启用时不打点
+        self.profiler = None
+        # 运行指标（metrics.GameMetrics），为 None 时不计数
+        self.metrics = None
+
+        # 初始生成一些随机外星人
+        self._create_initial_aliens()
+
+    def entity_stats(self):
+        """子弹对象池、外星人槽位池和外星人子弹数组的统计信息，以及碰撞计数。"""
+        return {
+            'bullets': self.bullets.stats(),
+            'aliens': self.aliens.stats(),
+            'alien_bullets': self.alien_bullets.stats(),
+            'collisions': self.collisions.as_dict(),
+        }
+
+    def state_hash(self):
+        """
+        当前游戏状态的哈希（飞船、外星人、子弹、护盾、得分和生命），
+        用于检查回放是否与录制时完全一致。最高分来自存档，不计入。
+        """
+        ship, stats, shield = self.ship, self.stats, self.shield
+        h = hashlib.blake2b(digest_size=16)
+        start = -1 if shield.start_time is None else shield.start_time
+        refresh = -1 if shield.last_refresh_time is None else shield.last_refresh_time
+        h.update(struct.pack(
+            '<qddqq?qqq?Bq', self.ticks, ship.x, ship.y, stats.score, stats.ships_left,
+            stats.game_active, shield.charges, start, refresh, shield.active,
+            ship.STATES.index(ship.state), ship.state_ticks,
+        ))
+        h.update(self.aliens.state_bytes())
+        h.update(struct.pack('<q', len(self.bullets)))
+        for bullet in self.bullets:
+            h.update(struct.pack('<id', bullet.rect.x, bullet.y))
+        h.update(self.alien_bullets.state_bytes())
+        return h.hexdigest()
+
+    @property
+    def now_ms(self):
+        """游戏内时间（毫秒），由已模拟的步数推算。"""
+        return self.ticks * 1000 // self.settings.tick_rate
+
+    # ---------- 单帧推进 ----------
+
+    def step(self, inputs=None):
+        """
+        按给定输入推进一个固定步长，返回本步事件列表。
+
+        事件类型：'fire'、'aliens_killed'（数据为击落数量）、
+        'explosion'（数据为被消灭的外星人中心点的 (n, 2) 数组）、
+        'ship_hit'（数据为剩余生命）、'game_over'（数据为最终得分）。
+        """
+        self.events = []
+
+        profiler = self.profiler
+        lap = profiler.lap if profiler is not None and profiler.enabled else None
+
+        if inputs is not None:
+            self._apply_inputs(inputs)
+        if lap:
+            lap('inputs')
+
+        if self.stats.game_active and self.ship.respawning:
+            # 重生暂停：世界静止，只逐步清场
+            self._update_respawn()
+        elif self.stats.game_active:
+            self.ship.update(self.settings.tick_seconds)
+            self.ship.tick_state()
+            if lap:
+                lap('ship')
+            self._update_bullets()
+            if lap:
+                lap('bullets')
+            self._update_aliens()
+            if lap:
+                lap('aliens')
+            self._update_alien_bullets()
+            if lap:
+                lap('alien_bullets')
+
+        if self.stats.game_active:
+            # 每帧更新时间并交给 Shield 管理护盾（重生暂停期间也照常计时）
+            self.shield.update(self.now_ms)
+            if lap:
+                lap('shield')
+
+        self.ticks += 1
+        return self.events
+
+    def _apply_inputs(self, inputs):
+        """把输入同步到飞船移动标志，并执行一次性动作。"""
+        self.ship.moving_right = inputs.moving_right
+        self.ship.moving_left = inputs.moving_left
+        self.ship.moving_up = inputs.moving_up
+        self.ship.moving_down = inputs.moving_down
+
+        if inputs.fire:
+            self._fire_bullet()
+        if inputs.shield and self.stats.game_active and not self.ship.respawning:
+            # 激活护盾（交给 Shield 判断次数和冷却）
+            if self.shield.activate(self.now_ms) and self.metrics is not None:
+                self.metrics.shield_activations.inc()
+
+    # ---------- 玩家子弹相关 ----------
+
+    def _fire_bullet(self):
+        """Create a new bullet and add it to the bullets group."""
+        if (len(self.bullets) < self.settings.bullets_allowed and self.stats.game_active
+                and not self.ship.respawning):
+            self.bullets.acquire(self)
+            self.events.append(('fire', None))
+            if self.metrics is not None:
+                self.metrics.shots_fired.inc()
+
+    def _update_bullets(self):
+        """Update position of bullets and get rid of old bullets."""
+        # 飞出屏幕的子弹在 update 中失效，并被原地回收（不复制列表）
+        self.bullets.update(self.settings.tick_seconds)
+
+        self._check_bullet_alien_collisions()
+
+    def _check_bullet_alien_collisions(self):
+        """Respond to bullet-alien collisions."""
+        bullets = self.bullets.sprites()
+        if not bullets or not self.aliens:
+            return
+
+        # 网格粗筛得到所有 (子弹, 外星人) 重叠对
+        rects = rects_to_array([bullet.rect for bullet in bullets])
+        bullet_ids, alien_ids = self.aliens.collide_rects(rects)
+        if alien_ids.size:
+            # 只对矩形重叠的候选做像素判定
+            aliens = self.aliens
+            keep = self._narrowphase(aliens.mask_table, rects[bullet_ids],
+                                     aliens.ix[alien_ids], aliens.iy[alien_ids])
+            bullet_ids, alien_ids = bullet_ids[keep], alien_ids[keep]
+        if not alien_ids.size:
+            return
+
+        # 与 groupcollide(bullets, aliens, True, True) 结果相同：按子弹顺序处理，
+        # 每个外星人归最先碰到它的子弹；至少消灭了一个外星人的子弹才会消失
+        order = np.lexsort((alien_ids, bullet_ids))
+        bullet_ids, alien_ids = bullet_ids[order], alien_ids[order]
+        alien_ids, first = np.unique(alien_ids, return_index=True)
+        self._explode(alien_ids)
+        killed = self.aliens.kill(alien_ids)
+        for index in np.unique(bullet_ids[first]).tolist():
+            bullets[index].kill()
+        self.bullets.collect()
+
+        if killed:
+            self.stats.score += self.settings.alien_points * killed
+            self.events.append(('aliens_killed', killed))
+            if self.metrics is not None:
+                self.metrics.aliens_killed.inc(killed)
+
+            if self.stats.score > self.stats.high_score:
+                self.stats.high_score = self.stats.score
+
+    # ---------- 外星人相关 ----------
+
+    def _create_initial_aliens(self):
+        """初始生成一些随机外星人。"""
+        for _ in range(5):
+            self._create_random_alien()
+
+    def _create_random_alien(self):
+        """Create an alien and place it randomly，并安排它的第一次开火。"""
+        index = self.aliens.spawn()
+        self.fire_scheduler.schedule(index, self.ticks, self.settings.alien_fire_rate)
+        if self.metrics is not None:
+            self.metrics.aliens_spawned.inc()
+
+    def _update_aliens(self):
+        """Update the positions of all aliens，随机生成并检测碰撞。"""
+        self.aliens.update(self.settings.tick_seconds)
+
+        # 随机刷怪
+        limits = self.limits
+        if len(self.aliens) < limits.max_aliens:
+            if self.rng.random() < self.settings.tick_chance(limits.alien_spawn_rate):
+                self._create_random_alien()
+
+        # 只在“碰到飞船”时才可能扣命；到达底部不再扣命
+        self._check_aliens_bottom_or_hit_ship()
+
+        # 外星人从一开始就会发射子弹
+        self._alien_fire_bullets()
+
+    def _explode(self, indices):
+        """记录即将被消灭的外星人的中心点（'explosion' 事件，供外层画爆炸效果）。"""
+        aliens = self.aliens
+        centers = np.column_stack((aliens.ix[indices] + aliens.width // 2,
+                                   aliens.iy[indices] + aliens.height // 2))
+        self.events.append(('explosion', centers))
+
+    def _check_aliens_bottom_or_hit_ship(self):
+        """
+        检查外星人是否撞到飞船或到达屏幕底部。
+
+        - 撞到飞船：先让护盾尝试吃掉伤害，只在护盾失败时扣命。
+        - 到达屏幕底部：只删除外星人，不扣命。
+        """
+        # 与飞船碰撞（无敌时外星人直接穿过飞船）
+        colliding_aliens = np.zeros(0, dtype=np.intp)
+        if self.ship.vulnerable:
+            colliding_aliens = self._ship_alien_narrowphase(
+                self.aliens.collide_rect(self.ship.rect)
+            )
+        if colliding_aliens.size:
+            self._explode(colliding_aliens)
+            killed = self.aliens.kill(colliding_aliens)
+            if self.metrics is not None:
+                self.metrics.aliens_killed.inc(killed)
+            self._damage_ship()
+
+        # 到达底部：只删除外星人，不扣命
+        self.aliens.kill(self.aliens.below(self.screen_rect.bottom))
+
+    # ---------- 外星人子弹相关 ----------
+
+    def _alien_fire_bullets(self):
+        """
+        外星人随机发射子弹：从一开始就会射击。
+
+        开火时间已到的外星人由 FireScheduler 给出，数量不超过剩余的子弹上限；
+        同一攻击类型的外星人由 PatternEmitter 一次批量生成子弹，总数超出上限的部分丢弃。
+        """
+        aliens = self.aliens
+        limit = self.limits.alien_bullets_allowed
+        room = limit - len(self.alien_bullets)
+        firing = self.fire_scheduler.pop_due(
+            self.ticks, aliens.alive, room, self.settings.alien_fire_rate
+        )
+        if not firing:
+            return
+        firing = np.array(firing, dtype=np.intp)
+        origins = aliens.midbottoms(firing)
+        attacks = aliens.attack[firing]
+        target = self.ship.rect.center
+        seconds = self.ticks / self.settings.tick_rate
+        # 按开火顺序中各类型第一次出现的先后处理，保证结果可复现
+        fired = 0
+        for attack in dict.fromkeys(attacks.tolist()):
+            fired += self.emitter.emit(self.alien_bullets, ATTACKS[attack],
+                                       origins[attacks == attack], target, seconds, limit)
+        if self.metrics is not None:
+            self.metrics.alien_shots.inc(fired)
+
+    def _update_alien_bullets(self):
+        """更新外星人子弹位置并检测与飞船的碰撞。"""
+        # 移动和飞出屏幕的剔除都是整批数组运算
+        bullets = self.alien_bullets
+        bullets.update(self.settings.tick_seconds)
+
+        # 一对多：飞船与所有外星人子弹整体向量化比较
+        if not bullets or not self.ship.vulnerable:
+            return
+        ship = self.ship
+        colliding_bullets = bullets.collide_rect(ship.rect)
+        if not colliding_bullets.size:
+            return
+        keep = self._narrowphase(ship.mask_table, bullets.rects(colliding_bullets),
+                                 ship.rect.x, ship.rect.y)
+        colliding_bullets = colliding_bullets[keep]
+        bullets.remove(colliding_bullets)
+        if colliding_bullets.size:
+            self._damage_ship()
+
+    # ---------- 像素级判定 ----------
+
+    def _narrowphase(self, table, rects, x, y):
+        """
+        矩形粗筛之后的像素判定：实心矩形 rects 与放在 (x, y) 处的图片掩码是否重叠，
+        返回布尔数组。关闭 pixel_perfect_collisions 时全部算作命中。
+        """
+        candidates = len(rects)
+        if not self.settings.pixel_perfect_collisions:
+            self.collisions.add(candidates, 0, candidates)
+            return np.ones(candidates, dtype=bool)
+        keep = rects_overlap_mask(table, rects, x, y)
+        self.collisions.add(candidates, candidates, int(np.count_nonzero(keep)))
+        return keep
+
+    def _ship_alien_narrowphase(self, indices):
+        """从与飞船矩形重叠的外星人中，留下与飞船不透明像素真正重叠的那些。"""
+        candidates = indices.size
+        if not candidates or not self.settings.pixel_perfect_collisions:
+            self.collisions.add(candidates, 0, candidates)
+            return indices
+
+        ship_mask, ship_rect = self.ship.mask, self.ship.rect
+        alien_mask, aliens = self.aliens.mask, self.aliens
+        keep = [
+            ship_mask.overlap(alien_mask, (int(aliens.ix[i]) - ship_rect.x,
+                                           int(aliens.iy[i]) - ship_rect.y)) is not None
+            for i in indices.tolist()
+        ]
+        indices = indices[np.array(keep, dtype=bool)]
+        self.collisions.add(candidates, candidates, indices.size)
+        return indices
+
+    # ---------- 飞船被击中 / 重生 / GAME OVER ----------
+
+    def _damage_ship(self):
+        """飞船被外星人或子弹碰到：先尝试让护盾吃掉伤害（成功则不扣命），否则扣命。"""
+        if self.shield.consume_if_active():
+            if self.metrics is not None:
+                self.metrics.shield_blocks.inc()
+        else:
+            self._ship_hit()
+
+    def _ship_hit(self):
+        """
+        处理飞船被外星人或子弹击中（生命值 -1，生命为 0 则游戏结束）。
+        注意：这里已经确保是“护盾没挡住”的真正伤害。
+
+        还有生命时飞船进入重生暂停，清场和重新生成外星人在之后的几步里完成。
+        """
+        if not self.stats.game_active or not self.ship.vulnerable:
+            return
+
+        if self.metrics is not None:
+            self.metrics.ship_hits.inc()
+        if self.stats.ships_left > 1:
+            self.stats.ships_left -= 1
+            self.ship.start_respawn()
+            self.events.append(('ship_hit', self.stats.ships_left))
+        else:
+            self.stats.ships_left = 0
+            self.stats.game_active = False
+            self.events.append(('game_over', self.stats.score))
+            if self.metrics is not None:
+                self.metrics.games_over.inc()
+
+    def _update_respawn(self):
+        """
+        重生暂停中的一步：场上的外星人和子弹在暂停期间分几步回收进对象池，
+        避免在同一帧里全部清空再重建；暂停结束时飞船回到底部中央并开始无敌，
+        同时生成初始外星人。
+        """
+        remaining = max(self.ship.state_ticks, 1)
+        for group in (self.aliens, self.bullets, self.alien_bullets):
+            group.release(-(-len(group) // remaining))
+
+        if self.ship.tick_state():
+            self._create_initial_aliens()
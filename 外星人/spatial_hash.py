@@ -0,0 +1,173 @@
+import numpy as np
+
+
+# 查询数 × 实体数不超过这个值时直接广播比较，不建网格
+BRUTE_FORCE_PAIRS = 4096
+
+
+def rects_to_array(rects):
+    """把一组 Rect 转成 (n, 4) 的 int64 数组：x, y, w, h。"""
+    if not rects:
+        return np.zeros((0, 4), dtype=np.int64)
+    return np.array([(r.x, r.y, r.width, r.height) for r in rects], dtype=np.int64)
+
+
+def overlapping(rect, x, y, w, h):
+    """
+    一对多的快速检测：返回与 rect 重叠（与 Rect.colliderect 规则相同）的布尔掩码。
+
+    只有一个查询矩形时，整体向量化扫描一遍比先建网格更省时。
+    """
+    return (
+        (x < rect.right) & (x + w > rect.left)
+        & (y < rect.bottom) & (y + h > rect.top)
+    )
+
+
+def brute_force_pairs(rects, x, y, w, h, alive):
+    """
+    多对多的直接比较：(查询数 × 实体数) 很小时，广播比较一次比建网格更快。
+    返回值与 SpatialHash.query_pairs 相同。
+    """
+    qx, qy = rects[:, 0:1], rects[:, 1:2]
+    qw, qh = rects[:, 2:3], rects[:, 3:4]
+    hit = (
+        alive
+        & (x < qx + qw) & (x + w > qx)
+        & (y < qy + qh) & (y + h > qy)
+    )
+    return np.nonzero(hit)
+
+
+class SpatialHash:
+    """
+    均匀网格碰撞粗筛（spatial hash）。
+
+    每个实体只按左上角放进一个格子；查询时把查询矩形向左上方扩大
+    “最大实体尺寸”，只检查覆盖到的格子里的候选，再做精确的矩形重叠判断。
+    建表和批量查询都用 NumPy 完成，代价与实体数量接近线性。
+    """
+
+    def __init__(self, width, height, cell_size=64):
+        """
+        :param width: 世界宽度（像素）
+        :param height: 世界高度（像素）
+        :param cell_size: 格子边长；应不小于常见实体尺寸
+        """
+        self.cell_size = cell_size
+        self.cols = max(1, -(-width // cell_size))
+        self.rows = max(1, -(-height // cell_size))
+
+        self.x = self.y = self.w = self.h = None
+        self.alive = None
+        self.max_w = self.max_h = 0
+
+        # 按格子排序后的实体下标，以及每个格子在其中的起点和数量
+        self.order = np.zeros(0, dtype=np.intp)
+        self.starts = np.zeros(self.cols * self.rows, dtype=np.intp)
+        self.counts = np.zeros(self.cols * self.rows, dtype=np.intp)
+
+    def build(self, x, y, w, h, alive):
+        """
+        用实体的整数坐标重建网格。
+
+        :param x, y: 实体左上角坐标数组
+        :param w, h: 实体宽高（标量或数组）
+        :param alive: 布尔数组；查询时会再次检查，所以建表后被删除的实体不会命中
+        """
+        self.x, self.y, self.w, self.h, self.alive = x, y, w, h, alive
+
+        indices = np.flatnonzero(alive)
+        self.max_w = int(np.max(w)) if np.size(w) else 0
+        self.max_h = int(np.max(h)) if np.size(h) else 0
+
+        cells = self._cells(x[indices], y[indices])
+        sort = np.argsort(cells, kind='stable')
+        self.order = indices[sort]
+        self.counts = np.bincount(cells, minlength=self.cols * self.rows)
+        self.starts = np.cumsum(self.counts) - self.counts
+
+    def _cells(self, x, y):
+        """左上角坐标所在格子的编号（超出世界的坐标归入边缘格子）。"""
+        cx = np.clip(x // self.cell_size, 0, self.cols - 1)
+        cy = np.clip(y // self.cell_size, 0, self.rows - 1)
+        return cy * self.cols + cx
+
+    def _cell_ranges(self, qx, qy, qw, qh):
+        """每个查询矩形需要检查的格子范围（含两端）。"""
+        cs = self.cell_size
+        c0x = np.clip((qx - self.max_w) // cs, 0, self.cols - 1)
+        c1x = np.clip((qx + qw - 1) // cs, 0, self.cols - 1)
+        c0y = np.clip((qy - self.max_h) // cs, 0, self.rows - 1)
+        c1y = np.clip((qy + qh - 1) // cs, 0, self.rows - 1)
+        return c0x, c1x, c0y, c1y
+
+    def query_pairs(self, rects):
+        """
+        多对多查询：rects 为 (n, 4) 数组，返回 (查询下标, 实体下标) 两个数组，
+        每一对都真实重叠且实体仍然存活。
+        """
+        if not len(rects) or not self.order.size:
+            empty = np.zeros(0, dtype=np.intp)
+            return empty, empty
+
+        qx, qy, qw, qh = rects[:, 0], rects[:, 1], rects[:, 2], rects[:, 3]
+        c0x, c1x, c0y, c1y = self._cell_ranges(qx, qy, qw, qh)
+        span_x = c1x - c0x + 1
+        span_y = c1y - c0y + 1
+
+        q_parts, e_parts = [], []
+        for dy in range(int(span_y.max())):
+            for dx in range(int(span_x.max())):
+                q = np.flatnonzero((dx < span_x) & (dy < span_y))
+                cells = (c0y[q] + dy) * self.cols + c0x[q] + dx
+                counts = self.counts[cells]
+                total = int(counts.sum())
+                if not total:
+                    continue
+                # 展开成候选对：查询 q 与格子里的每个实体
+                first = np.repeat(self.starts[cells], counts)
+                offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+                q_parts.append(np.repeat(q, counts))
+                e_parts.append(self.order[first + offsets])
+
+        if not q_parts:
+            empty = np.zeros(0, dtype=np.intp)
+            return empty, empty
+
+        qi = np.concatenate(q_parts)
+        ei = np.concatenate(e_parts)
+        w = self.w if np.ndim(self.w) == 0 else self.w[ei]
+        h = self.h if np.ndim(self.h) == 0 else self.h[ei]
+        ex, ey = self.x[ei], self.y[ei]
+        hit = (
+            self.alive[ei]
+            & (ex < qx[qi] + qw[qi]) & (ex + w > qx[qi])
+            & (ey < qy[qi] + qh[qi]) & (ey + h > qy[qi])
+        )
+        return qi[hit], ei[hit]
+
+    def query_rect(self, rect):
+        """一对多查询：返回与 rect 重叠的存活实体下标。"""
+        if not self.order.size:
+            return np.zeros(0, dtype=np.intp)
+
+        c0x, c1x, c0y, c1y = (int(v) for v in self._cell_ranges(
+            rect.x, rect.y, rect.width, rect.height))
+        parts = []
+        for cy in range(c0y, c1y + 1):
+            # 同一行里相邻的格子在 order 中也是连续的，可以一次切片
+            first = cy * self.cols + c0x
+            last = cy * self.cols + c1x
+            start = self.starts[first]
+            stop = self.starts[last] + self.counts[last]
+            if stop > start:
+                parts.append(self.order[start:stop])
+        if not parts:
+            return np.zeros(0, dtype=np.intp)
+
+        ei = np.concatenate(parts)
+        w = self.w if np.ndim(self.w) == 0 else self.w[ei]
+        h = self.h if np.ndim(self.h) == 0 else self.h[ei]
+        hit = self.alive[ei] & overlapping(rect, self.x[ei], self.y[ei], w, h)
+        return ei[hit]
@@ -0,0 +1,31 @@
+class SpriteBatch:
+    """
+    一个绘制层的 (图片, 位置) 列表，flush() 时用一次 Surface.blits 全部画出。
+
+    每一类物体按顺序整段加入（同一张图片的条目相邻），所以批内已经按图片分好组，
+    不需要再排序；不同的层之间（例如护盾圆环前后）各自 flush，保持遮挡顺序。
+    """
+
+    def __init__(self):
+        self.items = []
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, image, position):
+        self.items.append((image, position))
+
+    def add_many(self, image, positions):
+        """同一张图片画在多个位置。"""
+        self.items.extend([(image, position) for position in positions])
+
+    def extend(self, items):
+        self.items.extend(items)
+
+    def flush(self, surface):
+        """把收集的条目一次画到 surface 上，清空列表，返回画过的区域列表（与加入顺序相同）。"""
+        if not self.items:
+            return []
+        rects = surface.blits(self.items)
+        self.items.clear()
+        return rects
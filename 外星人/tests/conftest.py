@@ -0,0 +1,8 @@
+"""测试公共设置：游戏模块是 外星人/ 下的平铺模块，pygame 使用无窗口驱动。"""
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
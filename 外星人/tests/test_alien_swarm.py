@@ -0,0 +1,73 @@
+"""AlienSwarm 的批量更新与逐个外星人按原来规则更新的结果完全相同。"""
+import numpy as np
+import pytest
+
+from simulation import GameSimulation
+
+
+def _copy_rng(rng):
+    twin = np.random.Generator(type(rng.bit_generator)())
+    twin.bit_generator.state = rng.bit_generator.state
+    return twin
+
+
+def _reference_update(aliens, state, rng, dt):
+    """
+    逐个外星人更新（原来 Alien.update() 的规则，速度按秒计）。
+    随机数按批量实现的顺序预先取出：所有槽位的反向判定、所有槽位的变速判定、变速倍数。
+    """
+    settings = aliens.settings
+    screen_width = aliens.screen_rect.width
+    n = len(state)
+    flips = rng.random(n) < settings.tick_chance(settings.alien_flip_rate)
+    jitters = rng.random(n) < settings.tick_chance(settings.alien_jitter_rate)
+    factors = iter(rng.choice((0.5, 1.0, 1.5), size=int(jitters.sum())) if jitters.any() else ())
+
+    for i, alien in enumerate(state):
+        alien['x'] += alien['vx'] * dt
+        alien['y'] += alien['vy'] * dt
+        # 与左右边缘碰撞就反弹
+        if alien['x'] <= 0 or alien['x'] + aliens.width >= screen_width:
+            alien['vx'] *= -1
+        # 偶尔随机反向、随机变速
+        if flips[i]:
+            alien['vx'] *= -1
+        if jitters[i]:
+            alien['vy'] *= next(factors)
+        alien['ix'] = int(alien['x'])
+        alien['iy'] = int(alien['y'])
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_batched_update_matches_per_alien_rules(seed):
+    sim = GameSimulation(seed=seed)
+    settings = sim.settings
+    # 提高反向和变速的频率，让每一步都有事件发生
+    settings.alien_flip_rate = settings.alien_jitter_rate = 20.0
+    aliens = sim.aliens
+    for _ in range(40):
+        aliens.spawn()
+    # 一部分贴在左右边缘上，一部分已被消灭（仍在 [:_size] 中参与更新）
+    aliens.x[:5] = 0.0
+    aliens.x[5:10] = sim.screen_rect.width - aliens.width
+    aliens.kill(np.arange(30, 40, 3))
+
+    n = aliens._size
+    state = [
+        {name: getattr(aliens, name)[i].item() for name in ('x', 'y', 'vx', 'vy', 'ix', 'iy')}
+        for i in range(n)
+    ]
+    rng = _copy_rng(aliens.rng)
+    dt = settings.tick_seconds
+
+    for _ in range(300):
+        before = [(alien['x'], alien['y']) for alien in state]
+        aliens.update(dt)
+        _reference_update(aliens, state, rng, dt)
+        for name in ('x', 'y', 'vx', 'vy', 'ix', 'iy'):
+            assert getattr(aliens, name)[:n].tolist() == [alien[name] for alien in state]
+        # 上一步的位置（绘制插值用）
+        assert list(zip(aliens.prev_x[:n].tolist(), aliens.prev_y[:n].tolist())) == before
+
+    # 两边消耗的随机数一样多
+    assert aliens.rng.bit_generator.state == rng.bit_generator.state
@@ -0,0 +1,13 @@
+"""批量模拟：每局的时间上限按覆盖之后的设置换算成步数。"""
+import pytest
+
+from batch_sim import run_game
+
+
+@pytest.mark.parametrize('tick_rate', [60, 120])
+def test_time_limit_follows_overridden_tick_rate(tick_rate):
+    # 不再刷怪、外星人不开火：保证这一局能活到时间上限
+    overrides = {'tick_rate': tick_rate, 'alien_fire_rate': 0.0, 'max_aliens': 0}
+    config_id, seed, survival, _, _, _ = run_game((3, overrides, 11, 2.0))
+    assert (config_id, seed) == (3, 11)
+    assert survival == pytest.approx(2.0)
@@ -0,0 +1,52 @@
+"""画面录制：导出的 PNG 必须是不透明的（屏幕没有 alpha 通道）。"""
+import os
+
+import pygame
+import pytest
+
+from capture import FrameCapture, main, read_raw
+
+COLOR = (56, 100, 200)
+
+
+@pytest.fixture
+def screen():
+    # 与显示器 Surface 相同的 32 位 XRGB 格式（没有 alpha 通道）
+    surface = pygame.Surface((37, 21), 0, 32)
+    assert surface.get_masks()[3] == 0
+    surface.fill(COLOR)
+    surface.fill((255, 255, 255), (0, 0, 5, 5))
+    return surface
+
+
+def _record(screen, directory, fmt):
+    capture = FrameCapture(screen, str(directory), fmt, buffers=2)
+    assert capture.capture(screen, tick=3)
+    capture.close()
+    assert capture.written == 1, capture.last_error
+    return capture
+
+
+def _assert_opaque(path):
+    image = pygame.image.load(path)
+    assert tuple(image.get_at((20, 10))) == COLOR + (255,)
+    assert tuple(image.get_at((1, 1))) == (255, 255, 255, 255)
+
+
+def test_raw_frames_convert_to_opaque_png(screen, tmp_path):
+    capture = _record(screen, tmp_path / 'raw', 'raw')
+
+    frames = list(read_raw(capture.path))
+    assert [(frame, tick) for frame, tick, _ in frames] == [(1, 3)]
+    assert tuple(frames[0][2].get_at((20, 10))) == COLOR + (255,)
+
+    out = tmp_path / 'png'
+    assert main([capture.path, '--png', str(out)]) == 0
+    (name,) = os.listdir(out)
+    _assert_opaque(str(out / name))
+
+
+def test_png_writer_output_is_opaque(screen, tmp_path):
+    _record(screen, tmp_path, 'png')
+    (name,) = [n for n in os.listdir(tmp_path) if n.endswith('.png')]
+    _assert_opaque(str(tmp_path / name))
@@ -0,0 +1,67 @@
+"""FireScheduler：每步开火数不超过上限，超出的外星人重新排期；外星人子弹总数恰好封顶。"""
+import numpy as np
+import pytest
+
+from fire_scheduler import FireScheduler
+from settings import Settings
+from simulation import GameSimulation, Inputs
+
+
+def _scheduler(slots, rate, seed=0):
+    scheduler = FireScheduler(np.random.default_rng(seed), 60)
+    for slot in range(slots):
+        scheduler.schedule(slot, 0, rate)
+    return scheduler
+
+
+@pytest.mark.parametrize('limit', [-3, 0, 1, 7, 50, 500])
+def test_pop_due_caps_and_reschedules_overflow(limit):
+    slots, rate = 200, 30.0
+    scheduler = _scheduler(slots, rate)
+    alive = np.ones(slots, dtype=bool)
+    now = 10
+    due = sorted((t, slot) for t, slot, _ in scheduler._heap if t <= now)
+
+    fired = scheduler.pop_due(now, alive, limit, rate)
+
+    # 恰好取前 limit 个（按开火时间），每个槽位最多一次
+    assert fired == [slot for _, slot in due[:max(limit, 0)]]
+    # 没开火的也都重新排期：堆里不再有到期的条目，条目数不变
+    assert len(scheduler) == slots
+    assert all(t > now for t, _, _ in scheduler._heap)
+    assert sorted(slot for _, slot, _ in scheduler._heap) == list(range(slots))
+
+
+def test_dead_and_reused_slots_never_fire():
+    scheduler = _scheduler(10, 1000.0)
+    alive = np.ones(10, dtype=bool)
+    alive[[1, 4]] = False
+    # 槽位 7 被复用：旧条目作废，只剩新条目
+    scheduler.schedule(7, 0, 1000.0)
+
+    fired = scheduler.pop_due(5, alive, 100, 1000.0)
+    assert sorted(fired) == [0, 2, 3, 5, 6, 7, 8, 9]
+    assert sorted(slot for _, slot, _ in scheduler._heap) == [0, 2, 3, 5, 6, 7, 8, 9]
+
+
+def test_zero_rate_never_fires():
+    scheduler = _scheduler(5, 0.0)
+    assert scheduler.pop_due(10 ** 9, np.ones(5, dtype=bool), 10, 0.0) == []
+
+
+@pytest.mark.parametrize('weights', [{'straight': 1.0}, {'spread': 0.5, 'spiral': 0.5}])
+def test_alien_bullets_never_exceed_cap(weights):
+    settings = Settings()
+    settings.alien_fire_rate = 20.0
+    settings.max_aliens = 40
+    settings.alien_spawn_rate = 30.0
+    settings.alien_attack_weights = weights
+    sim = GameSimulation(settings, seed=9)
+    limit = sim.limits.alien_bullets_allowed
+
+    counts = []
+    inputs = Inputs()
+    for _ in range(2000):
+        sim.step(inputs)
+        counts.append(len(sim.alien_bullets))
+    assert max(counts) == limit
@@ -0,0 +1,55 @@
+"""负载调节：降级只修改模拟的当前上限，不修改 Settings（设置哈希保持不变）。"""
+from governor import LEVELS, LoadGovernor
+from rewind import load_state, save_state
+from score_store import settings_hash
+from settings import Settings
+from simulation import GameSimulation
+
+
+def _overload(governor, windows):
+    for _ in range(governor.window * windows):
+        governor.frame(1.0)
+
+
+def test_degrade_changes_limits_not_settings(tmp_path, capsys):
+    settings = Settings()
+    digest = settings_hash(settings)
+    sim = GameSimulation(settings, seed=5)
+    governor = LoadGovernor(settings, sim.limits, window=4)
+
+    _overload(governor, len(LEVELS))
+    assert governor.level == len(LEVELS) - 1
+    assert sim.limits.max_aliens < settings.max_aliens
+    assert sim.limits.alien_spawn_rate < settings.alien_spawn_rate
+    assert sim.limits.alien_bullets_allowed < settings.alien_bullets_allowed
+    assert settings_hash(settings) == digest
+
+    # 降级期间存档、读档不应报告“设置不同”
+    path = str(tmp_path / 'state.bin')
+    save_state(path, sim)
+    capsys.readouterr()
+    load_state(path, GameSimulation(Settings(), seed=0))
+    assert 'Warning' not in capsys.readouterr().out
+
+
+def test_restore_returns_to_base_limits():
+    settings = Settings()
+    sim = GameSimulation(settings, seed=5)
+    governor = LoadGovernor(settings, sim.limits, window=4, restore_windows=2)
+    _overload(governor, len(LEVELS))
+
+    for _ in range(governor.window * governor.restore_windows * len(LEVELS)):
+        governor.frame(0.0)
+    assert governor.level == 0
+    assert (sim.limits.max_aliens, sim.limits.alien_spawn_rate,
+            sim.limits.alien_bullets_allowed) == (
+        settings.max_aliens, settings.alien_spawn_rate, settings.alien_bullets_allowed)
+
+
+def test_recording_keeps_gameplay_limits():
+    settings = Settings()
+    sim = GameSimulation(settings, seed=5)
+    governor = LoadGovernor(settings, sim.limits, window=4, gameplay=False)
+    _overload(governor, len(LEVELS))
+    assert governor.level == 1
+    assert sim.limits.max_aliens == settings.max_aliens
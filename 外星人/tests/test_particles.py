@@ -0,0 +1,39 @@
+"""粒子绘制：32 位快速路径与其他位深的后备路径画出相同的像素。"""
+import numpy as np
+import pygame
+import pytest
+
+from particles import ParticleSystem
+
+
+def _draw(depth, color):
+    surface = pygame.Surface((64, 48), 0, depth)
+    surface.fill((0, 0, 0))
+    particles = ParticleSystem(100, surface.get_rect(), size=2, seed=1)
+    particles.burst([(10, 10), (40, 30)], 20, (30.0, 60.0), (1.0, 1.0),
+                    [surface.map_rgb(color)])
+    particles.update(0.1)
+    rects = particles.draw(surface)
+    return surface, particles, rects
+
+
+@pytest.mark.parametrize('depth', [32, 24, 16])
+def test_draw_writes_every_live_particle(depth):
+    surface, particles, rects = _draw(depth, (250, 200, 40))
+    # 低位深下颜色会被量化：与同一 Surface 映射后再读回的颜色比较
+    color = tuple(surface.unmap_rgb(surface.map_rgb((250, 200, 40))))[:3]
+    alive = np.flatnonzero(particles.life > 0)
+    assert alive.size == 40
+    for x, y in zip(particles.x[alive].astype(int), particles.y[alive].astype(int)):
+        for dx in range(2):
+            for dy in range(2):
+                assert tuple(surface.get_at((x + dx, y + dy)))[:3] == color
+                assert any(rect.collidepoint(x + dx, y + dy) for rect in rects)
+
+
+def test_fast_and_fallback_paths_match():
+    fast, _, _ = _draw(32, (250, 200, 40))
+    slow, _, _ = _draw(16, (250, 200, 40))
+    lit = pygame.surfarray.array3d(fast).any(axis=2)
+    assert lit.any()
+    assert (lit == pygame.surfarray.array3d(slow).any(axis=2)).all()
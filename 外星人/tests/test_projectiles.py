@@ -0,0 +1,89 @@
+"""外星人子弹：默认难度不变、开火图案的方向和子弹上限。"""
+import numpy as np
+import pygame
+
+from projectiles import ATTACKS, PatternEmitter, ProjectileStore
+from settings import Settings
+from simulation import GameSimulation, Inputs
+
+
+def _sim(seed=3, **overrides):
+    settings = Settings()
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    return GameSimulation(settings, seed=seed)
+
+
+def _store(settings):
+    return ProjectileStore(settings, pygame.Rect(0, 0, 1200, 800))
+
+
+def test_defaults_fire_straight_only_within_old_cap():
+    settings = Settings()
+    assert settings.alien_attack_weights == {'straight': 1.0}
+    assert settings.alien_bullets_allowed == 10
+
+    sim = GameSimulation(settings, seed=11)
+    inputs = Inputs()
+    for _ in range(3000):
+        sim.step(inputs)
+        assert len(sim.alien_bullets) <= 10
+        assert not sim.alien_bullets.vx[:len(sim.alien_bullets)].any()
+    assert sim.alien_bullets.emitted
+    assert (sim.aliens.attack[sim.aliens.alive_indices()] == ATTACKS.index('straight')).all()
+
+
+def test_single_attack_type_draws_no_random_numbers():
+    # 只有一种攻击类型时生成外星人不额外抽随机数：位置和速度与攻击类型无关
+    straight = _sim()
+    spiral = _sim(alien_attack_weights={'spiral': 1.0})
+    for sim in (straight, spiral):
+        for _ in range(20):
+            sim.aliens.spawn()
+    for name in ('x', 'y', 'vx', 'vy'):
+        assert np.array_equal(getattr(straight.aliens, name), getattr(spiral.aliens, name))
+    assert (spiral.aliens.attack[:20] == ATTACKS.index('spiral')).all()
+
+    mixed = _sim(alien_attack_weights={'straight': 0.5, 'aimed': 0.5})
+    for _ in range(20):
+        mixed.aliens.spawn()
+    assert len(set(mixed.aliens.attack[:20].tolist())) == 2
+
+
+def test_patterns():
+    settings = Settings()
+    emitter = PatternEmitter(settings)
+    speed = settings.alien_bullet_speed
+    origins = [(300, 100), (600, 200)]
+
+    n = settings.alien_spread_count
+    store = _store(settings)
+    assert emitter.emit(store, 'spread', origins, (0, 0), 0.0, 100) == 2 * n
+    angles = np.degrees(np.arctan2(store.vy[:n], store.vx[:n]))
+    assert np.allclose(angles, 90 + np.linspace(-0.5, 0.5, n) * settings.alien_spread_angle)
+    assert np.allclose(np.hypot(store.vx[:len(store)], store.vy[:len(store)]), speed)
+
+    store = _store(settings)
+    emitter.emit(store, 'aimed', origins, (900, 500), 0.0, 100)
+    for (ox, oy), vx, vy in zip(origins, store.vx, store.vy):
+        assert np.isclose(vx * (500 - oy), vy * (900 - ox))
+        assert vx > 0 and vy > 0
+
+    store = _store(settings)
+    emitter.emit(store, 'straight', origins, (0, 0), 0.0, 100)
+    assert store.ix[:2].tolist() == [300 - settings.bullet_width // 2,
+                                      600 - settings.bullet_width // 2]
+    assert store.vx[:2].tolist() == [0.0, 0.0] and store.vy[:2].tolist() == [speed, speed]
+
+
+def test_emit_respects_limit_and_culls_offscreen():
+    settings = Settings()
+    store = _store(settings)
+    emitter = PatternEmitter(settings)
+    assert emitter.emit(store, 'spiral', [(600, 400)], (0, 0), 0.0, 5) == 5
+    assert emitter.emit(store, 'spiral', [(600, 400)], (0, 0), 0.0, 5) == 0
+    assert len(store) == 5
+
+    for _ in range(int(2000 / settings.alien_bullet_speed / settings.tick_seconds)):
+        store.update(settings.tick_seconds)
+    assert len(store) == 0
@@ -0,0 +1,93 @@
+"""ScoreStore：追加写入、损坏文件尾的修复、日志压缩和排行榜顺序。"""
+import os
+
+import numpy as np
+
+from score_store import MAGIC, RECORD_DTYPE, ScoreStore
+
+
+def _store(tmp_path, **kwargs):
+    # legacy_path 指向不存在的文件：不读取游戏目录下真正的 high_score.json
+    return ScoreStore(str(tmp_path / 'scores.log'),
+                      legacy_path=str(tmp_path / 'missing.json'), **kwargs)
+
+
+def _records(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    assert data.startswith(MAGIC)
+    return np.frombuffer(data, dtype=RECORD_DTYPE, offset=len(MAGIC))
+
+
+def test_record_and_flush_append_to_log(tmp_path):
+    store = _store(tmp_path)
+    store.record(100, 12.5, 7, 99)
+    store.record(300, 30.0, 8, 99)
+    store.flush()
+
+    records = _records(store.path)
+    assert records['score'].tolist() == [100, 300]
+    assert records['seed'].tolist() == [7, 8]
+    assert records['duration'].tolist() == [12.5, 30.0]
+    store.close()
+
+    reopened = _store(tmp_path)
+    assert [entry.score for entry in reopened.leaderboard()] == [300, 100]
+    assert reopened.high_score == 300
+    reopened.close()
+
+
+def test_truncated_tail_is_repaired(tmp_path):
+    store = _store(tmp_path)
+    for score in (50, 150, 250):
+        store.record(score, 1.0, 0, 0)
+    store.close()
+
+    # 模拟写到一半时崩溃：最后一条记录只写了一部分
+    with open(store.path, 'r+b') as f:
+        f.truncate(os.path.getsize(store.path) - RECORD_DTYPE.itemsize // 2)
+
+    repaired = _store(tmp_path)
+    assert [entry.score for entry in repaired.leaderboard()] == [150, 50]
+    repaired.flush()
+    assert (os.path.getsize(repaired.path) - len(MAGIC)) % RECORD_DTYPE.itemsize == 0
+    assert _records(repaired.path)['score'].tolist() == [50, 150]
+    repaired.close()
+
+
+def test_bad_header_is_rebuilt(tmp_path):
+    path = tmp_path / 'scores.log'
+    path.write_bytes(b'not a score log')
+    store = _store(tmp_path)
+    assert store.leaderboard() == []
+    store.record(10, 1.0, 0, 0)
+    store.close()
+    assert _records(store.path)['score'].tolist() == [10]
+
+
+def test_compaction_keeps_recent_half_and_leaderboard(tmp_path):
+    store = _store(tmp_path, top_n=3, max_entries=10)
+    # 最高分都在最前面，压缩后只能因为上了排行榜而被保留
+    scores = [1000, 900, 800] + list(range(1, 9))
+    for score in scores:
+        store.record(score, 1.0, 0, 0)
+    store.close()
+
+    kept = _records(store.path)['score'].tolist()
+    assert len(kept) <= 10
+    assert kept[:3] == [1000, 900, 800]
+    assert kept[-5:] == [4, 5, 6, 7, 8]
+
+
+def test_leaderboard_orders_by_score_then_time(tmp_path):
+    store = _store(tmp_path, top_n=4)
+    ranks = [store.record(score, 1.0, seed, 0)
+             for seed, score in enumerate((200, 500, 200, 100, 50, 700))]
+    assert ranks == [1, 1, 3, 4, None, 1]
+
+    board = store.leaderboard()
+    assert [entry.score for entry in board] == [700, 500, 200, 200]
+    # 同分时先达成的排在前面
+    assert [entry.seed for entry in board[2:]] == [0, 2]
+    assert [entry.score for entry in store.leaderboard(2)] == [700, 500]
+    store.close()
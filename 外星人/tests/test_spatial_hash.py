@@ -0,0 +1,101 @@
+"""网格粗筛与逐对 Rect.colliderect 的结果一致（随机布局）。"""
+import numpy as np
+import pygame
+import pytest
+
+from spatial_hash import BRUTE_FORCE_PAIRS, SpatialHash, brute_force_pairs
+from simulation import GameSimulation
+
+WIDTH, HEIGHT = 1200, 800
+
+
+def _random_layout(rng, n, max_size=80):
+    """实体和查询矩形都可以部分或完全超出世界范围，尺寸可以大于格子。"""
+    x = rng.integers(-100, WIDTH + 100, n)
+    y = rng.integers(-100, HEIGHT + 100, n)
+    w = rng.integers(1, max_size, n)
+    h = rng.integers(1, max_size, n)
+    alive = rng.random(n) < 0.8
+    return x, y, w, h, alive
+
+
+def _expected_pairs(rects, x, y, w, h, alive):
+    entities = [pygame.Rect(*r) for r in zip(x.tolist(), y.tolist(), w.tolist(), h.tolist())]
+    return {
+        (qi, ei)
+        for qi, query in enumerate(pygame.Rect(*r) for r in rects.tolist())
+        for ei, entity in enumerate(entities)
+        if alive[ei] and query.colliderect(entity)
+    }
+
+
+def _pairs(result):
+    qi, ei = result
+    pairs = set(zip(qi.tolist(), ei.tolist()))
+    assert len(pairs) == len(qi)     # 同一对不会重复出现
+    return pairs
+
+
+@pytest.mark.parametrize('seed', range(20))
+@pytest.mark.parametrize('cell_size', [16, 64, 200])
+def test_query_pairs_matches_brute_force(seed, cell_size):
+    rng = np.random.default_rng(seed)
+    x, y, w, h, alive = _random_layout(rng, int(rng.integers(0, 300)))
+    rects = np.column_stack(_random_layout(rng, int(rng.integers(0, 60)), max_size=150)[:4])
+
+    grid = SpatialHash(WIDTH, HEIGHT, cell_size)
+    grid.build(x, y, w, h, alive)
+    expected = _expected_pairs(rects, x, y, w, h, alive)
+
+    assert _pairs(grid.query_pairs(rects)) == expected
+    assert _pairs(brute_force_pairs(rects, x, y, w, h, alive)) == expected
+    for qi, rect in enumerate(rects.tolist()):
+        hits = grid.query_rect(pygame.Rect(rect)).tolist()
+        assert len(hits) == len(set(hits))
+        assert {(qi, ei) for ei in hits} == {pair for pair in expected if pair[0] == qi}
+
+
+def test_killed_after_build_never_hit():
+    rng = np.random.default_rng(7)
+    x, y, w, h, alive = _random_layout(rng, 200)
+    alive[:] = True
+    grid = SpatialHash(WIDTH, HEIGHT, 64)
+    grid.build(x, y, w, h, alive)
+    alive[::2] = False
+
+    rects = np.array([[0, 0, WIDTH, HEIGHT]])
+    _, hit = grid.query_pairs(rects)
+    assert hit.size and alive[hit].all()
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_swarm_collide_rects_matches_brute_force(seed):
+    sim = GameSimulation(seed=seed)
+    aliens = sim.aliens
+    for _ in range(120):
+        aliens.spawn()
+    rng = np.random.default_rng(seed)
+    n = aliens._size
+    aliens.ix[:n] = rng.integers(-50, WIDTH, n)
+    aliens.iy[:n] = rng.integers(-50, HEIGHT, n)
+    aliens.kill(rng.choice(n, 30, replace=False))
+    aliens._grid_dirty = True
+
+    # 查询数 × 实体数超过 BRUTE_FORCE_PAIRS，走网格
+    rects = np.column_stack(_random_layout(rng, 50, max_size=40)[:4])
+    assert len(rects) * n > BRUTE_FORCE_PAIRS
+    x, y = aliens.ix[:n], aliens.iy[:n]
+    w = np.full(n, aliens.width)
+    h = np.full(n, aliens.height)
+    expected = _expected_pairs(rects, x, y, w, h, aliens.alive[:n])
+    assert _pairs(aliens.collide_rects(rects)) == expected
+
+    # 单个矩形：网格过期时整体扫描，网格有效时查网格，结果相同
+    for rect in rects[:10].tolist():
+        rect = pygame.Rect(rect)
+        want = sorted(ei for qi, ei in _expected_pairs(np.array([tuple(rect)]), x, y, w, h,
+                                                        aliens.alive[:n]))
+        aliens._grid_dirty = True
+        assert sorted(aliens.collide_rect(rect).tolist()) == want
+        aliens._ensure_grid()
+        assert sorted(aliens.collide_rect(rect).tolist()) == want
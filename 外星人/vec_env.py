@@ -0,0 +1,310 @@
+"""
+给脚本机器人和学习型智能体用的批量环境接口（不需要窗口）。
+
+一个 VecEnv 在同一个进程里持有 N 局相互独立的 GameSimulation，
+step(actions) 一次推进所有局，返回批量的 NumPy 观测、奖励和结束标记。
+
+动作与录制文件中的输入相同：每局一个 0~63 的位掩码（见 replay.pack_inputs），
+依次为 右 / 左 / 上 / 下 / 开火 / 护盾。
+
+观测有两种：
+- 'features'：每局一个定长 float32 向量（飞船状态 + 最近的外星人 + 子弹），
+  各部分的位置见 VecEnv.layout；
+- 'pixels'：每局画到一张缩小的离屏 Surface 上，观测形状为 (N, 高, 宽, 3) 的 uint8。
+  这些 Surface 用 pygame.image.frombuffer 直接建在观测数组的内存上，
+  画完就是观测，不需要再复制像素。
+
+用法示例（测量吞吐量）：
+    python vec_env.py --envs 16 --steps 2000 --obs features
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pygame
+
+from assets import Assets
+from settings import Settings
+from simulation import GameSimulation, Inputs
+from replay import unpack_inputs
+
+
+# 每个外星人 / 子弹在特征向量中的列数
+ALIEN_FEATURES = 5     # 存在, x, y, vx, vy
+BULLET_FEATURES = 3    # 存在, x, y
+ALIEN_BULLET_FEATURES = 5  # 存在, x, y, vx, vy（外星人子弹的方向随攻击图案而不同）
+SHIP_FEATURES = 7      # x, y, 可被击中, 护盾激活, 护盾次数, 剩余生命, 重生中
+
+
+class VecEnv:
+    """N 局独立的无窗口游戏，批量 reset / step。"""
+
+    def __init__(self, num_envs, settings=None, obs='features', frame_scale=8,
+                 frame_skip=1, max_ticks=None, ship_hit_penalty=100.0):
+        """
+        :param num_envs: 同时运行的局数
+        :param settings: 所有局共用的设置（只读），默认 Settings()
+        :param obs: 'features' 或 'pixels'
+        :param frame_scale: 'pixels' 观测的缩小倍数（1200x800 缩小 8 倍为 150x100）
+        :param frame_skip: 每次 step 重复同一动作的模拟步数
+        :param max_ticks: 每局最多模拟的步数，到达后视为结束（None 表示不限）
+        :param ship_hit_penalty: 每损失一条命扣的奖励
+        """
+        if obs not in ('features', 'pixels'):
+            raise ValueError(f"未知的观测类型：{obs}")
+        self.num_envs = num_envs
+        self.settings = settings or Settings()
+        self.obs_mode = obs
+        self.frame_skip = frame_skip
+        self.max_ticks = max_ticks
+        self.ship_hit_penalty = ship_hit_penalty
+
+        # 所有局共用一份图片和掩码
+        self.assets = Assets()
+        self.sims = [None] * num_envs
+        self._inputs = Inputs()
+        self._next_seed = 0
+
+        s = self.settings
+        self.max_aliens = s.max_aliens
+        self.max_alien_bullets = s.alien_bullets_allowed
+        self.max_bullets = s.bullets_allowed
+        self.layout = self._make_layout()
+        size = self.layout['alien_bullets'].stop
+
+        # 预先分配的批量输出，每次 step 原地写入
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.dones = np.zeros(num_envs, dtype=bool)
+        self.episode_scores = np.zeros(num_envs, dtype=np.int64)
+        self.episode_ticks = np.zeros(num_envs, dtype=np.int64)
+        self._last_score = np.zeros(num_envs, dtype=np.int64)
+        self._last_lives = np.zeros(num_envs, dtype=np.int64)
+
+        if obs == 'features':
+            self.observations = np.zeros((num_envs, size), dtype=np.float32)
+        else:
+            self._init_frames(frame_scale)
+
+    # ---------- 观测布局 ----------
+
+    def _make_layout(self):
+        """特征向量中各部分的切片。"""
+        layout = {}
+        offset = 0
+        for name, count, width in (('ship', 1, SHIP_FEATURES),
+                                   ('aliens', self.max_aliens, ALIEN_FEATURES),
+                                   ('bullets', self.max_bullets, BULLET_FEATURES),
+                                   ('alien_bullets', self.max_alien_bullets,
+                                    ALIEN_BULLET_FEATURES)):
+            layout[name] = slice(offset, offset + count * width)
+            offset += count * width
+        return layout
+
+    # ---------- reset / step ----------
+
+    def reset(self, seed=None):
+        """
+        重新开始所有局：第 i 局的种子为 seed + i（seed 为 None 时接着上次的种子继续编号）。
+        返回批量观测。
+        """
+        if seed is not None:
+            self._next_seed = seed
+        for i in range(self.num_envs):
+            self._reset_env(i)
+        self._observe_all()
+        return self.observations
+
+    def _reset_env(self, i):
+        sim = GameSimulation(self.settings, self.assets, self._next_seed)
+        self._next_seed += 1
+        self.sims[i] = sim
+        self._last_score[i] = 0
+        self._last_lives[i] = sim.stats.ships_left
+
+    def step(self, actions):
+        """
+        每局执行一个动作（位掩码），返回 (observations, rewards, dones, info)。
+
+        结束（GAME OVER 或到达 max_ticks）的局会自动用下一个种子重开，
+        返回的是新一局的观测；info['episode_scores'] / ['episode_ticks']
+        中对应位置是刚结束那一局的最终得分和步数。
+
+        返回的数组是内部缓冲区，下次 step 会被覆盖，需要保留时请复制。
+        """
+        actions = np.asarray(actions)
+        inputs = self._inputs
+        rewards, dones = self.rewards, self.dones
+        rewards[:] = 0.0
+        dones[:] = False
+
+        for i, sim in enumerate(self.sims):
+            unpack_inputs(int(actions[i]), inputs)
+            for _ in range(self.frame_skip):
+                sim.step(inputs)
+                inputs.clear_actions()
+                if not sim.stats.game_active:
+                    break
+
+            stats = sim.stats
+            rewards[i] = (stats.score - self._last_score[i]
+                          - self.ship_hit_penalty * (self._last_lives[i] - stats.ships_left))
+            self._last_score[i] = stats.score
+            self._last_lives[i] = stats.ships_left
+
+            if not stats.game_active or (self.max_ticks and sim.ticks >= self.max_ticks):
+                dones[i] = True
+                self.episode_scores[i] = stats.score
+                self.episode_ticks[i] = sim.ticks
+                self._reset_env(i)
+
+        self._observe_all()
+        info = {'episode_scores': self.episode_scores, 'episode_ticks': self.episode_ticks}
+        return self.observations, rewards, dones, info
+
+    # ---------- 观测 ----------
+
+    def _observe_all(self):
+        if self.obs_mode == 'features':
+            for i, sim in enumerate(self.sims):
+                self._write_features(self.observations[i], sim)
+        else:
+            for i, sim in enumerate(self.sims):
+                self._render_frame(i, sim)
+
+    def _write_features(self, out, sim):
+        """把一局的状态写入特征向量 out（坐标按屏幕尺寸归一化到 0~1）。"""
+        s = self.settings
+        width, height = float(s.screen_width), float(s.screen_height)
+        layout = self.layout
+        out[:] = 0.0
+
+        ship, shield, stats = sim.ship, sim.shield, sim.stats
+        out[layout['ship']] = (
+            ship.x / width, ship.y / height, ship.vulnerable, shield.active,
+            shield.charges / max(shield.max_charges, 1),
+            stats.ships_left / max(s.ship_limit, 1), ship.respawning,
+        )
+
+        # 外星人：超过容量时只保留离飞船最近的那些
+        aliens = sim.aliens
+        indices = aliens.alive_indices()
+        if indices.size > self.max_aliens:
+            dist = np.hypot(aliens.x[indices] - ship.x, aliens.y[indices] - ship.y)
+            indices = indices[np.argpartition(dist, self.max_aliens - 1)[:self.max_aliens]]
+        n = indices.size
+        if n:
+            block = out[layout['aliens']].reshape(self.max_aliens, ALIEN_FEATURES)
+            block[:n, 0] = 1.0
+            block[:n, 1] = aliens.x[indices] / width
+            block[:n, 2] = aliens.y[indices] / height
+            block[:n, 3] = aliens.vx[indices] / s.alien_speed
+            block[:n, 4] = aliens.vy[indices] / s.alien_speed
+
+        bullets = sim.bullets.sprites()[:self.max_bullets]
+        if bullets:
+            n = len(bullets)
+            block = out[layout['bullets']].reshape(self.max_bullets, BULLET_FEATURES)
+            block[:n, 0] = 1.0
+            block[:n, 1] = [bullet.rect.centerx / width for bullet in bullets]
+            block[:n, 2] = [bullet.y / height for bullet in bullets]
+
+        store = sim.alien_bullets
+        n = min(len(store), self.max_alien_bullets)
+        if n:
+            block = out[layout['alien_bullets']].reshape(self.max_alien_bullets,
+                                                         ALIEN_BULLET_FEATURES)
+            block[:n, 0] = 1.0
+            block[:n, 1] = (store.ix[:n] + store.width // 2) / width
+            block[:n, 2] = store.y[:n] / height
+            block[:n, 3] = store.vx[:n] / s.alien_bullet_speed
+            block[:n, 4] = store.vy[:n] / s.alien_bullet_speed
+
+    def _init_frames(self, scale):
+        """'pixels' 观测：每局一张缩小的离屏 Surface，图片预先按同样比例缩小。"""
+        s = self.settings
+        self.frame_scale = scale
+        size = (s.screen_width // scale, s.screen_height // scale)
+        self.observations = np.zeros((self.num_envs, size[1], size[0], 3), dtype=np.uint8)
+        # 每局的 Surface 与观测数组共用内存（行优先的 RGB，与 (高, 宽, 3) 布局相同）
+        self.frames = [pygame.image.frombuffer(self.observations[i], size, 'RGB')
+                       for i in range(self.num_envs)]
+
+        def scaled(name):
+            image = self.assets.image(name)
+            w, h = image.get_size()
+            return pygame.transform.scale(image, (max(1, w // scale), max(1, h // scale)))
+
+        self._ship_image = scaled('ship.bmp')
+        self._alien_image = scaled('alien.bmp')
+        bullet_size = (max(1, s.bullet_width // scale), max(1, s.bullet_height // scale))
+        self._bullet_image = self.assets.solid(s.bullet_color, bullet_size)
+        self._alien_bullet_image = self.assets.solid(s.alien_bullet_color, bullet_size)
+
+    def _render_frame(self, i, sim):
+        """把第 i 局画到它的离屏 Surface 上（也就是直接写进 observations[i]）。"""
+        scale = self.frame_scale
+        frame = self.frames[i]
+        frame.fill(self.settings.bg_color)
+
+        items = []
+        indices = sim.aliens.alive_indices()
+        if indices.size:
+            xs = (sim.aliens.ix[indices] // scale).tolist()
+            ys = (sim.aliens.iy[indices] // scale).tolist()
+            image = self._alien_image
+            items += [(image, pos) for pos in zip(xs, ys)]
+        image = self._bullet_image
+        items += [(image, (b.rect.x // scale, b.rect.y // scale)) for b in sim.bullets]
+        store = sim.alien_bullets
+        if store:
+            n = len(store)
+            image = self._alien_bullet_image
+            items += [(image, pos) for pos in zip((store.ix[:n] // scale).tolist(),
+                                                  (store.iy[:n] // scale).tolist())]
+        if sim.ship.visible:
+            items.append((self._ship_image, (sim.ship.rect.x // scale, sim.ship.rect.y // scale)))
+        frame.blits(items, doreturn=False)
+
+
+def _random_actions(rng, n):
+    """随机动作：左右移动为主，偶尔开火 / 开护盾。"""
+    moves = rng.choice((0b01, 0b10, 0), size=n)
+    fire = (rng.random(n) < 0.2) << 4
+    shield = (rng.random(n) < 0.005) << 5
+    return moves | fire | shield
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Alien Invasion 批量环境吞吐量测试")
+    parser.add_argument('--envs', type=int, default=16, help="同时运行的局数")
+    parser.add_argument('--steps', type=int, default=2000, help="每局执行的 step 次数")
+    parser.add_argument('--obs', choices=('features', 'pixels'), default='features')
+    parser.add_argument('--frame-skip', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    env = VecEnv(args.envs, obs=args.obs, frame_skip=args.frame_skip)
+    obs = env.reset(args.seed)
+    rng = np.random.default_rng(args.seed)
+    episodes, total_score = 0, 0
+
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        obs, rewards, dones, info = env.step(_random_actions(rng, args.envs))
+        if dones.any():
+            episodes += int(dones.sum())
+            total_score += int(info['episode_scores'][dones].sum())
+    elapsed = time.perf_counter() - start
+
+    env_steps = args.envs * args.steps
+    print(f"{env_steps} env-steps in {elapsed:.2f}s: {env_steps / elapsed:.0f} env-steps/s "
+          f"({env_steps * args.frame_skip / elapsed:.0f} ticks/s), "
+          f"observation {obs.shape} {obs.dtype}")
+    if episodes:
+        print(f"{episodes} episodes finished, mean score {total_score / episodes:.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())